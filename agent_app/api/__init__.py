@@ -4,6 +4,7 @@ API package for MCP LangGraph System.
 Exposes:
   - Chat routes
   - Tool audit routes
+  - Chat history search routes
   - Health routes
   - Pydantic models
 """
@@ -1,15 +1,42 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+import json
 import uuid
 
 from agent_app.core.agent_graph import AgentGraph
 from agent_app.core.state import AgentState
 from agent_app.core.audit_logger import audit_logger
+from agent_app.core.session_store import session_store
+from agent_app.core.history import InvalidCursorError, history_store
+from agent_app.core.tool_cache import tool_cache
 
 
-app = FastAPI(title="MCP LangGraph Agent API")
+AGENT = AgentGraph(
+    mcp_endpoint="python mcp_server/run_server.py",
+    model="llama3"
+)
+
+
+# ------------------------------------------------------------
+# Lifespan (warm MCP session pool on startup, close on shutdown)
+# ------------------------------------------------------------
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await AGENT.startup()
+    try:
+        yield
+    finally:
+        await AGENT.shutdown()
+        session_store.close()
+        audit_logger.close()
+
+
+app = FastAPI(title="MCP LangGraph Agent API", lifespan=lifespan)
 
 # ------------------------------------------------------------
 # CORS (Postman, Streamlit UI, Web Apps)
@@ -23,17 +50,6 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# ------------------------------------------------------------
-# Global Session State Store
-# ------------------------------------------------------------
-
-SESSION_STORE: Dict[str, AgentState] = {}
-
-AGENT = AgentGraph(
-    mcp_endpoint="python mcp_server/run_server.py",
-    model="llama3"
-)
-
 # ------------------------------------------------------------
 # Request / Response Models
 # ------------------------------------------------------------
@@ -46,11 +62,20 @@ class ChatRequest(BaseModel):
 class ChatResponse(BaseModel):
     session_id: str
     final_response: Optional[str]
-    pending_tool_call: Optional[Dict[str, Any]]
+    pending_tool_calls: List[Dict[str, Any]]
     tool_response: Optional[Any]
     messages: list
 
 
+def _save_turn(session_id: str, new_state: AgentState, history_len: int):
+    """
+    Save the session state and append this turn's messages to the
+    persistent chat history in one transaction.
+    """
+    session_store.put(session_id, new_state)
+    history_store.save_messages(session_id, new_state.messages[history_len:])
+
+
 # ------------------------------------------------------------
 # (1) ORIGINAL ENDPOINT YOU REFERENCED
 # ------------------------------------------------------------
@@ -64,7 +89,8 @@ async def chat_completion(request: ChatRequest):
 
     # Load or create session
     session_id = request.session_id or str(uuid.uuid4())
-    state = SESSION_STORE.get(session_id) or AgentState(session_id=session_id)
+    state = session_store.get(session_id) or AgentState(session_id=session_id)
+    history_len = len(state.messages)
 
     # Execute one agent turn
     new_state = await AGENT.arun(
@@ -74,12 +100,12 @@ async def chat_completion(request: ChatRequest):
     )
 
     # Save updated state
-    SESSION_STORE[session_id] = new_state
+    _save_turn(session_id, new_state, history_len)
 
     return ChatResponse(
         session_id=session_id,
         final_response=new_state.final_response,
-        pending_tool_call=new_state.pending_tool_call,
+        pending_tool_calls=new_state.pending_tool_calls,
         tool_response=new_state.tool_response,
         messages=[m.dict() for m in new_state.messages]
     )
@@ -96,7 +122,8 @@ async def chat(request: ChatRequest):
     """
 
     session_id = request.session_id or str(uuid.uuid4())
-    state = SESSION_STORE.get(session_id) or AgentState(session_id=session_id)
+    state = session_store.get(session_id) or AgentState(session_id=session_id)
+    history_len = len(state.messages)
 
     new_state = await AGENT.arun(
         session_id=session_id,
@@ -104,37 +131,207 @@ async def chat(request: ChatRequest):
         prior_state=state
     )
 
-    SESSION_STORE[session_id] = new_state
+    _save_turn(session_id, new_state, history_len)
 
     return ChatResponse(
         session_id=session_id,
         final_response=new_state.final_response,
-        pending_tool_call=new_state.pending_tool_call,
+        pending_tool_calls=new_state.pending_tool_calls,
         tool_response=new_state.tool_response,
         messages=[m.dict() for m in new_state.messages]
     )
 
 
+# ------------------------------------------------------------
+# (3) STREAMING ENDPOINT (Server-Sent Events)
+# ------------------------------------------------------------
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Same agent turn as /chat, streamed as Server-Sent Events:
+
+      event: session          {"session_id": ...}
+      event: token            {"content": ...}   (LLM token delta)
+      event: tool_call_start  {"tool_call_id", "tool", "args"}
+      event: tool_call_end    {"tool_call_id", "tool", "result"}
+      event: final            ChatResponse payload
+      event: error            {"error": ...}
+
+    The session state is saved once the stream completes.
+    """
+
+    session_id = request.session_id or str(uuid.uuid4())
+    state = session_store.get(session_id) or AgentState(session_id=session_id)
+    history_len = len(state.messages)
+
+    async def event_source():
+        yield _sse("session", {"session_id": session_id})
+
+        try:
+            async for event, data in AGENT.astream(
+                session_id=session_id,
+                user_input=request.user_input,
+                prior_state=state
+            ):
+                if event == "final":
+                    _save_turn(session_id, data, history_len)
+                    data = ChatResponse(
+                        session_id=session_id,
+                        final_response=data.final_response,
+                        pending_tool_calls=data.pending_tool_calls,
+                        tool_response=data.tool_response,
+                        messages=[m.dict() for m in data.messages]
+                    ).dict()
+
+                yield _sse(event, data)
+
+        except Exception as e:
+            yield _sse("error", {"error": str(e)})
+
+    return StreamingResponse(
+        event_source(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 # ------------------------------------------------------------
 # Retrieve Full Session State
 # ------------------------------------------------------------
 
 @app.get("/state/{session_id}")
 def get_state(session_id: str):
-    state = SESSION_STORE.get(session_id)
+    state = session_store.get(session_id)
     if not state:
         return {"error": "Invalid session_id"}
     return state.dict()
 
 
+# ------------------------------------------------------------
+# Chat History Search (FTS5)
+# ------------------------------------------------------------
+
+@app.get("/history/search")
+def search_history(
+    q: str = Query(..., min_length=1),
+    session_id: Optional[str] = None,
+    limit: int = Query(default=20, ge=1, le=200),
+    cursor: Optional[str] = None
+):
+    """
+    Ranked full-text search over chat history with snippets.
+    Page with cursor=<next_cursor>.
+    """
+    try:
+        page = history_store.search(q, session_id=session_id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from None
+    return {
+        "count": len(page["results"]),
+        "results": page["results"],
+        "next_cursor": page["next_cursor"]
+    }
+
+
+# ------------------------------------------------------------
+# Session Store Stats
+# ------------------------------------------------------------
+
+@app.get("/sessions/stats")
+def session_stats():
+    return session_store.stats()
+
+
+# ------------------------------------------------------------
+# MCP Session Pool Stats
+# ------------------------------------------------------------
+
+@app.get("/mcp/pool")
+def mcp_pool_stats():
+    return AGENT.mcp_pool.stats()
+
+
+# ------------------------------------------------------------
+# Tool Result Cache Stats
+# ------------------------------------------------------------
+
+@app.get("/tools/cache")
+def tool_cache_stats():
+    """
+    Agent-side tool result cache: size, hit rate, evictions, invalidations.
+    """
+    return tool_cache.stats()
+
+
+# ------------------------------------------------------------
+# MCP Tool Catalog
+# ------------------------------------------------------------
+
+@app.get("/tools/catalog")
+def tool_catalog_stats():
+    """
+    Cached MCP tool catalog: tool names, version, age and refresh counters.
+    """
+    return AGENT.tool_catalog.stats()
+
+
 # ------------------------------------------------------------
 # Audit Log Endpoint
 # ------------------------------------------------------------
 
 @app.get("/tools/logs")
-def tool_logs(session_id: Optional[str] = None, limit: int = 50):
-    logs = audit_logger.list_logs(session_id=session_id, limit=limit)
+def tool_logs(
+    session_id: Optional[str] = None,
+    limit: int = Query(default=50, ge=1, le=500),
+    tool_name: Optional[str] = None,
+    since: Optional[str] = None,
+    until: Optional[str] = None,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None
+):
+    """
+    Newest-first audit logs. Page with before_id=<next_before_id>
+    (older) or after_id=<prev_after_id> (newer).
+    """
+    logs = audit_logger.list_logs(
+        session_id=session_id,
+        limit=limit,
+        tool_name=tool_name,
+        since=since,
+        until=until,
+        before_id=before_id,
+        after_id=after_id
+    )
     return {
         "count": len(logs),
-        "logs": logs
+        "logs": logs,
+        "next_before_id": logs[-1]["id"] if len(logs) == limit else None,
+        "prev_after_id": logs[0]["id"] if logs else None
     }
+
+
+@app.get("/tools/stats")
+def tool_stats(
+    window_minutes: int = Query(default=60, ge=1, le=60 * 24 * 30),
+    tool_name: Optional[str] = None
+):
+    """
+    Per-tool count, error rate and p50/p95/p99 latency over a time window.
+    """
+    return {
+        "window_minutes": window_minutes,
+        "tools": audit_logger.tool_stats(window_minutes=window_minutes, tool_name=tool_name)
+    }
+
+
+@app.get("/audit/stats")
+def audit_stats():
+    """
+    Audit writer queue / overflow depth and group-commit metrics.
+    """
+    return audit_logger.stats()
@@ -3,16 +3,13 @@ import uuid
 
 from agent_app.core.agent_graph import AgentGraph
 from agent_app.core.state import AgentState
+from agent_app.core.session_store import session_store
+from agent_app.core.history import history_store
 from agent_app.api.models import ChatRequest, ChatResponse
 
 
 router = APIRouter(prefix="/chat", tags=["Chat"])
 
-# ---------------------------------------------------------------------
-# Internal in-memory session store
-# ---------------------------------------------------------------------
-SESSION_STORE = {}
-
 # Shared global agent instance
 AGENT = AgentGraph(
     mcp_endpoint="python mcp_server/run_server.py",
@@ -30,15 +27,11 @@ async def chat_completion(payload: ChatRequest):
     # -------------------------------
     # Session Setup
     # -------------------------------
-    if payload.session_id is None:
-        session_id = str(uuid.uuid4())
-        SESSION_STORE[session_id] = AgentState(session_id=session_id)
-    else:
-        session_id = payload.session_id
-        if session_id not in SESSION_STORE:
-            SESSION_STORE[session_id] = AgentState(session_id=session_id)
-
-    state = SESSION_STORE[session_id]
+    # Sessions are kept in the shared bounded session store
+    # (evicted sessions are rehydrated from disk transparently).
+    session_id = payload.session_id or str(uuid.uuid4())
+    state = session_store.get(session_id) or AgentState(session_id=session_id)
+    history_len = len(state.messages)
 
     # -------------------------------
     # Run LangGraph Agent
@@ -49,8 +42,9 @@ async def chat_completion(payload: ChatRequest):
         prior_state=state
     )
 
-    # Persist updated state
-    SESSION_STORE[session_id] = result_state
+    # Persist updated state + this turn's messages (one transaction)
+    session_store.put(session_id, result_state)
+    history_store.save_messages(session_id, result_state.messages[history_len:])
 
     return ChatResponse(
         session_id=session_id,
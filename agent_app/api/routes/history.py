@@ -0,0 +1,48 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from agent_app.core.history import InvalidCursorError, history_store
+
+
+router = APIRouter(prefix="/history", tags=["History"])
+
+
+@router.get("/search")
+async def search_history(
+    q: str = Query(
+        ...,
+        min_length=1,
+        description="Search terms (all terms must match)."
+    ),
+    session_id: str | None = Query(
+        default=None,
+        description="Restrict search to one session."
+    ),
+    limit: int = Query(
+        default=20,
+        ge=1,
+        le=200,
+        description="Max number of results to return."
+    ),
+    cursor: str | None = Query(
+        default=None,
+        description="next_cursor from the previous page."
+    )
+):
+    """
+    Full-text search over chat history (SQLite FTS5).
+
+    Results are ranked by relevance and include a snippet
+    with matched terms wrapped in [brackets].
+    """
+
+    try:
+        page = history_store.search(q, session_id=session_id, limit=limit, cursor=cursor)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from None
+
+    return {
+        "count": len(page["results"]),
+        "query": q,
+        "results": page["results"],
+        "next_cursor": page["next_cursor"]
+    }
@@ -17,10 +17,30 @@ async def get_tool_logs(
         ge=1,
         le=500,
         description="Max number of log entries to return."
+    ),
+    tool_name: str | None = Query(
+        default=None,
+        description="Filter logs for a specific tool."
+    ),
+    since: str | None = Query(
+        default=None,
+        description="Only logs at or after this ISO timestamp."
+    ),
+    until: str | None = Query(
+        default=None,
+        description="Only logs before this ISO timestamp."
+    ),
+    before_id: int | None = Query(
+        default=None,
+        description="Cursor: return logs older than this id (next page)."
+    ),
+    after_id: int | None = Query(
+        default=None,
+        description="Cursor: return logs newer than this id (previous page)."
     )
 ):
     """
-    Retrieve tool audit logs.
+    Retrieve tool audit logs, newest first, with keyset pagination.
 
     Tool logs include:
       - timestamp
@@ -30,10 +50,46 @@ async def get_tool_logs(
       - results (JSON)
     """
 
-    logs = audit_logger.list_logs(session_id=session_id, limit=limit)
+    logs = audit_logger.list_logs(
+        session_id=session_id,
+        limit=limit,
+        tool_name=tool_name,
+        since=since,
+        until=until,
+        before_id=before_id,
+        after_id=after_id
+    )
 
     return {
         "count": len(logs),
         "session_id": session_id,
-        "logs": logs
+        "logs": logs,
+        "next_before_id": logs[-1]["id"] if len(logs) == limit else None,
+        "prev_after_id": logs[0]["id"] if logs else None
+    }
+
+
+@router.get("/stats")
+async def get_tool_stats(
+    window_minutes: int = Query(
+        default=60,
+        ge=1,
+        le=60 * 24 * 30,
+        description="Time window (minutes) to aggregate over."
+    ),
+    tool_name: str | None = Query(
+        default=None,
+        description="Only return stats for this tool."
+    )
+):
+    """
+    Per-tool call count, error rate, payload sizes and
+    p50/p95/p99 latency (from incrementally maintained aggregates).
+    """
+
+    stats = audit_logger.tool_stats(window_minutes=window_minutes, tool_name=tool_name)
+
+    return {
+        "window_minutes": window_minutes,
+        "tools": stats
     }
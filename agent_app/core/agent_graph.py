@@ -14,42 +14,58 @@ Nodes:
 
 The AgentGraph class exposes:
  - arun(): async execution of one agent turn
+ - astream(): same turn, yielding token / tool-call events as they happen
  - run(): sync wrapper (used by Streamlit + FastAPI)
+ - startup() / shutdown(): warm up the MCP session pool + tool catalog, close the pool
 """
 
 import asyncio
+import threading
+from typing import Any, AsyncIterator, Optional, Tuple
+
 from langgraph.graph import StateGraph, END
 
 from agent_app.core.state import AgentState
 from agent_app.core.nodes.llm_node import LLMNode
 from agent_app.core.nodes.router_node import RouterNode
 from agent_app.core.nodes.tool_node import MCPToolNode
+from agent_app.core.mcp_pool import MCPSessionPool, MCP_POOL_SIZE
+from agent_app.core.tool_catalog import ToolCatalog
 
 from langchain_community.chat_models import ChatOllama
 
 
 class AgentGraph:
 
-    def __init__(self, mcp_endpoint: str, model: str = "llama3"):
+    def __init__(self, mcp_endpoint: str, model: str = "llama3",
+                 mcp_pool_size: int = MCP_POOL_SIZE):
         """
         Build the LangGraph agent with:
          - LLM node
          - Router node
-         - MCP ToolNode
+         - MCP ToolNode (backed by a pool of warm MCP sessions)
+         - a ToolCatalog shared by both (bound tools / name validation)
         """
 
         # -------------------------------------------------------
         # Initialize LLM
         # -------------------------------------------------------
+        # Tokens are streamed whenever the graph runs under
+        # astream_events(); ainvoke() still returns whole messages.
         llm = ChatOllama(
             model=model,
-            temperature=0.2,
-            stream=False
+            temperature=0.2
         )
 
-        self.llm_node = LLMNode(llm)
+        self.mcp_pool = MCPSessionPool(mcp_endpoint, size=mcp_pool_size)
+        self.tool_catalog = ToolCatalog(self.mcp_pool)
+        self.mcp_pool.message_handler = self.tool_catalog.handle_notification
+
+        self.llm_node = LLMNode(llm, catalog=self.tool_catalog)
         self.router_node = RouterNode()
-        self.tools_node = MCPToolNode(mcp_command=mcp_endpoint)
+        self.tools_node = MCPToolNode(
+            mcp_command=mcp_endpoint, pool=self.mcp_pool, catalog=self.tool_catalog
+        )
 
         # -------------------------------------------------------
         # Build LangGraph
@@ -83,6 +99,31 @@ class AgentGraph:
 
         self._graph = builder.compile()
 
+        # Event loop of the sync run() wrapper (started on first use)
+        self._sync_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._sync_lock = threading.Lock()
+
+    # -------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------
+
+    async def startup(self):
+        """
+        Spawn the MCP session pool and load the tool catalog, so the
+        first request neither spawns a server nor lists tools.
+
+        A down MCP server does not stop the API from booting: the
+        catalog stays stale and is retried on first use.
+        """
+        await self.mcp_pool.start()
+        await self.tool_catalog.try_load()
+
+    async def shutdown(self):
+        """
+        Close all pooled MCP sessions and their server processes.
+        """
+        await self.mcp_pool.close()
+
     # -------------------------------------------------------------------
     # Public API
     # -------------------------------------------------------------------
@@ -99,31 +140,97 @@ class AgentGraph:
          - final response
         """
 
+        state = self._begin_turn(session_id, user_input, prior_state)
+
+        # Execute graph
+        result_state = await self._graph.ainvoke(state)
+
+        return self._coerce_state(result_state)
+
+    async def astream(self, session_id: str, user_input: str,
+                      prior_state: AgentState | None = None
+                      ) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Run one agent turn, yielding (event, data) pairs as it executes:
+
+         - ("token", {"content": ...})        LLM token delta
+         - ("tool_call_start", {...})         MCP tool call started
+         - ("tool_call_end", {...})           MCP tool call finished
+         - ("final", AgentState)              turn complete (always last)
+        """
+
+        state = self._begin_turn(session_id, user_input, prior_state)
+        final_state = state
+
+        async for event in self._graph.astream_events(state, version="v2"):
+            kind = event["event"]
+
+            if kind == "on_chat_model_stream":
+                content = event["data"]["chunk"].content
+                if content:
+                    yield "token", {"content": content}
+
+            elif kind == "on_custom_event":
+                yield event["name"], event["data"]
+
+            elif kind == "on_chain_end" and not event.get("parent_ids"):
+                # Root graph finished → its output is the final state
+                final_state = self._coerce_state(event["data"]["output"])
+
+        yield "final", final_state
+
+    @staticmethod
+    def _coerce_state(result: Any) -> AgentState:
+        """
+        LangGraph returns channel values as a dict; rebuild AgentState.
+        """
+        if isinstance(result, AgentState):
+            return result
+        return AgentState(**result)
+
+    def _begin_turn(self, session_id: str, user_input: str,
+                    prior_state: AgentState | None) -> AgentState:
+        """
+        Restore session state and record the user input for a new turn.
+        """
+
         # Restore or initialize session state
         state = prior_state or AgentState(session_id=session_id)
 
-        # Inject user input
+        # Inject user input; it goes into the history before this
+        # turn's tool calls so ToolMessages follow their AIMessage.
         state.user_input = user_input
+        state.messages.append(state.new_message(role="human", content=user_input))
 
-        # Execute graph
-        result_state = await self._graph.ainvoke(state)
+        # Reset per-turn fields
+        state.pending_tool_calls = []
+        state.tool_response = None
+        state.final_response = None
 
-        return result_state
+        return state
 
     def run(self, session_id: str, user_input: str,
             prior_state: AgentState | None = None) -> AgentState:
         """
         Sync wrapper around arun().
         Used by Streamlit and sometimes FastAPI.
+
+        Every call runs on the same background event loop, so the MCP
+        session pool (bound to one loop) stays warm across calls.
         """
 
-        try:
-            loop = asyncio.get_running_loop()
-            return loop.run_until_complete(
-                self.arun(session_id, user_input, prior_state)
-            )
-        except RuntimeError:
-            # No event loop running — normal case for Streamlit
-            return asyncio.run(
-                self.arun(session_id, user_input, prior_state)
-            )
+        future = asyncio.run_coroutine_threadsafe(
+            self.arun(session_id, user_input, prior_state),
+            self._background_loop()
+        )
+        return future.result()
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        with self._sync_lock:
+            if self._sync_loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=loop.run_forever, name="agent-sync-loop", daemon=True
+                ).start()
+                self._sync_loop = loop
+            return self._sync_loop
@@ -5,17 +5,34 @@ Audit Logger for MCP Tool Calls
 This module writes and reads audit logs of tool executions.
 The audit log is stored in SQLite so it persists across sessions.
 
+Writes are group-committed by a background writer thread so the
+async tool node never waits on SQLite / fsync. When the writer falls
+behind, records wait in an overflow list instead of being dropped.
+
 Each log entry includes:
  - timestamp
  - session_id
  - tool_name
  - arguments (JSON)
  - result (JSON)
+ - duration_ms, status ("ok" | "error")
+ - request_bytes, response_bytes
+ - cached (1 if served by the agent-side tool result cache)
+
+Per-tool statistics are maintained incrementally in per-minute
+summary tables (counts + latency histogram) by the writer thread,
+so tool_stats() never scans tool_logs.
 """
 
+import atexit
+import bisect
+import logging
+import queue
 import sqlite3
 import json
-from datetime import datetime
+import time
+from collections import deque
+from datetime import datetime, timedelta
 from typing import List, Optional, Dict, Any
 import threading
 import os
@@ -23,17 +40,122 @@ import os
 
 DB_PATH = "agent_app/audit_logs.sqlite3"
 
+# Rows committed together in one transaction (group commit)
+AUDIT_BATCH_SIZE = int(os.getenv("AUDIT_BATCH_SIZE", "100"))
+
+# Max time a row waits for its batch to fill before it is committed
+AUDIT_FLUSH_INTERVAL_MS = int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", "50"))
+
+# Bounded writer queue; past it, records spill to an overflow list the
+# writer drains, so write_record never blocks the event loop
+AUDIT_QUEUE_MAX = int(os.getenv("AUDIT_QUEUE_MAX", "10000"))
+
+# Sentinel telling the writer thread to flush and exit
+_STOP = object()
+
+logger = logging.getLogger(__name__)
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version
+_MIGRATIONS = [
+    # 1: indexes for per-session keyset pagination and tool/time filters
+    [
+        "CREATE INDEX IF NOT EXISTS idx_tool_logs_session_id ON tool_logs (session_id, id)",
+        "CREATE INDEX IF NOT EXISTS idx_tool_logs_tool_ts ON tool_logs (tool_name, timestamp)",
+    ],
+    # 2: per-call latency / status / payload size + rolling per-minute aggregates
+    [
+        "ALTER TABLE tool_logs ADD COLUMN duration_ms REAL",
+        "ALTER TABLE tool_logs ADD COLUMN status TEXT",
+        "ALTER TABLE tool_logs ADD COLUMN request_bytes INTEGER",
+        "ALTER TABLE tool_logs ADD COLUMN response_bytes INTEGER",
+        """
+        CREATE TABLE IF NOT EXISTS tool_stats_minute (
+            tool_name TEXT,
+            minute TEXT,
+            calls INTEGER,
+            errors INTEGER,
+            total_ms REAL,
+            request_bytes INTEGER,
+            response_bytes INTEGER,
+            PRIMARY KEY (tool_name, minute)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_tool_stats_minute ON tool_stats_minute (minute)",
+        """
+        CREATE TABLE IF NOT EXISTS tool_latency_hist (
+            tool_name TEXT,
+            minute TEXT,
+            bucket INTEGER,
+            count INTEGER,
+            PRIMARY KEY (tool_name, minute, bucket)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_tool_latency_hist_minute ON tool_latency_hist (minute)",
+    ],
+    # 3: calls answered from the agent-side tool result cache
+    [
+        "ALTER TABLE tool_logs ADD COLUMN cached INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE tool_stats_minute ADD COLUMN cached INTEGER NOT NULL DEFAULT 0",
+    ],
+]
+
+# Upper bounds (ms) of the latency histogram buckets; the last bucket is open-ended
+LATENCY_BUCKETS_MS = [
+    1, 2, 5, 10, 25, 50, 100, 250, 500,
+    1000, 2500, 5000, 10000, 30000, 60000,
+]
+
 
 class AuditLogger:
     """
-    Simple thread-safe SQLite audit logger for tool calls.
+    SQLite audit logger for tool calls with a write-behind queue.
+
+    write_record() only enqueues the row. A dedicated writer thread
+    holds one persistent WAL-mode connection and commits rows in
+    batches of AUDIT_BATCH_SIZE or every AUDIT_FLUSH_INTERVAL_MS,
+    so fsync latency stays off the request path.
     """
 
-    _lock = threading.Lock()
+    def __init__(
+        self,
+        db_path: str = DB_PATH,
+        batch_size: int = AUDIT_BATCH_SIZE,
+        flush_interval_ms: int = AUDIT_FLUSH_INTERVAL_MS,
+        max_queue: int = AUDIT_QUEUE_MAX
+    ):
+        self.db_path = db_path
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval_ms / 1000.0
 
-    def __init__(self):
         self._ensure_db()
 
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_queue)
+        # Records (in order) waiting for room in _queue
+        self._overflow: "deque[Any]" = deque()
+        self._closed = False
+        # Guards _closed, _overflow and enqueueing
+        self._lock = threading.Lock()
+
+        # Backpressure / throughput metrics
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.failed = 0
+        self.overflowed = 0
+        self.max_overflow = 0
+        self.dropped_after_close = 0
+        self.max_depth = 0
+
+        self._writer = threading.Thread(
+            target=self._writer_loop,
+            name="audit-log-writer",
+            daemon=True
+        )
+        self._writer.start()
+
+        # Flush-on-shutdown guarantee (also called from FastAPI lifespan)
+        atexit.register(self.close)
+
     # --------------------------------------------------------
     # Initialize DB
     # --------------------------------------------------------
@@ -43,9 +165,10 @@ class AuditLogger:
         Create the SQLite database + table if missing.
         """
 
-        os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
 
-        with sqlite3.connect(DB_PATH) as conn:
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS tool_logs (
@@ -59,6 +182,19 @@ class AuditLogger:
                 """
             )
             conn.commit()
+            self._migrate(conn)
+
+    def _migrate(self, conn: sqlite3.Connection):
+        """
+        Bring an existing database up to the current schema version.
+        """
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+        for target, statements in enumerate(_MIGRATIONS[version:], start=version + 1):
+            with conn:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {target}")
 
     # --------------------------------------------------------
     # Write a tool log record
@@ -69,30 +205,242 @@ class AuditLogger:
         session_id: str,
         tool_name: str,
         arguments: Dict[str, Any],
-        result: Any
+        result: Any,
+        duration_ms: Optional[float] = None,
+        status: str = "ok",
+        cached: bool = False
     ):
         """
-        Store a single tool execution record.
+        Enqueue a single tool execution record for the writer thread.
+        Request/response sizes are the byte lengths of the JSON payloads;
+        cached marks results served from the tool result cache.
+
+        Never blocks: when the queue is full the record waits in the
+        overflow list. Only records arriving after close() are dropped.
         """
 
-        ts = datetime.utcnow().isoformat()
+        # MCP results (CallToolResult, ...) are not all JSON types
+        arguments_json = json.dumps(arguments, default=str)
+        result_json = json.dumps(result, default=str)
+
+        row = (
+            datetime.utcnow().isoformat(),
+            session_id,
+            tool_name,
+            arguments_json,
+            result_json,
+            duration_ms,
+            status,
+            len(arguments_json.encode()),
+            len(result_json.encode()),
+            int(cached)
+        )
+
+        with self._lock:
+            if self._closed:
+                # Shutdown race: losing an audit row must not fail the tool call
+                self.dropped_after_close += 1
+                if self.dropped_after_close == 1:
+                    logger.warning("Audit logger closed; dropping late records.")
+                return
+
+            if not self._offer(row):
+                self.overflowed += 1
+                if not self._overflow:
+                    logger.warning("Audit queue full; spilling records to the overflow list.")
+                self._overflow.append(row)
+                self.max_overflow = max(self.max_overflow, len(self._overflow))
+
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, self._queue.qsize())
+
+    def _offer(self, item: Any) -> bool:
+        """
+        Queue item unless it would overtake overflowed records. Caller
+        holds _lock.
+        """
+        if self._overflow:
+            return False
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            return False
+        return True
+
+    def _drain_overflow(self):
+        """
+        Move overflowed records into the queue while it has room.
+        """
+        with self._lock:
+            while self._overflow:
+                try:
+                    self._queue.put_nowait(self._overflow[0])
+                except queue.Full:
+                    return
+                self._overflow.popleft()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every enqueued record has been committed.
+        Returns False if the timeout expired first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+
+        while self._pending():
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.005)
+
+        return True
+
+    def _pending(self) -> bool:
+        # Under the lock: the writer moves overflow into the queue atomically
+        with self._lock:
+            return bool(self._queue.unfinished_tasks or self._overflow)
+
+    def close(self, timeout: float = 10.0):
+        """
+        Flush all pending records and stop the writer thread.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+            # Behind any overflowed records; nothing is enqueued after it
+            if not self._offer(_STOP):
+                self._overflow.append(_STOP)
+
+        self._writer.join(timeout=timeout)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize(),
+            "queue_max": self._queue.maxsize,
+            "max_depth_seen": self.max_depth,
+            "overflow_depth": len(self._overflow),
+            "max_overflow_depth": self.max_overflow,
+            "overflowed": self.overflowed,
+            "dropped_after_close": self.dropped_after_close,
+            "enqueued": self.enqueued,
+            "written": self.written,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_batch_size": round(self.written / self.batches, 2) if self.batches else 0,
+        }
+
+    # --------------------------------------------------------
+    # Writer thread (group commit)
+    # --------------------------------------------------------
+
+    def _writer_loop(self):
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        stopping = False
+
+        while not stopping:
+            item = self._queue.get()
+            batch = []
+
+            if item is _STOP:
+                stopping = True
+            else:
+                batch.append(item)
+
+            # Collect more rows until the batch is full or the interval ends
+            deadline = time.monotonic() + self.flush_interval
+            while not stopping and len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
 
-        with self._lock:  # Ensure thread safety
-            with sqlite3.connect(DB_PATH) as conn:
-                conn.execute(
+            if batch:
+                self._write_batch(conn, batch)
+
+            for _ in range(len(batch) + (1 if stopping else 0)):
+                self._queue.task_done()
+
+            self._drain_overflow()
+
+        conn.close()
+
+    def _write_batch(self, conn: sqlite3.Connection, batch: List[tuple]):
+        try:
+            with conn:  # one transaction per batch
+                conn.executemany(
                     """
-                    INSERT INTO tool_logs (timestamp, session_id, tool_name, arguments, result)
-                    VALUES (?, ?, ?, ?, ?)
-                    """,
-                    (
-                        ts,
-                        session_id,
-                        tool_name,
-                        json.dumps(arguments),
-                        json.dumps(result)
+                    INSERT INTO tool_logs (
+                        timestamp, session_id, tool_name, arguments, result,
+                        duration_ms, status, request_bytes, response_bytes, cached
                     )
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    batch
                 )
-                conn.commit()
+                self._update_stats(conn, batch)
+            self.written += len(batch)
+            self.batches += 1
+        except sqlite3.Error as e:
+            self.failed += len(batch)
+            logger.error("Failed to write %d audit records: %s", len(batch), e)
+
+    def _update_stats(self, conn: sqlite3.Connection, batch: List[tuple]):
+        """
+        Fold a batch into the per-minute summary tables (same transaction).
+        """
+        totals: Dict[tuple, List[float]] = {}
+        hist: Dict[tuple, int] = {}
+
+        for ts, _, tool_name, _, _, duration_ms, status, req_bytes, resp_bytes, cached in batch:
+            key = (tool_name, ts[:16])  # "YYYY-MM-DDTHH:MM"
+            agg = totals.setdefault(key, [0, 0, 0.0, 0, 0, 0])
+            agg[0] += 1
+            agg[1] += 1 if status == "error" else 0
+            agg[2] += duration_ms or 0.0
+            agg[3] += req_bytes
+            agg[4] += resp_bytes
+            agg[5] += cached
+
+            # Cache hits (~0 ms) would drag the latency percentiles down
+            if duration_ms is not None and not cached:
+                bucket = bisect.bisect_left(LATENCY_BUCKETS_MS, duration_ms)
+                hist[key + (bucket,)] = hist.get(key + (bucket,), 0) + 1
+
+        conn.executemany(
+            """
+            INSERT INTO tool_stats_minute (
+                tool_name, minute, calls, errors, total_ms, request_bytes, response_bytes, cached
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(tool_name, minute) DO UPDATE SET
+                calls = calls + excluded.calls,
+                errors = errors + excluded.errors,
+                total_ms = total_ms + excluded.total_ms,
+                request_bytes = request_bytes + excluded.request_bytes,
+                response_bytes = response_bytes + excluded.response_bytes,
+                cached = cached + excluded.cached
+            """,
+            [key + tuple(agg) for key, agg in totals.items()]
+        )
+        conn.executemany(
+            """
+            INSERT INTO tool_latency_hist (tool_name, minute, bucket, count)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT(tool_name, minute, bucket) DO UPDATE SET
+                count = count + excluded.count
+            """,
+            [key + (count,) for key, count in hist.items()]
+        )
 
     # --------------------------------------------------------
     # Retrieve logs
@@ -101,37 +449,165 @@ class AuditLogger:
     def list_logs(
         self,
         session_id: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        tool_name: Optional[str] = None,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        before_id: Optional[int] = None,
+        after_id: Optional[int] = None
     ) -> List[Dict[str, Any]]:
         """
-        Retrieve up to N logs, optionally filtered by session.
+        Retrieve up to N logs (newest first), optionally filtered by
+        session, tool name and ISO timestamp range [since, until).
+
+        Keyset pagination:
+         - before_id: next (older) page → pass the smallest id seen
+         - after_id:  previous (newer) page → pass the largest id seen
         """
 
-        with self._lock:
-            with sqlite3.connect(DB_PATH) as conn:
-                conn.row_factory = sqlite3.Row
-
-                if session_id:
-                    rows = conn.execute(
-                        """
-                        SELECT * FROM tool_logs
-                        WHERE session_id = ?
-                        ORDER BY id DESC
-                        LIMIT ?
-                        """,
-                        (session_id, limit)
-                    ).fetchall()
-                else:
-                    rows = conn.execute(
-                        """
-                        SELECT * FROM tool_logs
-                        ORDER BY id DESC
-                        LIMIT ?
-                        """,
-                        (limit,)
-                    ).fetchall()
-
-        return [dict(r) for r in rows]
+        clauses = []
+        params: List[Any] = []
+
+        if session_id:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if tool_name:
+            clauses.append("tool_name = ?")
+            params.append(tool_name)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        if until:
+            clauses.append("timestamp < ?")
+            params.append(until)
+        if before_id is not None:
+            clauses.append("id < ?")
+            params.append(before_id)
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        # Paging forward from after_id walks the index upwards;
+        # the page is reversed below so results are always newest first.
+        order = "ASC" if after_id is not None and before_id is None else "DESC"
+
+        # Readers use their own connection; WAL lets them run
+        # concurrently with the writer thread. Records still in the
+        # queue become visible once their batch is committed.
+        with sqlite3.connect(self.db_path) as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(
+                f"""
+                SELECT * FROM tool_logs
+                {where}
+                ORDER BY id {order}
+                LIMIT ?
+                """,
+                (*params, limit)
+            ).fetchall()
+
+        logs = [dict(r) for r in rows]
+        if order == "ASC":
+            logs.reverse()
+
+        return logs
+
+    # --------------------------------------------------------
+    # Per-tool statistics
+    # --------------------------------------------------------
+
+    def tool_stats(
+        self,
+        window_minutes: int = 60,
+        tool_name: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Per-tool call count, error rate, mean payload sizes and
+        p50/p95/p99 latency over the last N minutes. Percentiles
+        cover calls that reached the MCP server (cache hits excluded).
+
+        Reads only the per-minute summary tables, so the cost depends
+        on tools x minutes in the window, not on the number of calls.
+        """
+
+        since = (datetime.utcnow() - timedelta(minutes=window_minutes)).isoformat()[:16]
+
+        tool_clause = "AND tool_name = ?" if tool_name else ""
+        params = (since, tool_name) if tool_name else (since,)
+
+        with sqlite3.connect(self.db_path) as conn:
+            totals = conn.execute(
+                f"""
+                SELECT tool_name, SUM(calls), SUM(errors), SUM(total_ms),
+                       SUM(request_bytes), SUM(response_bytes), SUM(cached)
+                FROM tool_stats_minute
+                WHERE minute >= ? {tool_clause}
+                GROUP BY tool_name
+                ORDER BY tool_name
+                """,
+                params
+            ).fetchall()
+
+            hist_rows = conn.execute(
+                f"""
+                SELECT tool_name, bucket, SUM(count)
+                FROM tool_latency_hist
+                WHERE minute >= ? {tool_clause}
+                GROUP BY tool_name, bucket
+                """,
+                params
+            ).fetchall()
+
+        hists: Dict[str, Dict[int, int]] = {}
+        for name, bucket, count in hist_rows:
+            hists.setdefault(name, {})[bucket] = count
+
+        stats = []
+        for name, calls, errors, total_ms, req_bytes, resp_bytes, cached in totals:
+            hist = hists.get(name, {})
+            stats.append({
+                "tool_name": name,
+                "count": calls,
+                "errors": errors,
+                "error_rate": round(errors / calls, 4) if calls else 0.0,
+                "cached": cached,
+                "cache_hit_rate": round(cached / calls, 4) if calls else 0.0,
+                "mean_ms": round(total_ms / calls, 2) if calls else None,
+                "p50_ms": _percentile(hist, 0.50),
+                "p95_ms": _percentile(hist, 0.95),
+                "p99_ms": _percentile(hist, 0.99),
+                "mean_request_bytes": round(req_bytes / calls) if calls else None,
+                "mean_response_bytes": round(resp_bytes / calls) if calls else None,
+            })
+
+        return stats
+
+
+def _percentile(hist: Dict[int, int], q: float) -> Optional[float]:
+    """
+    Estimate a latency percentile from histogram bucket counts,
+    interpolating linearly inside the bucket that contains it.
+    """
+    total = sum(hist.values())
+    if not total:
+        return None
+
+    rank = q * total
+    seen = 0
+    for bucket in sorted(hist):
+        count = hist[bucket]
+        if seen + count >= rank:
+            lower = LATENCY_BUCKETS_MS[bucket - 1] if bucket > 0 else 0.0
+            # Open-ended last bucket: report its lower bound
+            if bucket >= len(LATENCY_BUCKETS_MS):
+                return float(lower)
+            upper = LATENCY_BUCKETS_MS[bucket]
+            return round(lower + (upper - lower) * (rank - seen) / count, 2)
+        seen += count
+
+    return float(LATENCY_BUCKETS_MS[-1])
 
 
 # --------------------------------------------------------
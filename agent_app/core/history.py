@@ -11,6 +11,13 @@ Why separate from AgentState?
 - History is persistent (across restarts).
 - Follows SOLID: History storage is separate.
 
+Storage notes:
+
+- One WAL-mode connection per thread (no reconnect per call).
+- save_messages() writes one agent turn in one transaction.
+- chat_sessions side-table keeps list_sessions() O(sessions).
+- chat_history_fts (FTS5, trigger-synced) powers search().
+
 Each message stored contains:
  - session_id
  - role ("human" | "assistant" | "tool")
@@ -21,29 +28,113 @@ Each message stored contains:
 
 import sqlite3
 import os
+import threading
 from datetime import datetime
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterable, Optional, Any
 
 from agent_app.core.state import AgentMessage
 
 DB_PATH = "agent_app/history.sqlite3"
 
 
+class InvalidCursorError(ValueError):
+    """
+    A search cursor that was not produced by search().
+    """
+
+
+# Schema migrations, applied in order and tracked with PRAGMA user_version
+_MIGRATIONS = [
+    # 1: per-session index + sessions side-table (backfilled from chat_history)
+    [
+        "CREATE INDEX IF NOT EXISTS idx_chat_history_session ON chat_history (session_id, id)",
+        """
+        CREATE TABLE IF NOT EXISTS chat_sessions (
+            session_id TEXT PRIMARY KEY,
+            created_at TEXT,
+            updated_at TEXT,
+            message_count INTEGER
+        )
+        """,
+        """
+        INSERT OR IGNORE INTO chat_sessions (session_id, created_at, updated_at, message_count)
+        SELECT session_id, MIN(timestamp), MAX(timestamp), COUNT(*)
+        FROM chat_history
+        GROUP BY session_id
+        """,
+    ],
+    # 2: FTS5 full-text index over message content, kept in sync by triggers
+    [
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS chat_history_fts USING fts5(
+            content,
+            content='chat_history',
+            content_rowid='id',
+            tokenize='unicode61'
+        )
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS chat_history_fts_ai AFTER INSERT ON chat_history BEGIN
+            INSERT INTO chat_history_fts (rowid, content) VALUES (new.id, new.content);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS chat_history_fts_ad AFTER DELETE ON chat_history BEGIN
+            INSERT INTO chat_history_fts (chat_history_fts, rowid, content)
+            VALUES ('delete', old.id, old.content);
+        END
+        """,
+        """
+        CREATE TRIGGER IF NOT EXISTS chat_history_fts_au AFTER UPDATE ON chat_history BEGIN
+            INSERT INTO chat_history_fts (chat_history_fts, rowid, content)
+            VALUES ('delete', old.id, old.content);
+            INSERT INTO chat_history_fts (rowid, content) VALUES (new.id, new.content);
+        END
+        """,
+        # Index messages stored before the FTS table existed
+        "INSERT INTO chat_history_fts (chat_history_fts) VALUES ('rebuild')",
+    ],
+]
+
+
 class HistoryStore:
     """
     SQLite-backed history store for chat messages.
+
+    Each thread keeps one WAL-mode connection (thread-local), so
+    reads and writes do not reconnect per call and readers do not
+    block the writer.
     """
 
-    def __init__(self):
-        os.makedirs("agent_app", exist_ok=True)
+    def __init__(self, db_path: str = DB_PATH):
+        self.db_path = db_path
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._local = threading.local()
         self._init_db()
 
+    # ----------------------------------------------------
+    # Connections (one per thread)
+    # ----------------------------------------------------
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+
+        if conn is None:
+            conn = sqlite3.connect(self.db_path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+
+        return conn
+
     # ----------------------------------------------------
     # Initialize DB
     # ----------------------------------------------------
 
     def _init_db(self):
-        with sqlite3.connect(DB_PATH) as conn:
+        conn = self._conn()
+        with conn:
             conn.execute(
                 """
                 CREATE TABLE IF NOT EXISTS chat_history (
@@ -56,44 +147,77 @@ class HistoryStore:
                 )
                 """
             )
-            conn.commit()
+        self._migrate(conn)
+
+    def _migrate(self, conn: sqlite3.Connection):
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+
+        for target, statements in enumerate(_MIGRATIONS[version:], start=version + 1):
+            with conn:
+                for statement in statements:
+                    conn.execute(statement)
+                conn.execute(f"PRAGMA user_version = {target}")
 
     # ----------------------------------------------------
-    # Store Message
+    # Store Messages
     # ----------------------------------------------------
 
     def save_message(self, session_id: str, message: AgentMessage):
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.execute(
+        self.save_messages(session_id, [message])
+
+    def save_messages(self, session_id: str, messages: Iterable[AgentMessage]):
+        """
+        Store several messages (e.g. one agent turn) in a single transaction.
+        """
+        rows = [
+            (
+                session_id,
+                message.role,
+                message.content,
+                message.timestamp,
+                message.tool_name,
+            )
+            for message in messages
+        ]
+
+        if not rows:
+            return
+
+        now = datetime.utcnow().isoformat()
+        conn = self._conn()
+
+        with conn:
+            conn.executemany(
                 """
                 INSERT INTO chat_history (session_id, role, content, timestamp, tool_name)
                 VALUES (?, ?, ?, ?, ?)
                 """,
-                (
-                    session_id,
-                    message.role,
-                    message.content,
-                    message.timestamp,
-                    message.tool_name,
-                ),
+                rows,
+            )
+            conn.execute(
+                """
+                INSERT INTO chat_sessions (session_id, created_at, updated_at, message_count)
+                VALUES (?, ?, ?, ?)
+                ON CONFLICT(session_id) DO UPDATE SET
+                    updated_at = excluded.updated_at,
+                    message_count = message_count + excluded.message_count
+                """,
+                (session_id, now, now, len(rows)),
             )
-            conn.commit()
 
     # ----------------------------------------------------
     # Retrieve history for one session
     # ----------------------------------------------------
 
     def get_history(self, session_id: str) -> List[Dict]:
-        with sqlite3.connect(DB_PATH) as conn:
-            conn.row_factory = sqlite3.Row
-            rows = conn.execute(
-                """
-                SELECT * FROM chat_history
-                WHERE session_id = ?
-                ORDER BY id ASC
-                """,
-                (session_id,),
-            ).fetchall()
+        rows = self._conn().execute(
+            """
+            SELECT * FROM chat_history
+            WHERE session_id = ?
+            ORDER BY id ASC
+            """,
+            (session_id,),
+        ).fetchall()
 
         return [dict(row) for row in rows]
 
@@ -102,35 +226,131 @@ class HistoryStore:
     # ----------------------------------------------------
 
     def list_sessions(self) -> List[str]:
-        with sqlite3.connect(DB_PATH) as conn:
-            rows = conn.execute(
-                """
-                SELECT DISTINCT session_id FROM chat_history
-                ORDER BY session_id ASC
-                """
-            ).fetchall()
+        rows = self._conn().execute(
+            """
+            SELECT session_id FROM chat_sessions
+            ORDER BY session_id ASC
+            """
+        ).fetchall()
 
         return [row[0] for row in rows]
 
+    # ----------------------------------------------------
+    # Full-text search (FTS5)
+    # ----------------------------------------------------
+
+    def search(
+        self,
+        query: str,
+        session_id: Optional[str] = None,
+        limit: int = 20,
+        cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Ranked full-text search over message content.
+
+        Every whitespace-separated term must match (terms are quoted,
+        so FTS operators in user input are treated as text). Results
+        are ordered by bm25 rank and include a highlighted snippet.
+
+        Pass the returned next_cursor back as `cursor` for the next page.
+
+        Raises:
+            InvalidCursorError: if cursor is malformed.
+        """
+
+        terms = query.split()
+        if not terms:
+            return {"results": [], "next_cursor": None}
+
+        match = " ".join('"' + t.replace('"', '""') + '"' for t in terms)
+
+        clauses = ["chat_history_fts MATCH ?"]
+        params: List[Any] = [match]
+
+        if session_id:
+            clauses.append("h.session_id = ?")
+            params.append(session_id)
+
+        # Keyset cursor over (rank, id) — no OFFSET rescans
+        if cursor:
+            last_rank, last_id = _parse_cursor(cursor)
+            clauses.append(
+                "(chat_history_fts.rank > ? OR (chat_history_fts.rank = ? AND h.id > ?))"
+            )
+            params.extend([last_rank, last_rank, last_id])
+
+        rows = self._conn().execute(
+            f"""
+            SELECT h.id, h.session_id, h.role, h.timestamp, h.tool_name,
+                   snippet(chat_history_fts, 0, '[', ']', '…', 16) AS snippet,
+                   chat_history_fts.rank AS rank
+            FROM chat_history_fts
+            JOIN chat_history h ON h.id = chat_history_fts.rowid
+            WHERE {" AND ".join(clauses)}
+            ORDER BY chat_history_fts.rank, h.id
+            LIMIT ?
+            """,
+            (*params, limit),
+        ).fetchall()
+
+        results = [dict(row) for row in rows]
+
+        next_cursor = None
+        if len(results) == limit:
+            last = results[-1]
+            next_cursor = f"{last['rank']!r}:{last['id']}"
+
+        return {"results": results, "next_cursor": next_cursor}
+
+    def rebuild_search_index(self):
+        """
+        Re-index all stored messages and merge FTS segments.
+        """
+        conn = self._conn()
+        with conn:
+            conn.execute("INSERT INTO chat_history_fts (chat_history_fts) VALUES ('rebuild')")
+            conn.execute("INSERT INTO chat_history_fts (chat_history_fts) VALUES ('optimize')")
+
     # ----------------------------------------------------
     # Delete session history
     # ----------------------------------------------------
 
     def delete_session(self, session_id: str):
-        with sqlite3.connect(DB_PATH) as conn:
+        conn = self._conn()
+        with conn:
             conn.execute(
                 "DELETE FROM chat_history WHERE session_id = ?", (session_id,)
             )
-            conn.commit()
+            conn.execute(
+                "DELETE FROM chat_sessions WHERE session_id = ?", (session_id,)
+            )
 
     # ----------------------------------------------------
     # Wipe all history
     # ----------------------------------------------------
 
     def clear_all(self):
-        with sqlite3.connect(DB_PATH) as conn:
+        conn = self._conn()
+        with conn:
             conn.execute("DELETE FROM chat_history")
-            conn.commit()
+            conn.execute("DELETE FROM chat_sessions")
+
+
+def _parse_cursor(cursor: str) -> tuple:
+    """
+    Split a "<rank>:<id>" search cursor into (float, int).
+    """
+    try:
+        last_rank, last_id = cursor.rsplit(":", 1)
+        rank, row_id = float(last_rank), int(last_id)
+    except ValueError:
+        raise InvalidCursorError(f"Invalid search cursor: {cursor!r}") from None
+
+    if rank != rank or rank in (float("inf"), float("-inf")):
+        raise InvalidCursorError(f"Invalid search cursor: {cursor!r}")
+
+    return rank, row_id
 
 
 # --------------------------------------------------------
@@ -138,3 +358,17 @@ class HistoryStore:
 # --------------------------------------------------------
 
 history_store = HistoryStore()
+
+
+# --------------------------------------------------------
+# CLI: python -m agent_app.core.history rebuild-fts
+# --------------------------------------------------------
+
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] == ["rebuild-fts"]:
+        history_store.rebuild_search_index()
+        print("[HISTORY] Full-text search index rebuilt.")
+    else:
+        print("Usage: python -m agent_app.core.history rebuild-fts")
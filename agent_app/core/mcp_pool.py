@@ -0,0 +1,346 @@
+"""
+MCP Session Pool
+----------------
+
+This module keeps a small pool of long-lived MCP client sessions
+so tool calls do not spawn a fresh MCP server process each time.
+
+Why a pool?
+
+- MCPClient.from_stdio() forks `python mcp_server/run_server.py`.
+- Every fork pays the chromadb / langchain import + Chroma init cost.
+- A warm session answers a tool call in milliseconds instead.
+
+Each pooled session:
+ - is owned by a background task (stdio transports must be opened
+   and closed from the same task)
+ - is health-checked with list_tools() when it has been idle
+ - is respawned automatically if its process died or the check failed
+
+The pool is owned by AgentGraph and closed from the FastAPI lifespan.
+"""
+
+import asyncio
+import inspect
+import os
+import time
+from contextlib import asynccontextmanager, suppress
+from typing import Any, AsyncIterator, Awaitable, Callable, List, Optional
+
+from langchain_mcp_adapters.client import MCPClient
+
+
+# Number of warm MCP sessions kept per agent
+MCP_POOL_SIZE = int(os.getenv("MCP_POOL_SIZE", "2"))
+
+# Idle seconds after which a session is pinged before being lent out
+MCP_HEALTH_CHECK_INTERVAL = float(os.getenv("MCP_HEALTH_CHECK_INTERVAL", "30"))
+
+# Seconds to wait for a new MCP server process to come up
+MCP_SPAWN_TIMEOUT = float(os.getenv("MCP_SPAWN_TIMEOUT", "60"))
+
+# Seconds a session gets to shut down cleanly before its task is cancelled
+MCP_CLOSE_TIMEOUT = float(os.getenv("MCP_CLOSE_TIMEOUT", "10"))
+
+# Receives server notifications (e.g. tools/list_changed)
+MessageHandler = Callable[[Any], Awaitable[None]]
+
+
+def _accepts_message_handler() -> bool:
+    try:
+        return "message_handler" in inspect.signature(MCPClient.from_stdio).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+class PooledMCPSession:
+    """
+    One long-lived MCP client session kept open by a background task.
+    """
+
+    def __init__(self, command: str, message_handler: Optional[MessageHandler] = None):
+        self.command = command
+        self.message_handler = message_handler
+        self.client: Any = None
+        self.last_checked = 0.0
+        self.uses = 0
+
+        self._ready = asyncio.Event()
+        self._stop = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._error: Optional[BaseException] = None
+
+    # --------------------------------------------------------
+    # Lifecycle
+    # --------------------------------------------------------
+
+    async def start(self, timeout: float = MCP_SPAWN_TIMEOUT):
+        """
+        Spawn the MCP server process and wait until the session is open.
+        """
+        self._task = asyncio.create_task(self._run())
+
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            # Still inside from_stdio(): it would never see _stop
+            await self._cancel()
+            raise RuntimeError(
+                f"MCP server did not start within {timeout}s: {self.command}"
+            ) from None
+
+        if self._error is not None:
+            raise RuntimeError(f"Failed to start MCP session: {self._error}")
+
+        self.last_checked = time.monotonic()
+
+    async def _run(self):
+        # Server notifications are only delivered if the client supports a handler
+        options = {}
+        if self.message_handler is not None and _accepts_message_handler():
+            options["message_handler"] = self.message_handler
+
+        try:
+            async with MCPClient.from_stdio(self.command, **options) as client:
+                self.client = client
+                self._ready.set()
+                await self._stop.wait()
+        except Exception as e:
+            self._error = e
+        finally:
+            self.client = None
+            self._ready.set()
+
+    async def close(self, timeout: float = MCP_CLOSE_TIMEOUT):
+        """
+        Close the session and terminate its MCP server process; the
+        owning task is cancelled if it does not finish within timeout.
+        """
+        self._stop.set()
+        if self._task is None or self._task.done():
+            return
+
+        try:
+            await asyncio.wait_for(asyncio.shield(self._task), timeout=timeout)
+        except asyncio.TimeoutError:
+            await self._cancel()
+        except asyncio.CancelledError:
+            if not self._task.done():
+                raise
+
+    async def _cancel(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+    # --------------------------------------------------------
+    # Health
+    # --------------------------------------------------------
+
+    @property
+    def alive(self) -> bool:
+        return (
+            self.client is not None
+            and self._task is not None
+            and not self._task.done()
+        )
+
+    async def ping(self) -> bool:
+        """
+        Cheap round trip to verify the MCP server still answers.
+        """
+        if not self.alive:
+            return False
+
+        try:
+            await self.client.list_tools()
+        except Exception:
+            return False
+
+        self.last_checked = time.monotonic()
+        return True
+
+
+class MCPSessionPool:
+    """
+    Fixed-size pool of warm MCP sessions.
+
+    Usage:
+        async with pool.session() as client:
+            await client.call_tool(name=..., arguments=...)
+    """
+
+    def __init__(
+        self,
+        command: str,
+        size: int = MCP_POOL_SIZE,
+        health_check_interval: float = MCP_HEALTH_CHECK_INTERVAL,
+        message_handler: Optional[MessageHandler] = None
+    ):
+        self.command = command
+        self.size = max(1, size)
+        self.health_check_interval = health_check_interval
+        self.message_handler = message_handler
+
+        self._sessions: List[PooledMCPSession] = []
+        self._idle: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._start_lock: Optional[asyncio.Lock] = None
+        self._started = False
+        self._closed = False
+
+        # Counters
+        self.spawned = 0
+        self.respawned = 0
+        self.borrowed = 0
+
+    # --------------------------------------------------------
+    # Startup / Shutdown
+    # --------------------------------------------------------
+
+    async def start(self):
+        """
+        Spawn all sessions up front (called from FastAPI lifespan).
+        Safe to call more than once.
+        """
+        loop = asyncio.get_running_loop()
+
+        # Sessions are bound to the loop that created them; if the pool
+        # moves to another loop, the old sessions are closed on theirs
+        # before it is rebuilt here.
+        if self._loop is not loop:
+            self._close_on_loop(self._loop, self._sessions)
+            self._loop = loop
+            self._sessions = []
+            self._idle = asyncio.Queue()
+            self._start_lock = asyncio.Lock()
+            self._started = False
+
+        async with self._start_lock:
+            if self._started:
+                return
+
+            self._closed = False
+            results = await asyncio.gather(
+                *(self._spawn() for _ in range(self.size)),
+                return_exceptions=True
+            )
+
+            # A failed spawn still takes a slot; it is respawned
+            # (and its error surfaced) when first borrowed.
+            for result in results:
+                if isinstance(result, BaseException):
+                    result = PooledMCPSession(self.command, self.message_handler)
+                self._idle.put_nowait(result)
+
+            self._started = True
+
+    async def close(self):
+        """
+        Close every pooled session (FastAPI shutdown hook).
+        """
+        self._closed = True
+        sessions, self._sessions = self._sessions, []
+
+        await asyncio.gather(
+            *(s.close() for s in sessions),
+            return_exceptions=True
+        )
+
+        self._loop = None
+        self._idle = None
+        self._started = False
+
+    @staticmethod
+    def _close_on_loop(loop: Optional[asyncio.AbstractEventLoop], sessions: List[PooledMCPSession]):
+        """
+        Close sessions owned by another event loop. A loop that is no
+        longer running has already cancelled (and so closed) them when
+        it shut down.
+        """
+        if not sessions or loop is None or loop.is_closed() or not loop.is_running():
+            return
+
+        async def close_all():
+            await asyncio.gather(*(s.close() for s in sessions), return_exceptions=True)
+
+        asyncio.run_coroutine_threadsafe(close_all(), loop)
+
+    async def _spawn(self) -> PooledMCPSession:
+        session = PooledMCPSession(self.command, self.message_handler)
+        await session.start()
+        self._sessions.append(session)
+        self.spawned += 1
+        return session
+
+    async def _respawn(self, session: PooledMCPSession) -> PooledMCPSession:
+        if session in self._sessions:
+            self._sessions.remove(session)
+        await session.close()
+
+        self.respawned += 1
+        return await self._spawn()
+
+    # --------------------------------------------------------
+    # Borrow a session
+    # --------------------------------------------------------
+
+    @asynccontextmanager
+    async def session(self) -> AsyncIterator[Any]:
+        """
+        Borrow a warm MCP client for the duration of the block.
+        """
+        if self._closed:
+            raise RuntimeError("MCP session pool is closed.")
+
+        if self._loop is not asyncio.get_running_loop() or not self._started:
+            await self.start()
+
+        idle = self._idle
+        session: PooledMCPSession = await idle.get()
+
+        try:
+            session = await self._ensure_healthy(session)
+        except Exception:
+            # Keep the slot so a later borrow retries the spawn
+            idle.put_nowait(session)
+            raise
+
+        self.borrowed += 1
+        session.uses += 1
+
+        try:
+            yield session.client
+        except Exception:
+            # Force a ping on the next borrow; the error may have
+            # come from a broken transport rather than the tool.
+            session.last_checked = 0.0
+            raise
+        finally:
+            if not self._closed and idle is self._idle:
+                idle.put_nowait(session)
+
+    async def _ensure_healthy(self, session: PooledMCPSession) -> PooledMCPSession:
+        if not session.alive:
+            return await self._respawn(session)
+
+        idle_for = time.monotonic() - session.last_checked
+        if idle_for >= self.health_check_interval and not await session.ping():
+            return await self._respawn(session)
+
+        return session
+
+    # --------------------------------------------------------
+    # Metrics
+    # --------------------------------------------------------
+
+    def stats(self):
+        return {
+            "size": self.size,
+            "alive": sum(1 for s in self._sessions if s.alive),
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "spawned": self.spawned,
+            "respawned": self.respawned,
+            "borrowed": self.borrowed,
+        }
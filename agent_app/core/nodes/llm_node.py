@@ -4,17 +4,20 @@ LLM Node for LangGraph Agent
 
 This node is responsible for:
  - Producing assistant responses
- - Generating structured tool call instructions
- - Incorporating tool responses
+ - Generating structured tool call instructions (all calls of a turn)
+ - Incorporating tool responses (ToolMessages correlated by tool_call_id)
  - Updating the AgentState messages list
 
-The node uses the LangChain ChatModel with tool calling enabled.
+The node uses the LangChain ChatModel with tool calling enabled; the
+MCP tool schemas from the ToolCatalog are bound into the model and
+re-bound whenever the catalog changes.
 """
 
-from typing import Dict, Any
+import uuid
 from langchain_core.messages import HumanMessage, AIMessage, ToolMessage
 
 from agent_app.core.state import AgentState
+from agent_app.core.tool_catalog import ToolCatalog
 
 
 class LLMNode:
@@ -25,8 +28,36 @@ class LLMNode:
       - Returns updated AgentState
     """
 
-    def __init__(self, llm):
+    def __init__(self, llm, catalog: ToolCatalog | None = None):
         self.llm = llm  # ChatModel (Ollama, OpenAI, etc.)
+        self.catalog = catalog
+
+        # llm with the catalog's tools bound, for catalog version _bound_version
+        self._bound_llm = llm
+        self._bound_version = None
+
+    async def _model(self):
+        """
+        The LLM with the current MCP tool schemas bound.
+        """
+        if self.catalog is None:
+            return self.llm
+
+        try:
+            await self.catalog.ensure_fresh()
+        except Exception:
+            # MCP unreachable (counted in catalog stats): use the last bound tools
+            pass
+
+        if self._bound_version != self.catalog.version:
+            try:
+                self._bound_llm = self.llm.bind_tools(self.catalog.llm_tools())
+            except NotImplementedError:
+                # Model without native tool calling: use it unbound
+                self._bound_llm = self.llm
+            self._bound_version = self.catalog.version
+
+        return self._bound_llm
 
     async def __call__(self, state: AgentState) -> AgentState:
         """
@@ -43,51 +74,51 @@ class LLMNode:
             if msg.role == "human":
                 messages.append(HumanMessage(content=msg.content))
             elif msg.role == "assistant":
-                messages.append(AIMessage(content=msg.content))
+                messages.append(
+                    AIMessage(content=msg.content, tool_calls=msg.tool_calls or [])
+                )
             elif msg.role == "tool":
                 messages.append(
                     ToolMessage(
                         name=msg.tool_name,
-                        content=msg.content
+                        content=msg.content,
+                        tool_call_id=msg.tool_call_id or ""
                     )
                 )
 
-        # Last user input
-        messages.append(HumanMessage(content=state.user_input))
-
-        # Include tool result if present
-        if state.tool_response is not None:
-            messages.append(
-                ToolMessage(
-                    name="tool_result",
-                    content=str(state.tool_response)
-                )
-            )
-
         # ----------------------------------------------------
         # 2. Call LLM model
         # ----------------------------------------------------
 
-        response = await self.llm.ainvoke(messages)
+        llm = await self._model()
+        response = await llm.ainvoke(messages)
 
         # ----------------------------------------------------
-        # 3. Check for a tool call
+        # 3. Check for tool calls (keep all of them)
         # ----------------------------------------------------
 
         if response.tool_calls:
-            # LLM requested a tool
-            tool_call = response.tool_calls[0]
-
-            state.pending_tool_call = {
-                "name": tool_call["name"],
-                "args": tool_call["args"],
-            }
-
-            # Record the assistant message that invoked tool
+            # LLM requested one or more tools; every call keeps its id
+            # so each result can be returned as a correlated ToolMessage.
+            tool_calls = [
+                {
+                    "id": tool_call.get("id") or str(uuid.uuid4()),
+                    "name": tool_call["name"],
+                    "args": tool_call["args"],
+                }
+                for tool_call in response.tool_calls
+            ]
+
+            state.pending_tool_calls = tool_calls
+
+            # Record the assistant message that invoked the tools
             state.messages.append(
                 state.new_message(
                     role="assistant",
-                    content=f"[TOOL CALL] {tool_call['name']} → {tool_call['args']}"
+                    content="\n".join(
+                        f"[TOOL CALL] {tc['name']} → {tc['args']}" for tc in tool_calls
+                    ),
+                    tool_calls=tool_calls
                 )
             )
 
@@ -35,8 +35,8 @@ class RouterNode:
         if state.final_response is not None:
             return {"next": "done"}
 
-        # 2. If LLM decided a tool should be called → send to tool node.
-        if state.pending_tool_call is not None:
+        # 2. If LLM decided tools should be called → send to tool node.
+        if state.pending_tool_calls:
             return {"next": "tools"}
 
         # 3. If user typed something that indicates needing a tool.
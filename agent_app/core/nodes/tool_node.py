@@ -5,103 +5,218 @@ Tool Node for LangGraph Agent
 This node is responsible for:
 
 - Receiving tool requests produced by the LLM node
-- Calling the MCP server via langchain_mcp_adapters
+- Running all tool calls of one LLM turn concurrently (bounded)
+- Answering idempotent tool calls from the tool result cache
+- Calling the MCP server via a pool of warm MCP sessions
 - Logging each tool call into SQLite (audit_logger)
 - Storing intermediate steps inside AgentState
 """
 
 import asyncio
+import logging
+import os
+import time
 from typing import Dict, Any
 
+from langchain_core.callbacks.manager import adispatch_custom_event
 from langgraph.prebuilt import ToolNode
-from langchain_mcp_adapters.client import MCPClient
 
 from agent_app.core.state import AgentState, IntermediateStep
 from agent_app.core.audit_logger import audit_logger
+from agent_app.core.mcp_pool import MCPSessionPool
+from agent_app.core.tool_catalog import ToolCatalog
+from agent_app.core.tool_cache import ToolResultCache, tool_cache
+
+
+# Max tool calls of a single LLM turn executed at the same time
+MAX_CONCURRENT_TOOL_CALLS = int(os.getenv("MAX_CONCURRENT_TOOL_CALLS", "4"))
+
+logger = logging.getLogger(__name__)
 
 
 class MCPToolNode(ToolNode):
     """
     Custom ToolNode that:
-    - Calls MCP tools via MCPClient.from_stdio()
+    - Serves cacheable calls from a ToolResultCache
+    - Validates tool names against the shared ToolCatalog
+    - Calls MCP tools on sessions borrowed from an MCPSessionPool
     - Writes results to audit log
     - Stores intermediate steps into agent state
     """
 
-    def __init__(self, mcp_command: str):
-        super().__init__(tools=None)  # MCP dynamic tool loading
+    def __init__(self, mcp_command: str, pool: MCPSessionPool | None = None,
+                 max_concurrency: int = MAX_CONCURRENT_TOOL_CALLS,
+                 cache: ToolResultCache | None = None,
+                 catalog: ToolCatalog | None = None):
+        super().__init__(tools=[])  # MCP dynamic tool loading
         self.mcp_command = mcp_command
-
-    # -----------------------------------------------------------
-    # Loading Tool List Dynamically from MCP Server
-    # -----------------------------------------------------------
-    async def _load_mcp_tools(self):
-        """
-        Load list of tools from MCP server and cache them.
-        """
-        async with MCPClient.from_stdio(self.mcp_command) as client:
-            tools = await client.list_tools()
-            self._tool_names = [t.name for t in tools.tools]
-        return self._tool_names
+        self.pool = pool or MCPSessionPool(mcp_command)
+        self.max_concurrency = max(1, max_concurrency)
+        self.cache = cache or tool_cache
+        self.catalog = catalog or ToolCatalog(self.pool)
 
     # -----------------------------------------------------------
     # Main Tool Execution Hook
     # -----------------------------------------------------------
     async def run(self, state: AgentState) -> AgentState:
         """
-        Executes the tool requested by the LLM and updates AgentState.
+        Executes all tool calls requested by the LLM concurrently
+        and updates AgentState.
         """
-        tool_call = state.pending_tool_call
+        tool_calls = state.pending_tool_calls
 
-        if tool_call is None:
+        if not tool_calls:
             # Nothing to execute
             return state
 
-        tool_name = tool_call["name"]
-        tool_args = tool_call.get("args", {})
-
-        # Ensure tools are loaded
-        if not hasattr(self, "_tool_names"):
-            await self._load_mcp_tools()
-
-        # Validate tool exists
-        if tool_name not in self._tool_names:
-            raise ValueError(f"Tool '{tool_name}' not found in MCP server.")
+        # Loaded at startup; re-listed only after a change notification / TTL.
+        # A failed refresh keeps the previous catalog; if there is none,
+        # each call below reports the error instead of failing the turn.
+        try:
+            await self.catalog.ensure_fresh()
+        except Exception:
+            pass
 
         # -----------------------------------------------------------
-        # Execute tool via MCP client
+        # Execute independent tool calls concurrently (bounded)
         # -----------------------------------------------------------
-        async with MCPClient.from_stdio(self.mcp_command) as client:
-            tool_result: Dict[str, Any] = await client.call_tool(
-                name=tool_name,
-                arguments=tool_args
-            )
+        semaphore = asyncio.Semaphore(self.max_concurrency)
 
-        # -----------------------------------------------------------
-        # Save tool call to audit log
-        # -----------------------------------------------------------
-        audit_logger.write_record(
-            session_id=state.session_id,
-            tool_name=tool_name,
-            arguments=tool_args,
-            result=tool_result
+        results = await asyncio.gather(
+            *(
+                self._execute_call(state.session_id, tool_call, semaphore)
+                for tool_call in tool_calls
+            )
         )
 
         # -----------------------------------------------------------
-        # Store intermediate step in state
+        # Store one intermediate step + one ToolMessage per call
         # -----------------------------------------------------------
-        new_step = IntermediateStep(
-            tool=tool_name,
-            args=tool_args,
-            result=tool_result
-        )
+        for tool_call, tool_result in zip(tool_calls, results, strict=True):
+            state.intermediate_steps.append(
+                IntermediateStep(
+                    tool=tool_call["name"],
+                    args=tool_call.get("args", {}),
+                    result=tool_result,
+                    tool_call_id=tool_call["id"]
+                )
+            )
 
-        state.intermediate_steps.append(new_step)
+            state.messages.append(
+                state.new_message(
+                    role="tool",
+                    content=str(tool_result),
+                    tool_name=tool_call["name"],
+                    tool_call_id=tool_call["id"]
+                )
+            )
 
-        # Clear pending tool call so LLM can process next step
-        state.pending_tool_call = None
+        # Clear pending tool calls so LLM can process next step
+        state.pending_tool_calls = []
 
-        # Provide tool result as next input for LLM node
-        state.tool_response = tool_result
+        # Provide tool results as next input for LLM node
+        state.tool_response = [
+            {"tool_call_id": tc["id"], "tool": tc["name"], "result": r}
+            for tc, r in zip(tool_calls, results, strict=True)
+        ]
 
         return state
+
+    async def _execute_call(
+        self,
+        session_id: str,
+        tool_call: Dict[str, Any],
+        semaphore: asyncio.Semaphore
+    ) -> Any:
+        """
+        Execute a single tool call and write its audit record.
+
+        Failures are returned as {"error": ...} results so one bad call
+        does not discard the results of the other calls in the turn.
+        Cache hits skip the MCP round trip but are still audited.
+        """
+        tool_name = tool_call["name"]
+        tool_args = tool_call.get("args", {})
+
+        async with semaphore:
+            await _emit_event("tool_call_start", {
+                "tool_call_id": tool_call["id"],
+                "tool": tool_name,
+                "args": tool_args,
+            })
+
+            status = "ok"
+            started = time.perf_counter()
+
+            cached, tool_result = self.cache.get(tool_name, tool_args)
+
+            if not cached:
+                generation = self.cache.generation(tool_name, tool_args)
+
+                try:
+                    # Validate tool exists
+                    if not self.catalog.has(tool_name):
+                        if self.catalog.loaded_at is None:
+                            raise RuntimeError(
+                                f"MCP tool catalog unavailable: {self.catalog.last_error}"
+                            )
+                        raise ValueError(f"Tool '{tool_name}' not found in MCP server.")
+
+                    # Execute tool on a warm pooled MCP session
+                    async with self.pool.session() as client:
+                        tool_result = await client.call_tool(
+                            name=tool_name,
+                            arguments=tool_args
+                        )
+                    if getattr(tool_result, "isError", False):
+                        status = "error"
+                except Exception as e:
+                    status = "error"
+                    tool_result = {"error": str(e)}
+
+                # Writes invalidate even on error (they may have partly applied)
+                self.cache.record_write(tool_name, tool_args, tool_result)
+                if status == "ok":
+                    self.cache.put(tool_name, tool_args, tool_result, generation)
+
+            duration_ms = (time.perf_counter() - started) * 1000
+
+            await _emit_event("tool_call_end", {
+                "tool_call_id": tool_call["id"],
+                "tool": tool_name,
+                "result": tool_result,
+                "status": status,
+                "duration_ms": round(duration_ms, 2),
+                "cached": cached,
+            })
+
+        # Save tool call to audit log; a failed audit write must not
+        # cost the call its result
+        try:
+            audit_logger.write_record(
+                session_id=session_id,
+                tool_name=tool_name,
+                arguments=tool_args,
+                result=tool_result,
+                duration_ms=duration_ms,
+                status=status,
+                cached=cached
+            )
+        except Exception:
+            logger.exception("Failed to audit tool call %s", tool_name)
+
+        return tool_result
+
+
+# -----------------------------------------------------------
+# Streaming events (surfaced by AgentGraph.astream)
+# -----------------------------------------------------------
+
+async def _emit_event(name: str, data: Dict[str, Any]):
+    """
+    Dispatch a custom LangGraph event; a no-op outside a graph run.
+    """
+    try:
+        await adispatch_custom_event(name, data)
+    except RuntimeError:
+        pass
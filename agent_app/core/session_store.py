@@ -0,0 +1,252 @@
+"""
+Session Store for Agent Sessions
+--------------------------------
+
+This module keeps AgentState objects between API requests.
+
+Why not a plain dict?
+
+- A dict keeps every session (messages + intermediate steps) in RAM forever.
+- LRUSessionStore caps the number of sessions held in memory.
+- Sessions idle longer than a TTL are evicted as well.
+- Evicted sessions are spilled to SQLite and rehydrated
+  transparently on their next request.
+
+SessionStore is the pluggable interface; LRUSessionStore is the default.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from agent_app.core.state import AgentState
+
+
+DB_PATH = "agent_app/sessions.sqlite3"
+
+# Max sessions kept in memory before the least recently used is spilled
+SESSION_MAX_IN_MEMORY = int(os.getenv("SESSION_MAX_IN_MEMORY", "1000"))
+
+# Seconds a session may stay idle in memory before it is spilled
+SESSION_IDLE_TTL = float(os.getenv("SESSION_IDLE_TTL", "1800"))
+
+# Also write every update to disk (survives restarts, costs a write per turn)
+SESSION_WRITE_THROUGH = os.getenv("SESSION_WRITE_THROUGH", "false").lower() == "true"
+
+
+class SessionStore(ABC):
+    """
+    Interface for AgentState storage keyed by session_id.
+    """
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[AgentState]:
+        ...
+
+    @abstractmethod
+    def put(self, session_id: str, state: AgentState):
+        ...
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        ...
+
+    def stats(self) -> Dict[str, int]:
+        return {}
+
+    def close(self):
+        """
+        Release resources; stores without any keep this no-op.
+        """
+        return None
+
+
+class LRUSessionStore(SessionStore):
+    """
+    Bounded in-memory LRU with idle-TTL eviction and SQLite spill.
+    """
+
+    def __init__(
+        self,
+        max_sessions: int = SESSION_MAX_IN_MEMORY,
+        idle_ttl: float = SESSION_IDLE_TTL,
+        db_path: str = DB_PATH,
+        write_through: bool = SESSION_WRITE_THROUGH
+    ):
+        self.max_sessions = max(1, max_sessions)
+        self.idle_ttl = idle_ttl
+        self.db_path = db_path
+        self.write_through = write_through
+
+        # session_id → (state, last access time); oldest access first
+        self._sessions: "OrderedDict[str, Tuple[AgentState, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.rehydrations = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._conn = self._connect()
+
+    # --------------------------------------------------------
+    # Initialize DB
+    # --------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS agent_sessions (
+                session_id TEXT PRIMARY KEY,
+                state TEXT,
+                updated_at TEXT
+            )
+            """
+        )
+        conn.commit()
+        return conn
+
+    # --------------------------------------------------------
+    # Public API
+    # --------------------------------------------------------
+
+    def get(self, session_id: str) -> Optional[AgentState]:
+        """
+        Return the session state, rehydrating it from disk if it was evicted.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            self._expire_idle(now)
+
+            entry = self._sessions.get(session_id)
+            if entry is not None:
+                self.hits += 1
+                self._sessions[session_id] = (entry[0], now)
+                self._sessions.move_to_end(session_id)
+                return entry[0]
+
+            self.misses += 1
+
+            state = self._load(session_id)
+            if state is None:
+                return None
+
+            self.rehydrations += 1
+            self._sessions[session_id] = (state, now)
+            self._evict_overflow()
+            return state
+
+    def put(self, session_id: str, state: AgentState):
+        """
+        Store (or replace) the session state.
+        """
+        now = time.monotonic()
+
+        with self._lock:
+            self._sessions[session_id] = (state, now)
+            self._sessions.move_to_end(session_id)
+
+            if self.write_through:
+                self._spill(session_id, state)
+
+            self._expire_idle(now)
+            self._evict_overflow()
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+            self._conn.execute(
+                "DELETE FROM agent_sessions WHERE session_id = ?", (session_id,)
+            )
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            in_memory = len(self._sessions)
+            on_disk = self._conn.execute(
+                "SELECT COUNT(*) FROM agent_sessions"
+            ).fetchone()[0]
+
+        return {
+            "in_memory": in_memory,
+            "on_disk": on_disk,
+            "max_in_memory": self.max_sessions,
+            "hits": self.hits,
+            "misses": self.misses,
+            "rehydrations": self.rehydrations,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def close(self):
+        """
+        Spill every in-memory session to disk (called on shutdown).
+        """
+        with self._lock:
+            for session_id, (state, _) in self._sessions.items():
+                self._spill(session_id, state, commit=False)
+            self._conn.commit()
+            self._sessions.clear()
+
+    # --------------------------------------------------------
+    # Eviction + spill (caller holds the lock)
+    # --------------------------------------------------------
+
+    def _expire_idle(self, now: float):
+        # Entries are ordered by last access, so stop at the first fresh one
+        while self._sessions:
+            session_id, (state, last_access) = next(iter(self._sessions.items()))
+            if now - last_access < self.idle_ttl:
+                break
+
+            self._sessions.popitem(last=False)
+            self._spill(session_id, state)
+            self.expirations += 1
+
+    def _evict_overflow(self):
+        while len(self._sessions) > self.max_sessions:
+            session_id, (state, _) = self._sessions.popitem(last=False)
+            self._spill(session_id, state)
+            self.evictions += 1
+
+    def _spill(self, session_id: str, state: AgentState, commit: bool = True):
+        self._conn.execute(
+            """
+            INSERT INTO agent_sessions (session_id, state, updated_at)
+            VALUES (?, ?, ?)
+            ON CONFLICT(session_id) DO UPDATE SET
+                state = excluded.state,
+                updated_at = excluded.updated_at
+            """,
+            (session_id, state.model_dump_json(), datetime.utcnow().isoformat())
+        )
+        if commit:
+            self._conn.commit()
+
+    def _load(self, session_id: str) -> Optional[AgentState]:
+        row = self._conn.execute(
+            "SELECT state FROM agent_sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+
+        if row is None:
+            return None
+        return AgentState.model_validate_json(row[0])
+
+
+# --------------------------------------------------------
+# Singleton Instance
+# --------------------------------------------------------
+
+session_store: SessionStore = LRUSessionStore()
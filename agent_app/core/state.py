@@ -7,8 +7,8 @@ This module defines the full AgentState object used by the graph.
 The state stores:
  - Session ID
  - Message history
- - Pending tool call (from LLM)
- - Tool response (fed back into LLM)
+ - Pending tool calls (from LLM, executed concurrently)
+ - Tool responses (fed back into LLM)
  - Intermediate steps (for debugging + audit)
  - Final response (for Router → Done)
 
@@ -29,6 +29,8 @@ class AgentMessage(BaseModel):
     content: str
     timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
     tool_name: Optional[str] = None  # Only set for tool messages
+    tool_call_id: Optional[str] = None  # Correlates a tool message with its call
+    tool_calls: Optional[List[Dict[str, Any]]] = None  # Set on assistant tool-call messages
 
 
 # ============================================================
@@ -39,6 +41,7 @@ class IntermediateStep(BaseModel):
     tool: str
     args: Dict[str, Any]
     result: Any
+    tool_call_id: Optional[str] = None
     timestamp: str = Field(default_factory=lambda: datetime.utcnow().isoformat())
 
 
@@ -60,10 +63,10 @@ class AgentState(BaseModel):
     # Raw user input for this turn
     user_input: Optional[str] = None
 
-    # LLM → Tool call request
-    pending_tool_call: Optional[Dict[str, Any]] = None
+    # LLM → Tool call requests ({"id", "name", "args"}), one LLM turn may emit several
+    pending_tool_calls: List[Dict[str, Any]] = Field(default_factory=list)
 
-    # Tool → LLM result
+    # Tool → LLM results of the last executed batch of tool calls
     tool_response: Optional[Any] = None
 
     # History of tool invocations
@@ -80,7 +83,9 @@ class AgentState(BaseModel):
         self,
         role: str,
         content: str,
-        tool_name: Optional[str] = None
+        tool_name: Optional[str] = None,
+        tool_call_id: Optional[str] = None,
+        tool_calls: Optional[List[Dict[str, Any]]] = None
     ) -> AgentMessage:
         """
         Create and return a new AgentMessage.
@@ -89,5 +94,7 @@ class AgentState(BaseModel):
         return AgentMessage(
             role=role,
             content=content,
-            tool_name=tool_name
+            tool_name=tool_name,
+            tool_call_id=tool_call_id,
+            tool_calls=tool_calls
         )
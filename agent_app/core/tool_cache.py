@@ -0,0 +1,351 @@
+"""
+Tool Result Cache for MCP Tool Calls
+------------------------------------
+
+The same read-only tool calls (rag_query, health_check, ...) come back
+with identical arguments within and across sessions. Each one used to
+pay an MCP round trip. ToolResultCache sits in front of MCPToolNode:
+
+ - keyed by (tool name, canonical JSON of the arguments); arguments
+   passed as None count as omitted
+ - only tools with a TTL in TOOL_CACHE_TTLS are cached, and only
+   successful results
+ - rag_index / rag_delete / rag_ingest_directory / rag_drop_namespace
+   invalidate the cached entries of the namespace they write to
+ - rag_index(background=True) returns before anything is written: its
+   namespace stays uncacheable until rag_index_status reports the job
+   finished, which invalidates it again
+ - LRU bounded by entry count and total result bytes, with
+   hit / miss / eviction / invalidation metrics
+
+A write bumps the namespace generation, so a read that started before
+the write finished never stores its (possibly stale) result.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+TOOL_CACHE_ENABLED = os.getenv("TOOL_CACHE_ENABLED", "true").lower() == "true"
+
+# Cacheable tools and their TTL in seconds ("tool=ttl,...")
+TOOL_CACHE_TTLS = os.getenv(
+    "TOOL_CACHE_TTLS",
+    "rag_query=300,rag_query_batch=300,rag_list_namespaces=60,health_check=5"
+)
+
+TOOL_CACHE_MAX_ENTRIES = int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "1000"))
+TOOL_CACHE_MAX_BYTES = int(os.getenv("TOOL_CACHE_MAX_BYTES", str(16 * 1024 * 1024)))
+
+# Namespace a tool call reads / writes when it passes none
+DEFAULT_NAMESPACE = "default"
+
+# Tools that modify a namespace (invalidate its entries)
+NAMESPACE_WRITE_TOOLS = {"rag_index", "rag_delete", "rag_ingest_directory", "rag_drop_namespace"}
+
+# Cached tools whose results span namespaces (invalidated by any write)
+CROSS_NAMESPACE_TOOLS = {"rag_list_namespaces"}
+
+# Poll tool of background rag_index jobs
+JOB_STATUS_TOOL = "rag_index_status"
+
+
+def _parse_ttls(spec: str) -> Dict[str, float]:
+    ttls = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            if float(value) > 0:
+                ttls[name.strip()] = float(value)
+    return ttls
+
+
+def _payload(result: Any) -> Dict[str, Any]:
+    """
+    Best-effort dict view of an MCP tool result (dict, structured
+    content or a JSON text block).
+    """
+    if isinstance(result, dict):
+        return result
+
+    structured = getattr(result, "structuredContent", None)
+    if isinstance(structured, dict):
+        return structured
+
+    for block in getattr(result, "content", None) or []:
+        try:
+            parsed = json.loads(getattr(block, "text", "") or "")
+        except ValueError:
+            continue
+        if isinstance(parsed, dict):
+            return parsed
+
+    return {}
+
+
+def canonical_args(arguments: Optional[Dict[str, Any]]) -> str:
+    """
+    Stable JSON for a set of tool arguments (sorted keys, None dropped).
+    """
+    cleaned = {k: v for k, v in (arguments or {}).items() if v is not None}
+    return json.dumps(cleaned, sort_keys=True, separators=(",", ":"), default=str)
+
+
+# Namespace tag of CROSS_NAMESPACE_TOOLS entries
+_ALL_NAMESPACES = "*"
+
+
+def _namespace(tool_name: str, arguments: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Namespace a call reads: None for non-RAG tools (TTL only).
+    """
+    if tool_name in CROSS_NAMESPACE_TOOLS:
+        return _ALL_NAMESPACES
+    if not tool_name.startswith("rag_"):
+        return None
+    return (arguments or {}).get("namespace") or DEFAULT_NAMESPACE
+
+
+class CachedResult:
+    __slots__ = ("result", "namespace", "expires_at", "size")
+
+    def __init__(self, result: Any, namespace: Optional[str], expires_at: float, size: int):
+        self.result = result
+        self.namespace = namespace
+        self.expires_at = expires_at
+        self.size = size
+
+
+class ToolResultCache:
+    """
+    Thread-safe LRU of tool results with per-tool TTLs and
+    namespace-scoped invalidation.
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[Dict[str, float]] = None,
+        max_entries: int = TOOL_CACHE_MAX_ENTRIES,
+        max_bytes: int = TOOL_CACHE_MAX_BYTES,
+        enabled: bool = TOOL_CACHE_ENABLED
+    ):
+        self.ttls = ttls if ttls is not None else _parse_ttls(TOOL_CACHE_TTLS)
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+
+        self._entries: "OrderedDict[Tuple[str, str], CachedResult]" = OrderedDict()
+        self._bytes = 0
+        self._generations: Dict[Optional[str], int] = {}
+        # Background rag_index job_id → namespace, until reported finished
+        self._jobs: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def cacheable(self, tool_name: str) -> bool:
+        return self.enabled and tool_name in self.ttls
+
+    # --------------------------------------------------------
+    # Lookup / store
+    # --------------------------------------------------------
+
+    def get(self, tool_name: str, arguments: Optional[Dict[str, Any]]) -> Tuple[bool, Any]:
+        """
+        Returns (hit, result). The result is a copy, so callers may mutate it.
+        """
+        if not self.cacheable(tool_name):
+            return False, None
+
+        key = (tool_name, canonical_args(arguments))
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None and entry.expires_at <= time.monotonic():
+                self._discard(key)
+                self.expirations += 1
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            result = entry.result
+
+        return True, copy.deepcopy(result)
+
+    def generation(self, tool_name: str, arguments: Optional[Dict[str, Any]]) -> int:
+        """
+        Write generation of the namespace a call reads; pass it back to put().
+        """
+        with self._lock:
+            return self._generation_of(_namespace(tool_name, arguments))
+
+    def put(
+        self,
+        tool_name: str,
+        arguments: Optional[Dict[str, Any]],
+        result: Any,
+        generation: Optional[int] = None
+    ) -> bool:
+        """
+        Store a result unless it is too large, its namespace was
+        written to since `generation` was taken, or a background
+        ingestion job is still writing to it.
+        """
+        if not self.cacheable(tool_name):
+            return False
+
+        namespace = _namespace(tool_name, arguments)
+        size = len(json.dumps(result, default=str).encode())
+        if size > self.max_bytes:
+            return False
+
+        key = (tool_name, canonical_args(arguments))
+        entry = CachedResult(
+            result=copy.deepcopy(result),
+            namespace=namespace,
+            expires_at=time.monotonic() + self.ttls[tool_name],
+            size=size
+        )
+
+        with self._lock:
+            if generation is not None and generation != self._generation_of(namespace):
+                return False
+            if self._writing(namespace):
+                return False
+
+            self._discard(key)
+            self._entries[key] = entry
+            self._bytes += size
+            self.stores += 1
+
+            while self._entries and (
+                len(self._entries) > self.max_entries or self._bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+        return True
+
+    # --------------------------------------------------------
+    # Invalidation
+    # --------------------------------------------------------
+
+    def invalidate_namespace(self, namespace: str) -> int:
+        """
+        Drop entries that read `namespace` (plus cross-namespace ones).
+        Returns the number of entries removed.
+        """
+        with self._lock:
+            self._generations[namespace] = self._generation_of(namespace) + 1
+            self._generations[_ALL_NAMESPACES] = self._generation_of(_ALL_NAMESPACES) + 1
+
+            stale = [
+                key for key, entry in self._entries.items()
+                if entry.namespace in (namespace, _ALL_NAMESPACES)
+            ]
+            for key in stale:
+                self._discard(key)
+
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def record_write(self, tool_name: str, arguments: Optional[Dict[str, Any]], result: Any) -> int:
+        """
+        Invalidate whatever a (write) tool call may have changed.
+
+        A background rag_index keeps its namespace uncacheable until a
+        rag_index_status call sees the job leave "running".
+        Returns the number of entries removed.
+        """
+        arguments = arguments or {}
+
+        if tool_name == JOB_STATUS_TOOL:
+            status = _payload(result).get("status")
+            with self._lock:
+                namespace = self._jobs.get(arguments.get("job_id"))
+                if namespace is None or status in (None, "running"):
+                    return 0
+                del self._jobs[arguments["job_id"]]
+            return self.invalidate_namespace(namespace)
+
+        if tool_name not in NAMESPACE_WRITE_TOOLS:
+            return 0
+
+        namespace = arguments.get("namespace") or DEFAULT_NAMESPACE
+
+        if tool_name == "rag_index" and arguments.get("background"):
+            job_id = _payload(result).get("job_id")
+            if job_id:
+                with self._lock:
+                    self._jobs[job_id] = namespace
+
+        return self.invalidate_namespace(namespace)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._entries)
+            size = self._bytes
+
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "bytes": size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttls": self.ttls,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+            "background_jobs": len(self._jobs),
+        }
+
+    # --------------------------------------------------------
+    # Internals (caller holds the lock)
+    # --------------------------------------------------------
+
+    def _generation_of(self, namespace: Optional[str]) -> int:
+        return self._generations.get(namespace, 0)
+
+    def _writing(self, namespace: Optional[str]) -> bool:
+        if namespace is None or not self._jobs:
+            return False
+        return namespace == _ALL_NAMESPACES or namespace in self._jobs.values()
+
+    def _discard(self, key: Tuple[str, str]):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+
+# --------------------------------------------------------
+# Singleton Instance
+# --------------------------------------------------------
+
+tool_cache = ToolResultCache()
@@ -0,0 +1,181 @@
+"""
+MCP Tool Catalog
+----------------
+
+The names, descriptions and input schemas of the MCP server's tools,
+shared by the LLM node (schemas bound into the model) and the tool
+node (name validation).
+
+ - loaded eagerly by AgentGraph.startup() on a warm pooled session,
+   so no request pays a separate list_tools round trip
+ - refreshed when the server sends notifications/tools/list_changed
+   (if the MCP client transport exposes a message handler) or once
+   the catalog is older than TOOL_CATALOG_TTL
+ - tool names are a frozenset → O(1) validation
+ - `version` bumps on every change so dependants (the LLM's bound
+   tools) can rebuild lazily
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, FrozenSet, List, Optional
+
+from agent_app.core.mcp_pool import MCPSessionPool
+
+
+# Seconds before the catalog is re-listed even without a change notification
+TOOL_CATALOG_TTL = float(os.getenv("TOOL_CATALOG_TTL", "300"))
+
+TOOLS_LIST_CHANGED = "notifications/tools/list_changed"
+
+
+class ToolCatalog:
+    """
+    Cached result of list_tools() with TTL / notification refresh.
+    """
+
+    def __init__(self, pool: MCPSessionPool, ttl: float = TOOL_CATALOG_TTL):
+        self.pool = pool
+        self.ttl = ttl
+
+        self.tools: List[Dict[str, Any]] = []
+        self.names: FrozenSet[str] = frozenset()
+        self.version = 0
+        self.loaded_at: Optional[float] = None
+
+        self._stale = True
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Counters
+        self.loads = 0
+        self.notifications = 0
+        self.refresh_failures = 0
+        self.last_error: Optional[str] = None
+
+    # --------------------------------------------------------
+    # Loading
+    # --------------------------------------------------------
+
+    async def load(self) -> FrozenSet[str]:
+        """
+        List tools from the MCP server and replace the catalog.
+        """
+        try:
+            async with self.pool.session() as client:
+                listed = await client.list_tools()
+        except Exception as e:
+            # Stays stale, so the next ensure_fresh() retries
+            self.refresh_failures += 1
+            self.last_error = str(e) or type(e).__name__
+            raise
+
+        tools = [
+            {
+                "name": tool.name,
+                "description": getattr(tool, "description", None) or "",
+                "input_schema": getattr(tool, "inputSchema", None)
+                or {"type": "object", "properties": {}},
+            }
+            for tool in listed.tools
+        ]
+
+        if tools != self.tools:
+            self.tools = tools
+            self.names = frozenset(t["name"] for t in tools)
+            self.version += 1
+
+        self.loaded_at = time.monotonic()
+        self._stale = False
+        self.last_error = None
+        self.loads += 1
+        return self.names
+
+    async def try_load(self) -> bool:
+        """
+        load() that reports failure instead of raising (startup warm-up).
+        """
+        try:
+            await self.load()
+        except Exception:
+            return False
+        return True
+
+    async def ensure_fresh(self) -> FrozenSet[str]:
+        """
+        Reload if the catalog is stale (notification / TTL); otherwise free.
+        """
+        if not self._needs_refresh():
+            return self.names
+
+        # One reload at a time; waiters reuse its result
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self._needs_refresh():
+                await self.load()
+
+        return self.names
+
+    def _needs_refresh(self) -> bool:
+        return (
+            self._stale
+            or self.loaded_at is None
+            or time.monotonic() - self.loaded_at >= self.ttl
+        )
+
+    def invalidate(self):
+        """
+        Mark the catalog stale; the next ensure_fresh() re-lists tools.
+        """
+        self._stale = True
+
+    async def handle_notification(self, message: Any):
+        """
+        MCP client message handler: invalidate on tools/list_changed.
+        """
+        method = getattr(getattr(message, "root", message), "method", None)
+        if method == TOOLS_LIST_CHANGED:
+            self.notifications += 1
+            self.invalidate()
+
+    # --------------------------------------------------------
+    # Lookups
+    # --------------------------------------------------------
+
+    def has(self, name: str) -> bool:
+        return name in self.names
+
+    def llm_tools(self) -> List[Dict[str, Any]]:
+        """
+        Tool definitions in the function-calling format accepted by
+        ChatModel.bind_tools().
+        """
+        return [
+            {
+                "type": "function",
+                "function": {
+                    "name": t["name"],
+                    "description": t["description"],
+                    "parameters": t["input_schema"],
+                },
+            }
+            for t in self.tools
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "tools": sorted(self.names),
+            "version": self.version,
+            "age_s": round(time.monotonic() - self.loaded_at, 1) if self.loaded_at else None,
+            "ttl_s": self.ttl,
+            "stale": self._needs_refresh(),
+            "loads": self.loads,
+            "notifications": self.notifications,
+            "refresh_failures": self.refresh_failures,
+            "last_error": self.last_error,
+        }
@@ -68,12 +68,7 @@ if user_input:
     with st.chat_message("user"):
         st.write(user_input)
 
-    # Update agent state with new message
-    agent_state.messages.append(
-        agent_state.new_message(role="human", content=user_input)
-    )
-
-    # Call the agent
+    # Call the agent (records the user message in the session history)
     new_state = agent.run(
         session_id=agent_state.session_id,
         user_input=user_input,
@@ -0,0 +1,124 @@
+"""
+Retrieval benchmark: vector vs bm25 vs hybrid.
+
+Usage:
+    python -m mcp_server.bench_retrieval --docs 2000 --queries 200 --k 5
+
+Indexes a synthetic corpus of troubleshooting notes (each carrying an
+error code and a SKU) into a scratch namespace, then measures recall@k
+and query latency per retrieval mode for two query sets:
+
+ - identifier   "What does ERR-04211 mean for SKU-KX3307?"
+ - semantic     a paraphrase of the note's symptom, no identifiers
+
+Needs the embedding model (Ollama) to be reachable.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+from typing import Dict, List, Tuple
+
+from .vector_store.backends import drop_namespace
+from .vector_store.ingestion import ingest_texts
+from .vector_store.lexical_index import get_lexical_index
+from .vector_store.retrieval import RETRIEVAL_MODES, search
+
+
+COMPONENTS = ["payment gateway", "inventory sync", "label printer", "checkout page",
+              "warehouse scanner", "order export", "tax service", "email relay"]
+SYMPTOMS = [
+    ("times out after thirty seconds", "the request hangs and then gives up"),
+    ("returns an empty response", "nothing comes back from the call"),
+    ("rejects valid credentials", "login fails even with the right password"),
+    ("duplicates every record", "each entry shows up twice"),
+    ("drops the last line item", "the final product is missing from the order"),
+    ("crashes on startup", "it dies as soon as it launches"),
+]
+FIXES = ["restart the worker", "rotate the API key", "clear the local cache",
+         "upgrade the firmware", "reindex the catalogue", "raise the connection pool"]
+
+
+def build_corpus(n: int, seed: int) -> Tuple[List[str], List[dict], List[Dict]]:
+    rng = random.Random(seed)
+    texts, metadatas, facts = [], [], []
+
+    for i in range(n):
+        code = f"ERR-{i:05d}"
+        sku = f"SKU-{rng.choice('ABCDEFGHJKLMNPQRSTUVWXYZ')}{rng.choice('ABCDEFGHJKLMNPQRSTUVWXYZ')}{rng.randint(1000, 9999)}"
+        component = rng.choice(COMPONENTS)
+        symptom, paraphrase = rng.choice(SYMPTOMS)
+        fix = rng.choice(FIXES)
+
+        texts.append(
+            f"Error {code} on {sku}: the {component} {symptom}. "
+            f"Known cause for this code; to resolve it, {fix} and retry."
+        )
+        metadatas.append({"code": code, "sku": sku})
+        facts.append({"index": i, "code": code, "sku": sku,
+                      "component": component, "paraphrase": paraphrase})
+
+    return texts, metadatas, facts
+
+
+def build_queries(facts: List[Dict], count: int, seed: int) -> Dict[str, List[Tuple[str, int]]]:
+    rng = random.Random(seed + 1)
+    sample = rng.sample(facts, min(count, len(facts)))
+
+    return {
+        "identifier": [(f"What does {f['code']} mean for {f['sku']}?", f["index"]) for f in sample],
+        "semantic": [(f"The {f['component']}: {f['paraphrase']}", f["index"]) for f in sample],
+    }
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+async def run(args):
+    texts, metadatas, facts = build_corpus(args.docs, args.seed)
+    queries = build_queries(facts, args.queries, args.seed)
+    ids = [f"bench-{i}" for i in range(len(texts))]
+
+    print(f"[BENCH] indexing {len(texts)} chunks into '{args.namespace}' ...")
+    stats = await ingest_texts(args.namespace, texts, metadatas, ids=ids)
+    print(f"[BENCH] indexed at {stats.chunks_per_sec} chunks/sec")
+
+    print(f"\n{'queries':<12}{'mode':<8}{'recall@' + str(args.k):>10}{'p50 ms':>10}{'p95 ms':>10}")
+
+    for name, pairs in queries.items():
+        for mode in RETRIEVAL_MODES:
+            hits, latencies = 0, []
+
+            for query, target in pairs:
+                started = time.perf_counter()
+                matches = await search(args.namespace, query, k=args.k, mode=mode)
+                latencies.append((time.perf_counter() - started) * 1000)
+                hits += any(m["id"] == ids[target] for m in matches)
+
+            print(
+                f"{name:<12}{mode:<8}{hits / len(pairs):>10.3f}"
+                f"{statistics.median(latencies):>10.2f}{_percentile(latencies, 95):>10.2f}"
+            )
+
+    if not args.keep:
+        drop_namespace(args.namespace)
+        get_lexical_index().drop(args.namespace)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vector / bm25 / hybrid retrieval.")
+    parser.add_argument("--docs", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--namespace", default="bench-retrieval")
+    parser.add_argument("--keep", action="store_true", help="Keep the scratch namespace afterwards.")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Vector backend benchmark: flat NumPy index vs Chroma.
+
+Usage:
+    python -m mcp_server.bench_vector_backends --sizes 10000 100000 1000000 --dim 768
+
+For each size, random unit vectors are indexed into a scratch
+directory (never the server's chroma_db) in --batch-size batches, the
+way ingest_texts writes them, and the script reports:
+
+ - build time
+ - snapshot load time (flat; in RAM and memory-mapped)
+ - top-k query latency p50 / p95
+ - Chroma's recall@k against the exact flat result
+
+1M x 768 float32 vectors take ~3 GB of RAM; Chroma ingestion at that
+size takes a long time, so --backends flat can skip it.
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+from typing import List
+
+import numpy as np
+
+from .vector_store.flat_index import FlatIndex
+from .vector_store.ingestion import INGEST_BATCH_SIZE
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def _timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def _latencies(query_fn, queries: np.ndarray, k: int):
+    latencies, results = [], []
+    for query in queries:
+        ids, ms = _timed(query_fn, query, k)
+        latencies.append(ms)
+        results.append(ids)
+    return results, latencies
+
+
+def bench_size(size: int, args, rng: np.random.Generator):
+    vectors = rng.standard_normal((size, args.dim), dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+    ids = [f"v{i}" for i in range(size)]
+    workdir = tempfile.mkdtemp(prefix="bench-vectors-")
+
+    print(f"\n[BENCH] {size} vectors x {args.dim} dims")
+
+    try:
+        # Flat index
+        flat = FlatIndex(f"{workdir}/flat")
+
+        def build_flat():
+            # Same write pattern as ingest_texts: batches inside one bulk write
+            flat.begin_bulk_write()
+            try:
+                for start in range(0, size, args.batch_size):
+                    end = start + args.batch_size
+                    flat.upsert(ids[start:end], vectors[start:end])
+            finally:
+                flat.end_bulk_write()
+
+        _, build_ms = _timed(build_flat)
+        _, load_ms = _timed(FlatIndex, f"{workdir}/flat", mmap=False)
+        mapped, mmap_load_ms = _timed(FlatIndex, f"{workdir}/flat", mmap=True)
+
+        def flat_query(index):
+            return lambda q, k: index.query([q], n_results=k, include=[])["ids"][0]
+
+        exact, flat_lat = _latencies(flat_query(flat), queries, args.k)
+        _, mmap_lat = _latencies(flat_query(mapped), queries, args.k)
+
+        print(f"  flat     build {build_ms:10.1f} ms   load {load_ms:8.1f} ms   "
+              f"p50 {statistics.median(flat_lat):7.2f} ms   p95 {_percentile(flat_lat, 95):7.2f} ms")
+        print(f"  flat+mmap                      load {mmap_load_ms:8.1f} ms   "
+              f"p50 {statistics.median(mmap_lat):7.2f} ms   p95 {_percentile(mmap_lat, 95):7.2f} ms")
+
+        if "chroma" in args.backends:
+            import chromadb
+
+            client = chromadb.PersistentClient(path=f"{workdir}/chroma")
+            collection = client.create_collection("bench", metadata={"hnsw:space": "cosine"})
+            def build():
+                for start in range(0, size, args.batch_size):
+                    end = start + args.batch_size
+                    collection.add(ids=ids[start:end], embeddings=vectors[start:end])
+
+            _, chroma_build_ms = _timed(build)
+
+            def chroma_query(q, k):
+                return collection.query(query_embeddings=[q.tolist()], n_results=k, include=[])["ids"][0]
+
+            approx, chroma_lat = _latencies(chroma_query, queries, args.k)
+            recall = statistics.mean(
+                len(set(a) & set(e)) / args.k for a, e in zip(approx, exact, strict=True)
+            )
+
+            print(f"  chroma   build {chroma_build_ms:10.1f} ms                        "
+                  f"p50 {statistics.median(chroma_lat):7.2f} ms   p95 {_percentile(chroma_lat, 95):7.2f} ms   "
+                  f"recall@{args.k} {recall:.3f}")
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the flat NumPy index against Chroma.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=INGEST_BATCH_SIZE,
+                        help="Vectors written per upsert (ingest_texts batch size).")
+    parser.add_argument("--backends", nargs="+", default=["flat", "chroma"], choices=["flat", "chroma"])
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for size in args.sizes:
+        bench_size(size, args, rng)
+
+
+if __name__ == "__main__":
+    main()
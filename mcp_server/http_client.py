@@ -0,0 +1,380 @@
+"""
+Shared HTTP client with an HTTP response cache
+----------------------------------------------
+
+fetch_api_data used to open a new aiohttp.ClientSession per call,
+throwing away keep-alive connections, TLS sessions and DNS lookups.
+All outbound requests now go through one process-wide session:
+
+ - a tuned TCPConnector: total and per-host connection limits,
+   DNS cache TTL, keep-alive timeout
+ - the session is rebuilt if the event loop changes (one loop per
+   server process in practice)
+
+GET responses go through an optional private HTTP cache:
+
+ - honours Cache-Control (max-age, no-store, no-cache) and
+   Expires, minus the upstream Age
+ - stale entries carrying an ETag / Last-Modified are revalidated with
+   If-None-Match / If-Modified-Since; a 304 refreshes the entry
+ - size-bounded LRU (total bytes) with hit / miss / revalidation metrics
+
+Bodies can be capped with max_bytes: the body is streamed and the read
+stops (closing the connection) once the cap is reached. Truncated
+bodies are never cached.
+"""
+
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlencode
+
+import aiohttp
+from pydantic import BaseModel
+
+
+HTTP_POOL_LIMIT = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+HTTP_POOL_LIMIT_PER_HOST = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+HTTP_DNS_CACHE_TTL = int(os.getenv("HTTP_DNS_CACHE_TTL", "300"))
+HTTP_KEEPALIVE_TIMEOUT = float(os.getenv("HTTP_KEEPALIVE_TIMEOUT", "30"))
+HTTP_TIMEOUT = float(os.getenv("HTTP_TIMEOUT", "15"))
+
+HTTP_CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+HTTP_CACHE_MAX_BYTES = int(os.getenv("HTTP_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+HTTP_CACHE_MAX_ENTRY_BYTES = int(os.getenv("HTTP_CACHE_MAX_ENTRY_BYTES", str(1024 * 1024)))
+
+# Response headers kept with cached bodies
+_KEPT_HEADERS = ("Content-Type", "Cache-Control", "ETag", "Last-Modified", "Expires", "Age")
+
+
+# Chunk size of streamed body reads
+_READ_CHUNK = 64 * 1024
+
+
+class HttpResult(BaseModel):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    cache: str  # "hit" | "revalidated" | "miss" | "bypass"
+    truncated: bool = False
+    content_length: Optional[int] = None  # declared by the server, if any
+
+
+# ---------------------------------------------------------
+# Response cache
+# ---------------------------------------------------------
+
+class CacheEntry(BaseModel):
+    status: int
+    headers: Dict[str, str]
+    body: bytes
+    expires_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    @property
+    def size(self) -> int:
+        return len(self.body)
+
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def validators(self) -> Dict[str, str]:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _cache_directives(headers: Dict[str, str]) -> Dict[str, Optional[str]]:
+    directives: Dict[str, Optional[str]] = {}
+    for part in headers.get("Cache-Control", "").split(","):
+        name, _, value = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = value.strip('"') or None
+    return directives
+
+
+def _freshness_lifetime(headers: Dict[str, str]) -> Optional[float]:
+    """
+    Seconds the response stays fresh, or None if it must not be stored.
+    """
+
+    directives = _cache_directives(headers)
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return 0.0
+
+    age = float(headers.get("Age", "0") or 0)
+
+    if directives.get("max-age") is not None:
+        try:
+            return max(0.0, float(directives["max-age"]) - age)
+        except ValueError:
+            return 0.0
+
+    if headers.get("Expires"):
+        try:
+            expires = parsedate_to_datetime(headers["Expires"]).timestamp()
+            return max(0.0, expires - time.time())
+        except (TypeError, ValueError):
+            return 0.0
+
+    # No freshness info: only worth keeping if it can be revalidated
+    if headers.get("ETag") or headers.get("Last-Modified"):
+        return 0.0
+    return None
+
+
+class ResponseCache:
+    """
+    LRU of GET responses bounded by total body bytes.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = HTTP_CACHE_MAX_BYTES,
+        max_entry_bytes: int = HTTP_CACHE_MAX_ENTRY_BYTES
+    ):
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key: str, status: int, headers: Dict[str, str], body: bytes) -> bool:
+        lifetime = _freshness_lifetime(headers)
+        if lifetime is None or len(body) > self.max_entry_bytes:
+            self.discard(key)
+            return False
+
+        self.discard(key)
+        entry = CacheEntry(
+            status=status,
+            headers=headers,
+            body=body,
+            expires_at=time.time() + lifetime,
+            etag=headers.get("ETag"),
+            last_modified=headers.get("Last-Modified")
+        )
+        self._entries[key] = entry
+        self._bytes += entry.size
+
+        while self._bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+
+        return True
+
+    def refresh(self, key: str, entry: CacheEntry, headers: Dict[str, str]):
+        """
+        Apply the headers of a 304 to a cached entry.
+        """
+
+        merged = {**entry.headers, **headers}
+        lifetime = _freshness_lifetime(merged)
+        if lifetime is None:
+            self.discard(key)
+            return
+
+        entry.headers = merged
+        entry.expires_at = time.time() + lifetime
+        entry.etag = merged.get("ETag")
+        entry.last_modified = merged.get("Last-Modified")
+
+    def discard(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry.size
+
+    def clear(self):
+        self._entries.clear()
+        self._bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses + self.revalidations
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "revalidations": self.revalidations,
+            "hit_rate": round((self.hits + self.revalidations) / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+        }
+
+
+# ---------------------------------------------------------
+# Shared session
+# ---------------------------------------------------------
+
+_session: Optional[aiohttp.ClientSession] = None
+_session_loop: Optional[asyncio.AbstractEventLoop] = None
+
+response_cache = ResponseCache()
+
+
+def get_session() -> aiohttp.ClientSession:
+    """
+    The process-wide client session (created on first use).
+    """
+
+    global _session, _session_loop
+
+    loop = asyncio.get_running_loop()
+    if _session is None or _session.closed or _session_loop is not loop:
+        connector = aiohttp.TCPConnector(
+            limit=HTTP_POOL_LIMIT,
+            limit_per_host=HTTP_POOL_LIMIT_PER_HOST,
+            ttl_dns_cache=HTTP_DNS_CACHE_TTL,
+            keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT
+        )
+        _session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT)
+        )
+        _session_loop = loop
+
+    return _session
+
+
+async def close_session():
+    global _session
+
+    if _session is not None and not _session.closed:
+        await _session.close()
+    _session = None
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    if not params:
+        return url
+    return f"{url}{'&' if '?' in url else '?'}{urlencode(sorted(params.items()), doseq=True)}"
+
+
+def _kept_headers(resp: aiohttp.ClientResponse) -> Dict[str, str]:
+    return {name: resp.headers[name] for name in _KEPT_HEADERS if name in resp.headers}
+
+
+async def _read_capped(resp: aiohttp.ClientResponse, max_bytes: Optional[int]) -> Tuple[bytes, bool]:
+    """
+    Read the body, stopping once max_bytes are buffered.
+    Returns (body, truncated).
+    """
+
+    if max_bytes is None:
+        return await resp.read(), False
+
+    chunks = []
+    size = 0
+    async for chunk in resp.content.iter_chunked(_READ_CHUNK):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > max_bytes:
+            # Early abort: the rest of the body is never downloaded
+            resp.close()
+            return b"".join(chunks)[:max_bytes], True
+
+    return b"".join(chunks), False
+
+
+def _from_cache(entry: CacheEntry, cache: str, max_bytes: Optional[int]) -> HttpResult:
+    truncated = max_bytes is not None and entry.size > max_bytes
+    return HttpResult(
+        status=entry.status,
+        headers=entry.headers,
+        body=entry.body[:max_bytes] if truncated else entry.body,
+        cache=cache,
+        truncated=truncated,
+        content_length=entry.size
+    )
+
+
+async def http_get(
+    url: str,
+    params: Optional[Dict[str, Any]] = None,
+    timeout: Optional[float] = None,
+    use_cache: bool = HTTP_CACHE_ENABLED,
+    max_bytes: Optional[int] = None
+) -> HttpResult:
+    """
+    GET through the shared session and (optionally) the response cache.
+    At most max_bytes of the body are read.
+
+    Raises:
+        aiohttp.ClientError / asyncio.TimeoutError on transport failures.
+    """
+
+    key = cache_key(url, params)
+    entry = response_cache.get(key) if use_cache else None
+
+    if entry is not None and entry.fresh():
+        response_cache.hits += 1
+        return _from_cache(entry, "hit", max_bytes)
+
+    request_headers = entry.validators() if entry is not None else {}
+    request_timeout = aiohttp.ClientTimeout(total=timeout) if timeout else None
+
+    async with get_session().get(
+        url, params=params, headers=request_headers, timeout=request_timeout
+    ) as resp:
+        headers = _kept_headers(resp)
+
+        if resp.status == 304 and entry is not None:
+            response_cache.revalidations += 1
+            response_cache.refresh(key, entry, headers)
+            return _from_cache(entry, "revalidated", max_bytes)
+
+        body, truncated = await _read_capped(resp, max_bytes)
+        status = resp.status
+        content_length = resp.content_length
+
+    result = HttpResult(
+        status=status,
+        headers=headers,
+        body=body,
+        cache="miss" if use_cache else "bypass",
+        truncated=truncated,
+        content_length=content_length
+    )
+
+    if not use_cache:
+        return result
+
+    response_cache.misses += 1
+    if status == 200 and not truncated:
+        response_cache.put(key, status, headers, body)
+    elif not truncated:
+        response_cache.discard(key)
+
+    return result
+
+
+def http_stats() -> Dict[str, Any]:
+    connector = _session.connector if _session is not None and not _session.closed else None
+    return {
+        "session_open": connector is not None,
+        "pool_limit": HTTP_POOL_LIMIT,
+        "pool_limit_per_host": HTTP_POOL_LIMIT_PER_HOST,
+        "response_cache": response_cache.stats(),
+    }
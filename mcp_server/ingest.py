@@ -0,0 +1,47 @@
+"""
+Command-line directory ingestion.
+
+Usage:
+    python -m mcp_server.ingest data/ --namespace docs
+
+Only files that changed since the last run are re-embedded;
+chunks of deleted files are removed from the namespace.
+"""
+
+import argparse
+import asyncio
+
+from .vector_store.directory_sync import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_SIZE,
+    sync_directory,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync a directory into a RAG namespace.")
+    parser.add_argument("directory")
+    parser.add_argument("--namespace", default="default")
+    parser.add_argument("--ext", action="append", dest="extensions",
+                        help="File extension to include (repeatable).")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--chunk-overlap", type=int, default=DEFAULT_CHUNK_OVERLAP)
+    args = parser.parse_args()
+
+    async def on_progress(done: int, total: int):
+        print(f"[INGEST] {done}/{total} chunks", end="\r")
+
+    report = asyncio.run(sync_directory(
+        args.directory,
+        namespace=args.namespace,
+        extensions=args.extensions,
+        chunk_size=args.chunk_size,
+        chunk_overlap=args.chunk_overlap,
+        progress=on_progress
+    ))
+
+    print(f"[INGEST] {report.model_dump_json(indent=2)}")
+
+
+if __name__ == "__main__":
+    main()
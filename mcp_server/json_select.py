@@ -0,0 +1,86 @@
+"""
+JSON projection for fetch_api_data
+----------------------------------
+
+A small JSONPath-style selector, so a tool call returns only the fields
+the agent needs instead of a whole API payload:
+
+    $.data.items[0].name      one value
+    items[*].id               a list (wildcard over a list or dict values)
+    name, stats.count         several paths → {"name": ..., "stats.count": ...}
+
+The leading "$." is optional. Missing keys / indexes select nothing
+(None for single values, skipped inside wildcards).
+"""
+
+import re
+from typing import Any, List, Union
+
+
+_TOKEN_RE = re.compile(r"\[(\*|-?\d+)\]|\.?([^.\[\]]+)")
+
+_MISSING = object()
+
+
+def _parse(path: str) -> List[Union[str, int]]:
+    path = path.strip()
+    if path.startswith("$"):
+        path = path[1:]
+
+    steps: List[Union[str, int]] = []
+    pos = 0
+    while pos < len(path):
+        match = _TOKEN_RE.match(path, pos)
+        if not match:
+            raise ValueError(f"Invalid select path '{path}' at position {pos}.")
+        index, key = match.groups()
+        if index is not None:
+            steps.append("*" if index == "*" else int(index))
+        else:
+            steps.append(key.strip())
+        pos = match.end()
+
+    return steps
+
+
+def _walk(value: Any, steps: List[Union[str, int]]) -> Any:
+    if not steps:
+        return value
+
+    step, rest = steps[0], steps[1:]
+
+    if step == "*":
+        items = value.values() if isinstance(value, dict) else value if isinstance(value, list) else []
+        found = (_walk(item, rest) for item in items)
+        return [item for item in found if item is not _MISSING]
+
+    if isinstance(step, int):
+        if isinstance(value, list) and -len(value) <= step < len(value):
+            return _walk(value[step], rest)
+        return _MISSING
+
+    if isinstance(value, dict) and step in value:
+        return _walk(value[step], rest)
+    return _MISSING
+
+
+def select(data: Any, expression: str) -> Any:
+    """
+    Project parsed JSON with one or more comma-separated paths.
+
+    Raises:
+        ValueError: on a malformed path.
+    """
+
+    paths = [p.strip() for p in expression.split(",") if p.strip()]
+    if not paths:
+        raise ValueError("select needs at least one path.")
+
+    results = {}
+    for path in paths:
+        value = _walk(data, _parse(path))
+        results[path] = None if value is _MISSING else value
+
+    if len(paths) == 1:
+        return results[paths[0]]
+    return results
@@ -1,12 +1,21 @@
 import asyncio
 from mcp.server import FastMCP
+from mcp.server.fastmcp import Context
 from pydantic import BaseModel
 
 # Import tool implementations
 from .tools.health_tool import health_check_tool
 from .tools.api_fetch_tool import fetch_api_data_tool
-from .tools.rag_index_tool import rag_index_tool
+from .tools.rag_index_tool import rag_index_tool, rag_index_status_tool
 from .tools.rag_query_tool import rag_query_tool
+from .tools.rag_namespace_tool import rag_list_namespaces_tool, rag_drop_namespace_tool
+from .tools.rag_ingest_dir_tool import rag_ingest_directory_tool
+from .tools.rag_delete_tool import rag_delete_tool
+from .tools.rag_query_batch_tool import rag_query_batch_tool
+from .tools.api_fetch_batch_tool import fetch_api_data_batch_tool
+from .workers import tool_limiter, worker_pool
+from .http_client import close_session
+from .vector_store.rerank import RAG_POSTPROCESS_ENABLED, RERANK_WARMUP, warm_cross_encoder
 
 
 # Initialize FastMCP server
@@ -18,47 +27,264 @@ mcp = FastMCP(name="mcp-langgraph-server")
 # ------------------------------------------------------------------
 @mcp.tool()
 async def health_check():
-    """Returns OK if MCP server is alive."""
-    return await health_check_tool(input={})
+    """Returns OK if MCP server is alive, plus server metrics."""
+    from .tools.health_tool import HealthToolInput
+    result = await health_check_tool(input=HealthToolInput())
+    return result.model_dump()
 
 
 # ------------------------------------------------------------------
 # Tool 2: Fetch API Data
 # ------------------------------------------------------------------
 @mcp.tool()
-async def fetch_api_data(url: str) -> str:
-    """Fetch JSON from any public API endpoint."""
-    from .tools.api_fetch_tool import FetchAPIDataInput
-    return await fetch_api_data_tool(input=FetchAPIDataInput(url=url))
+async def fetch_api_data(
+    url: str,
+    params: dict = None,
+    use_cache: bool = True,
+    max_bytes: int = None,
+    select: str = None,
+    timeout: float = None
+) -> dict:
+    """
+    Fetch JSON from any public API endpoint (pooled connections, HTTP caching).
+    Use select (e.g. "$.items[*].name") to return only the fields you need.
+    """
+    from .tools.api_fetch_tool import ApiFetchInput
+
+    options = {"max_bytes": max_bytes, "timeout": timeout}
+    async with tool_limiter.slot("fetch_api_data"):
+        result = await fetch_api_data_tool(input=ApiFetchInput(
+            url=url,
+            params=params,
+            use_cache=use_cache,
+            select=select,
+            **{k: v for k, v in options.items() if v is not None}
+        ))
+    return result.model_dump()
 
 
 # ------------------------------------------------------------------
 # Tool 3: RAG Index
 # ------------------------------------------------------------------
 @mcp.tool()
-async def rag_index(texts: list, metadatas: list = None, namespace: str = "default") -> dict:
-    """Index text into ChromaDB for retrieval."""
+async def rag_index(
+    texts: list,
+    ctx: Context,
+    metadatas: list = None,
+    ids: list = None,
+    namespace: str = "default",
+    batch_size: int = None,
+    concurrency: int = None,
+    background: bool = False
+) -> dict:
+    """
+    Index text into ChromaDB for retrieval (upsert by chunk id;
+    ids default to a hash of each text, so re-indexing is idempotent).
+    Large inputs are embedded in concurrent batches with progress
+    notifications; background=True returns a job_id to poll instead.
+    """
     from .tools.rag_index_tool import RAGIndexInput
-    result = await rag_index_tool(input=RAGIndexInput(
-        texts=texts,
-        metadatas=metadatas,
-        namespace=namespace
-    ))
+
+    options = {"batch_size": batch_size, "concurrency": concurrency}
+    async with tool_limiter.slot("rag_index"):
+        result = await rag_index_tool(
+            input=RAGIndexInput(
+                texts=texts,
+                metadatas=metadatas,
+                ids=ids,
+                namespace=namespace,
+                background=background,
+                **{k: v for k, v in options.items() if v is not None}
+            ),
+            progress=ctx.report_progress
+        )
     return result.model_dump()
 
 
+@mcp.tool()
+async def rag_index_status(job_id: str) -> dict:
+    """Poll a background rag_index job (status, progress, chunks/sec)."""
+    from .tools.rag_index_tool import RAGIndexStatusInput
+    job = await rag_index_status_tool(input=RAGIndexStatusInput(job_id=job_id))
+    if job is None:
+        return {"job_id": job_id, "status": "unknown"}
+    return job.model_dump()
+
+
 # ------------------------------------------------------------------
 # Tool 4: RAG Query
 # ------------------------------------------------------------------
 @mcp.tool()
-async def rag_query(query: str, namespace: str = "default", k: int = 5) -> dict:
-    """Query embeddings from ChromaDB."""
+async def rag_query(
+    query: str,
+    namespace: str = "default",
+    k: int = 5,
+    mode: str = "vector",
+    where: dict = None,
+    where_document: dict = None,
+    score_threshold: float = None,
+    mmr: bool = False,
+    rerank: bool = False,
+    fetch_k: int = None,
+    lambda_mult: float = None,
+    budget_ms: float = None,
+    rrf_k: int = None
+) -> dict:
+    """Query a namespace by vector similarity, BM25 (exact terms) or hybrid, with optional metadata filters."""
     from .tools.rag_query_tool import RAGQueryInput
-    result = await rag_query_tool(input=RAGQueryInput(
-        query=query,
-        namespace=namespace,
-        k=k
-    ))
+
+    options = {"lambda_mult": lambda_mult, "budget_ms": budget_ms, "rrf_k": rrf_k}
+    async with tool_limiter.slot("rag_query"):
+        result = await rag_query_tool(input=RAGQueryInput(
+            query=query,
+            namespace=namespace,
+            k=k,
+            mode=mode,
+            where=where,
+            where_document=where_document,
+            score_threshold=score_threshold,
+            mmr=mmr,
+            rerank=rerank,
+            fetch_k=fetch_k,
+            **{k: v for k, v in options.items() if v is not None}
+        ))
+    return result.model_dump()
+
+
+# ------------------------------------------------------------------
+# Tool 5: RAG Delete
+# ------------------------------------------------------------------
+@mcp.tool()
+async def rag_delete(namespace: str = "default", ids: list = None, where: dict = None) -> dict:
+    """Delete chunks from a namespace by id and/or metadata filter."""
+    from .tools.rag_delete_tool import RAGDeleteInput
+    async with tool_limiter.slot("rag_delete"):
+        result = await rag_delete_tool(input=RAGDeleteInput(
+            namespace=namespace,
+            ids=ids,
+            where=where
+        ))
+    return result.model_dump()
+
+
+# ------------------------------------------------------------------
+# Tool 6: RAG Namespaces (list / drop)
+# ------------------------------------------------------------------
+@mcp.tool()
+async def rag_list_namespaces() -> dict:
+    """List RAG namespaces (one Chroma collection per namespace)."""
+    async with tool_limiter.slot("rag_list_namespaces"):
+        result = await rag_list_namespaces_tool()
+    return result.model_dump()
+
+
+@mcp.tool()
+async def rag_drop_namespace(namespace: str) -> dict:
+    """Delete a RAG namespace and all of its vectors."""
+    from .tools.rag_namespace_tool import RAGDropNamespaceInput
+    async with tool_limiter.slot("rag_drop_namespace"):
+        result = await rag_drop_namespace_tool(input=RAGDropNamespaceInput(namespace=namespace))
+    return result.model_dump()
+
+
+# ------------------------------------------------------------------
+# Tool 7: RAG Directory Ingestion (incremental)
+# ------------------------------------------------------------------
+@mcp.tool()
+async def rag_ingest_directory(
+    ctx: Context,
+    directory: str = ".",
+    namespace: str = "default",
+    extensions: list = None,
+    chunk_size: int = None,
+    chunk_overlap: int = None
+) -> dict:
+    """
+    Sync a directory (under data/) into a namespace.
+    Only changed files are re-embedded; removed files' chunks are deleted.
+    """
+    from .tools.rag_ingest_dir_tool import RAGIngestDirectoryInput
+
+    options = {"chunk_size": chunk_size, "chunk_overlap": chunk_overlap}
+    async with tool_limiter.slot("rag_ingest_directory"):
+        result = await rag_ingest_directory_tool(
+            input=RAGIngestDirectoryInput(
+                directory=directory,
+                namespace=namespace,
+                extensions=extensions,
+                **{k: v for k, v in options.items() if v is not None}
+            ),
+            progress=ctx.report_progress
+        )
+    return result.model_dump()
+
+
+# ------------------------------------------------------------------
+# Tool 8: RAG Query Batch
+# ------------------------------------------------------------------
+@mcp.tool()
+async def rag_query_batch(
+    queries: list,
+    namespace: str = "default",
+    k: int = 5,
+    mode: str = "vector",
+    where: dict = None,
+    where_document: dict = None,
+    score_threshold: float = None,
+    dedupe: bool = False,
+    mmr: bool = False,
+    rerank: bool = False,
+    fetch_k: int = None,
+    lambda_mult: float = None,
+    budget_ms: float = None,
+    rrf_k: int = None
+) -> dict:
+    """Run several RAG queries in one call (queries embedded in one batch); optionally de-duplicate chunks across queries."""
+    from .tools.rag_query_batch_tool import RAGQueryBatchInput
+
+    options = {"lambda_mult": lambda_mult, "budget_ms": budget_ms, "rrf_k": rrf_k}
+    async with tool_limiter.slot("rag_query_batch"):
+        result = await rag_query_batch_tool(input=RAGQueryBatchInput(
+            queries=queries,
+            namespace=namespace,
+            k=k,
+            mode=mode,
+            where=where,
+            where_document=where_document,
+            score_threshold=score_threshold,
+            dedupe=dedupe,
+            mmr=mmr,
+            rerank=rerank,
+            fetch_k=fetch_k,
+            **{k: v for k, v in options.items() if v is not None}
+        ))
+    return result.model_dump()
+
+
+# ------------------------------------------------------------------
+# Tool 9: Fetch API Data Batch
+# ------------------------------------------------------------------
+@mcp.tool()
+async def fetch_api_data_batch(
+    requests: list,
+    concurrency: int = 8,
+    timeout: float = None,
+    max_bytes: int = None
+) -> dict:
+    """
+    Fetch several API URLs concurrently in one call. requests is a list of
+    {"url", "params"?, "select"?}; results come back in the same order with
+    per-item status, error and timing.
+    """
+    from .tools.api_fetch_batch_tool import ApiFetchBatchInput
+
+    options = {"timeout": timeout, "max_bytes": max_bytes}
+    async with tool_limiter.slot("fetch_api_data_batch"):
+        result = await fetch_api_data_batch_tool(input=ApiFetchBatchInput(
+            requests=requests,
+            concurrency=concurrency,
+            **{k: v for k, v in options.items() if v is not None}
+        ))
     return result.model_dump()
 
 
@@ -68,8 +294,17 @@ async def start_server_stdio():
     This is required for LangGraph's MCPClient.from_stdio().
     """
     print("[MCP] Server starting on STDIO...")
+    if RAG_POSTPROCESS_ENABLED and RERANK_WARMUP:
+        # One load per CPU worker process (or on the threads if there are none)
+        await asyncio.gather(*(
+            worker_pool.run_cpu(warm_cross_encoder)
+            for _ in range(max(1, worker_pool.processes))
+        ))
     # await mcp.run_stdio_async()
-    await mcp.run_streamable_http_async()
+    try:
+        await mcp.run_streamable_http_async()
+    finally:
+        await close_session()
     # mcp.run(transport="streamable-http")
     print("[MCP] Server stopped.")
 
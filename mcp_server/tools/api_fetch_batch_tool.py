@@ -0,0 +1,128 @@
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field
+
+from .api_fetch_tool import FETCH_MAX_BYTES, ApiFetchInput, ApiFetchOutput, fetch_api_data_tool
+from ..http_client import HTTP_CACHE_ENABLED, HTTP_TIMEOUT
+
+
+# Requests in flight across all batch calls of this server process
+FETCH_BATCH_MAX_CONCURRENCY = int(os.getenv("FETCH_BATCH_MAX_CONCURRENCY", "16"))
+
+# Requests accepted per call
+MAX_BATCH_REQUESTS = 50
+
+_global_slots: Optional[asyncio.Semaphore] = None
+
+
+def _global_semaphore() -> asyncio.Semaphore:
+    global _global_slots
+
+    if _global_slots is None:
+        _global_slots = asyncio.Semaphore(FETCH_BATCH_MAX_CONCURRENCY)
+    return _global_slots
+
+
+# ---------------------------------------------------------
+# Pydantic Schemas
+# ---------------------------------------------------------
+
+class FetchSpec(BaseModel):
+    url: str = Field(..., description="Full URL of the public API endpoint.")
+    params: Optional[Dict[str, Any]] = Field(default=None, description="Optional query parameters.")
+    select: Optional[str] = Field(default=None, description="JSONPath-style projection of the response.")
+
+
+class ApiFetchBatchInput(BaseModel):
+    requests: List[FetchSpec] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_REQUESTS,
+        description="Requests to fetch concurrently; results keep this order."
+    )
+    concurrency: int = Field(
+        default=8,
+        ge=1,
+        description="Requests of this call in flight at once (also capped server-wide)."
+    )
+    timeout: float = Field(
+        default=HTTP_TIMEOUT,
+        gt=0,
+        description="Per-request timeout in seconds."
+    )
+    max_bytes: int = Field(
+        default=FETCH_MAX_BYTES,
+        ge=1,
+        description="Per-request cap on response bytes read."
+    )
+    use_cache: bool = Field(default=HTTP_CACHE_ENABLED)
+
+
+class ApiFetchBatchItem(ApiFetchOutput):
+    url: str
+    elapsed_ms: float
+
+
+class ApiFetchBatchOutput(BaseModel):
+    results: List[ApiFetchBatchItem]
+    succeeded: int
+    failed: int
+    elapsed_ms: float
+
+
+# ---------------------------------------------------------
+# Tool Handler
+# ---------------------------------------------------------
+
+async def fetch_api_data_batch_tool(input: ApiFetchBatchInput) -> ApiFetchBatchOutput:
+    """
+    Fetch several URLs concurrently over the shared connection pool.
+
+    One failing request never fails the batch: each item carries its
+    own status / error and timing, in input order.
+    """
+
+    started = time.perf_counter()
+    local_slots = asyncio.Semaphore(input.concurrency)
+
+    async def fetch(spec: FetchSpec) -> ApiFetchBatchItem:
+        async with local_slots, _global_semaphore():
+            item_started = time.perf_counter()
+            result = await fetch_api_data_tool(ApiFetchInput(
+                url=spec.url,
+                params=spec.params,
+                select=spec.select,
+                use_cache=input.use_cache,
+                max_bytes=input.max_bytes,
+                timeout=input.timeout
+            ))
+
+        return ApiFetchBatchItem(
+            **result.model_dump(),
+            url=spec.url,
+            elapsed_ms=round((time.perf_counter() - item_started) * 1000, 2)
+        )
+
+    results = await asyncio.gather(*(fetch(spec) for spec in input.requests))
+    failed = sum(1 for item in results if item.error)
+
+    return ApiFetchBatchOutput(
+        results=list(results),
+        succeeded=len(results) - failed,
+        failed=failed,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 2)
+    )
+
+
+# ---------------------------------------------------------
+# Schema Exposure Helpers
+# ---------------------------------------------------------
+
+def input_schema():
+    return ApiFetchBatchInput.model_json_schema()
+
+
+def output_schema():
+    return ApiFetchBatchOutput.model_json_schema()
@@ -1,8 +1,19 @@
-import aiohttp
+import asyncio
 import json
+import os
 from typing import Optional, Dict, Any
 from pydantic import BaseModel, Field
 
+from ..http_client import HTTP_CACHE_ENABLED, HTTP_CACHE_MAX_ENTRY_BYTES, HTTP_TIMEOUT, http_get
+from ..json_select import select as select_json
+
+
+# Default cap on response bytes read per call
+FETCH_MAX_BYTES = int(os.getenv("FETCH_MAX_BYTES", str(256 * 1024)))
+
+# Bytes read (and parsed) when select is given; max_bytes then caps the projection
+FETCH_SELECT_MAX_BYTES = int(os.getenv("FETCH_SELECT_MAX_BYTES", str(HTTP_CACHE_MAX_ENTRY_BYTES)))
+
 
 # ---------------------------------------------------------
 # Pydantic Schemas
@@ -14,12 +25,35 @@ class ApiFetchInput(BaseModel):
         default=None,
         description="Optional query parameters."
     )
+    use_cache: bool = Field(
+        default=HTTP_CACHE_ENABLED,
+        description="Serve from / store in the HTTP response cache (honours Cache-Control and ETag)."
+    )
+    max_bytes: int = Field(
+        default=FETCH_MAX_BYTES,
+        ge=1,
+        description="Stop reading the response after this many bytes "
+                    "(with select: cap on the serialized projection)."
+    )
+    select: Optional[str] = Field(
+        default=None,
+        description="JSONPath-style projection, e.g. \"$.items[*].name\" or \"name, stats.count\"."
+    )
+    timeout: float = Field(
+        default=HTTP_TIMEOUT,
+        gt=0,
+        description="Seconds before the request is abandoned."
+    )
 
 
 class ApiFetchOutput(BaseModel):
     status: int
     data: Any
     error: Optional[str] = None
+    cache: Optional[str] = None  # "hit" | "revalidated" | "miss" | "bypass"
+    truncated: bool = False
+    bytes_read: int = 0
+    content_length: Optional[int] = None
 
 
 # ---------------------------------------------------------
@@ -29,39 +63,82 @@ class ApiFetchOutput(BaseModel):
 async def fetch_api_data_tool(input: ApiFetchInput) -> ApiFetchOutput:
     """
     Generic API fetch tool for MCP.
-    Fetches a public API URL using aiohttp and returns JSON.
+    Fetches a public API URL over the shared HTTP session and returns JSON,
+    reading at most max_bytes and optionally projecting it with select.
+
+    With select, up to FETCH_SELECT_MAX_BYTES are read and parsed so a
+    large payload can still be projected; max_bytes then caps the
+    serialized projection.
     """
 
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(input.url, params=input.params, timeout=15) as resp:
-                status = resp.status
+    read_limit = max(input.max_bytes, FETCH_SELECT_MAX_BYTES) if input.select else input.max_bytes
 
-                # Try parsing JSON response
-                try:
-                    data = await resp.json()
-                except Exception:
-                    # Fallback to text if it's not JSON
-                    data = await resp.text()
-
-                if status >= 400:
-                    return ApiFetchOutput(
-                        status=status,
-                        data=data,
-                        error=f"HTTP error {status}"
-                    )
-
-                return ApiFetchOutput(
-                    status=status,
-                    data=data,
-                    error=None
+    try:
+        result = await http_get(
+            input.url,
+            params=input.params,
+            use_cache=input.use_cache,
+            max_bytes=read_limit,
+            timeout=input.timeout
+        )
+        status = result.status
+        truncated = result.truncated
+        errors = []
+
+        if status >= 400:
+            errors.append(f"HTTP error {status}")
+
+        # Try parsing JSON response (a truncated body is returned as text)
+        try:
+            data = json.loads(result.body)
+            parsed = True
+        except ValueError:
+            data = result.body.decode("utf-8", errors="replace")
+            parsed = False
+
+        if input.select:
+            if not parsed:
+                errors.append(
+                    f"Response truncated at {read_limit} bytes; select needs the full JSON body."
+                    if truncated else "select needs a JSON response."
                 )
+                data = data[:input.max_bytes]
+            else:
+                try:
+                    data = select_json(data, input.select)
+                    truncated = False
+                except ValueError as e:
+                    errors.append(f"Invalid select: {e}")
+                    data = None
+
+                # max_bytes applies to what is returned: the projection
+                projected = json.dumps(data).encode()
+                if len(projected) > input.max_bytes:
+                    data = projected[:input.max_bytes].decode("utf-8", errors="replace")
+                    truncated = True
+
+        return ApiFetchOutput(
+            status=status,
+            data=data,
+            error="; ".join(errors) or None,
+            cache=result.cache,
+            truncated=truncated,
+            bytes_read=len(result.body),
+            content_length=result.content_length
+        )
+
+    except asyncio.TimeoutError:
+        return ApiFetchOutput(
+            status=504,
+            data=None,
+            error=f"Timed out after {input.timeout}s"
+        )
 
     except Exception as e:
         return ApiFetchOutput(
             status=500,
             data=None,
-            error=str(e)
+            error=str(e) or type(e).__name__
         )
 
 
@@ -1,7 +1,11 @@
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict, Any
 from pydantic import BaseModel
 
+from ..vector_store.chroma_store import get_embeddings
+from ..http_client import http_stats
+from ..workers import tool_limiter, worker_pool
+
 
 # ---------------------------------------------------------
 # Pydantic Schemas
@@ -16,21 +20,32 @@ class HealthToolOutput(BaseModel):
     status: str
     timestamp: str
     detail: Optional[str] = None
+    metrics: Optional[Dict[str, Any]] = None
 
 
 # ---------------------------------------------------------
 # Tool Handler
 # ---------------------------------------------------------
 
-async def health_check_tool(_: HealthToolInput) -> HealthToolOutput:
+async def health_check_tool(input: HealthToolInput) -> HealthToolOutput:
     """
-    A simple health check tool that returns server status.
+    A simple health check tool that returns server status plus cache,
+    worker pool, per-tool concurrency and HTTP client metrics.
+
+    It never touches the worker pool, so it answers even when every
+    worker is busy.
     """
 
     return HealthToolOutput(
         status="ok",
         timestamp=datetime.utcnow().isoformat(),
-        detail="MCP server alive and operational"
+        detail="MCP server alive and operational",
+        metrics={
+            "embedding_cache": get_embeddings().stats(),
+            "workers": worker_pool.stats(),
+            "tools": tool_limiter.stats(),
+            "http": http_stats(),
+        }
     )
 
 
@@ -0,0 +1,60 @@
+from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, model_validator
+
+from ..vector_store.ingestion import delete_chunks
+
+
+# ---------------------------------------------------------
+# INPUT / OUTPUT SCHEMAS
+# ---------------------------------------------------------
+
+class RAGDeleteInput(BaseModel):
+    namespace: str = Field(default="default")
+    ids: Optional[List[str]] = Field(
+        default=None,
+        description="Chunk ids to delete."
+    )
+    where: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Chroma metadata filter, e.g. {\"source\": \"faq.md\"}."
+    )
+
+    @model_validator(mode="after")
+    def _require_selector(self):
+        if not self.ids and not self.where:
+            raise ValueError("Provide ids and/or a where filter.")
+        return self
+
+
+class RAGDeleteOutput(BaseModel):
+    deleted_count: int
+    namespace: str
+
+
+# ---------------------------------------------------------
+# TOOL IMPLEMENTATION
+# ---------------------------------------------------------
+
+async def rag_delete_tool(input: RAGDeleteInput) -> RAGDeleteOutput:
+    """
+    Delete chunks from a namespace by id and/or metadata filter.
+    """
+
+    deleted = await delete_chunks(input.namespace, ids=input.ids, where=input.where)
+
+    return RAGDeleteOutput(
+        deleted_count=deleted,
+        namespace=input.namespace
+    )
+
+
+# ---------------------------------------------------------
+# SCHEMA EXPOSURE HELPERS
+# ---------------------------------------------------------
+
+def input_schema():
+    return RAGDeleteInput.model_json_schema()
+
+
+def output_schema():
+    return RAGDeleteOutput.model_json_schema()
@@ -2,7 +2,15 @@ from typing import Optional, List
 from pydantic import BaseModel, Field
 
 # from .vector_store.chroma_store import ChromaVectorStore
-from ..vector_store.chroma_store import get_chroma
+from ..vector_store.ingestion import (
+    INGEST_BATCH_SIZE,
+    INGEST_CONCURRENCY,
+    IngestJob,
+    ProgressCallback,
+    get_ingest_job,
+    ingest_texts,
+    start_ingest_job,
+)
 
 
 # ---------------------------------------------------------
@@ -15,9 +23,28 @@ class RAGIndexInput(BaseModel):
         default=None,
         description="Optional metadata per chunk."
     )
+    ids: Optional[List[str]] = Field(
+        default=None,
+        description="Optional id per chunk; defaults to a hash of the chunk text. "
+                    "Chunks with an existing id are replaced (upsert)."
+    )
     namespace: str = Field(
         default="default",
-        description="Namespace / collection name for Chroma persistence."
+        description="Namespace; each namespace is stored in its own Chroma collection."
+    )
+    batch_size: int = Field(
+        default=INGEST_BATCH_SIZE,
+        ge=1,
+        description="Chunks embedded and written per batch."
+    )
+    concurrency: int = Field(
+        default=INGEST_CONCURRENCY,
+        ge=1,
+        description="Batches embedded concurrently."
+    )
+    background: bool = Field(
+        default=False,
+        description="Return a job_id immediately and ingest in the background."
     )
 
 
@@ -25,32 +52,74 @@ class RAGIndexOutput(BaseModel):
     success: bool
     stored_count: int
     namespace: str
+    duplicates: int = 0
+    batches: int = 0
+    elapsed_ms: float = 0.0
+    chunks_per_sec: float = 0.0
+    job_id: Optional[str] = None
+
+
+class RAGIndexStatusInput(BaseModel):
+    job_id: str = Field(..., description="Job id returned by rag_index(background=True).")
 
 
 # ---------------------------------------------------------
 # TOOL IMPLEMENTATION
 # ---------------------------------------------------------
 
-async def rag_index_tool(input: RAGIndexInput) -> RAGIndexOutput:
+async def rag_index_tool(
+    input: RAGIndexInput,
+    progress: Optional[ProgressCallback] = None
+) -> RAGIndexOutput:
     """
     Index text into ChromaDB using Ollama embeddings.
-    """
 
-    store = get_chroma()
+    Texts are split into batches that are embedded concurrently
+    and written off the event loop; progress is reported per batch.
+    Chunks are upserted by id, so re-indexing the same texts is idempotent.
+    """
 
-    count = len(input.texts)
-    store.add_texts(
-        texts=input.texts,
-        metadatas=input.metadatas
+    if input.background:
+        job = start_ingest_job(
+            input.namespace,
+            input.texts,
+            input.metadatas,
+            batch_size=input.batch_size,
+            concurrency=input.concurrency,
+            ids=input.ids
+        )
+        return RAGIndexOutput(
+            success=True,
+            stored_count=0,
+            namespace=input.namespace,
+            job_id=job.job_id
+        )
+
+    stats = await ingest_texts(
+        input.namespace,
+        input.texts,
+        input.metadatas,
+        batch_size=input.batch_size,
+        concurrency=input.concurrency,
+        progress=progress,
+        ids=input.ids
     )
 
     return RAGIndexOutput(
         success=True,
-        stored_count=count,
-        namespace=input.namespace
+        namespace=input.namespace,
+        **stats.model_dump()
     )
 
 
+async def rag_index_status_tool(input: RAGIndexStatusInput) -> Optional[IngestJob]:
+    """
+    Poll a background ingestion job.
+    """
+
+    return get_ingest_job(input.job_id)
+
+
 # ---------------------------------------------------------
 # SCHEMA EXPOSURE HELPERS
 # ---------------------------------------------------------
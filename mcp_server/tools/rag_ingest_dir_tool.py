@@ -0,0 +1,77 @@
+import os
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+from ..vector_store.directory_sync import (
+    DEFAULT_CHUNK_OVERLAP,
+    DEFAULT_CHUNK_SIZE,
+    SyncReport,
+    sync_directory,
+)
+from ..vector_store.ingestion import ProgressCallback
+
+
+# Directories the tool may ingest must live under this root
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+INGEST_ROOT = os.path.abspath(
+    os.getenv("INGEST_ROOT", os.path.join(BASE_DIR, "..", "..", "data"))
+)
+
+
+# ---------------------------------------------------------
+# INPUT / OUTPUT SCHEMAS
+# ---------------------------------------------------------
+
+class RAGIngestDirectoryInput(BaseModel):
+    directory: str = Field(
+        default=".",
+        description="Directory to ingest, relative to the server's ingest root (data/)."
+    )
+    namespace: str = Field(default="default")
+    extensions: Optional[List[str]] = Field(
+        default=None,
+        description="File extensions to include (default: .txt, .md, .markdown, .rst)."
+    )
+    chunk_size: int = Field(default=DEFAULT_CHUNK_SIZE, ge=100)
+    chunk_overlap: int = Field(default=DEFAULT_CHUNK_OVERLAP, ge=0)
+
+
+# ---------------------------------------------------------
+# TOOL IMPLEMENTATION
+# ---------------------------------------------------------
+
+async def rag_ingest_directory_tool(
+    input: RAGIngestDirectoryInput,
+    progress: Optional[ProgressCallback] = None
+) -> SyncReport:
+    """
+    Incrementally sync a directory into a namespace: only new or
+    changed files are re-embedded, chunks of removed files are deleted.
+    """
+
+    directory = os.path.abspath(os.path.join(INGEST_ROOT, input.directory))
+    if os.path.commonpath([directory, INGEST_ROOT]) != INGEST_ROOT:
+        raise ValueError(f"Directory must be inside the ingest root: {INGEST_ROOT}")
+    if not os.path.isdir(directory):
+        raise ValueError(f"Not a directory: {input.directory}")
+
+    return await sync_directory(
+        directory,
+        namespace=input.namespace,
+        extensions=input.extensions,
+        chunk_size=input.chunk_size,
+        chunk_overlap=input.chunk_overlap,
+        progress=progress
+    )
+
+
+# ---------------------------------------------------------
+# SCHEMA EXPOSURE HELPERS
+# ---------------------------------------------------------
+
+def input_schema():
+    return RAGIngestDirectoryInput.model_json_schema()
+
+
+def output_schema():
+    return SyncReport.model_json_schema()
@@ -0,0 +1,61 @@
+from typing import List
+from pydantic import BaseModel, Field
+
+from ..vector_store.backends import list_namespaces, drop_namespace
+from ..vector_store.lexical_index import get_lexical_index
+from ..workers import worker_pool
+
+
+# ---------------------------------------------------------
+# INPUT / OUTPUT SCHEMAS
+# ---------------------------------------------------------
+
+class RAGListNamespacesOutput(BaseModel):
+    namespaces: List[str]
+
+
+class RAGDropNamespaceInput(BaseModel):
+    namespace: str = Field(..., description="Namespace whose collection should be deleted.")
+
+
+class RAGDropNamespaceOutput(BaseModel):
+    dropped: bool
+    namespace: str
+
+
+# ---------------------------------------------------------
+# TOOL IMPLEMENTATION
+# ---------------------------------------------------------
+
+async def rag_list_namespaces_tool() -> RAGListNamespacesOutput:
+    """
+    List all RAG namespaces (Chroma collections and flat indexes).
+    """
+
+    return RAGListNamespacesOutput(namespaces=await worker_pool.run(list_namespaces))
+
+
+async def rag_drop_namespace_tool(input: RAGDropNamespaceInput) -> RAGDropNamespaceOutput:
+    """
+    Delete a namespace and all of its vectors.
+    """
+
+    dropped = await worker_pool.run(drop_namespace, input.namespace)
+    await worker_pool.run(get_lexical_index().drop, input.namespace)
+
+    return RAGDropNamespaceOutput(
+        dropped=dropped,
+        namespace=input.namespace
+    )
+
+
+# ---------------------------------------------------------
+# SCHEMA EXPOSURE HELPERS
+# ---------------------------------------------------------
+
+def input_schema():
+    return RAGDropNamespaceInput.model_json_schema()
+
+
+def output_schema():
+    return RAGDropNamespaceOutput.model_json_schema()
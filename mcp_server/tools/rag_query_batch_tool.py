@@ -0,0 +1,84 @@
+import time
+from typing import List
+from pydantic import BaseModel, Field
+
+from .rag_query_tool import RAGQueryOptions
+from ..vector_store.retrieval import search_batch
+
+
+# Queries accepted per call
+MAX_BATCH_QUERIES = 64
+
+
+# ---------------------------------------------------------
+# INPUT / OUTPUT SCHEMAS
+# ---------------------------------------------------------
+
+class RAGQueryBatchInput(RAGQueryOptions):
+    queries: List[str] = Field(
+        ...,
+        min_length=1,
+        max_length=MAX_BATCH_QUERIES,
+        description="Questions to search for; each gets its own matches."
+    )
+    dedupe: bool = Field(
+        default=False,
+        description="Return each chunk only once, under the query where it ranks best."
+    )
+
+
+class RAGQueryBatchItem(BaseModel):
+    query: str
+    matches: List[dict]
+
+
+class RAGQueryBatchOutput(BaseModel):
+    results: List[RAGQueryBatchItem]
+    namespace: str
+    mode: str
+    duplicates_removed: int = 0
+    elapsed_ms: float
+
+
+# ---------------------------------------------------------
+# TOOL IMPLEMENTATION
+# ---------------------------------------------------------
+
+async def rag_query_batch_tool(input: RAGQueryBatchInput) -> RAGQueryBatchOutput:
+    """
+    Run several RAG queries in one call: uncached queries embedded in
+    one batch (a single model request for symmetric embedding models),
+    searches executed concurrently, results in input order.
+    """
+
+    started = time.perf_counter()
+
+    results, removed = await search_batch(
+        input.namespace,
+        input.queries,
+        dedupe=input.dedupe,
+        **input.search_options()
+    )
+
+    return RAGQueryBatchOutput(
+        results=[
+            RAGQueryBatchItem(query=query, matches=matches)
+            for query, matches in zip(input.queries, results, strict=True)
+        ],
+        namespace=input.namespace,
+        mode=input.mode,
+        duplicates_removed=removed,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 2)
+    )
+
+
+# ---------------------------------------------------------
+# SCHEMA EXPOSURE HELPERS
+# ---------------------------------------------------------
+
+def input_schema():
+    return RAGQueryBatchInput.model_json_schema()
+
+
+def output_schema():
+    return RAGQueryBatchOutput.model_json_schema()
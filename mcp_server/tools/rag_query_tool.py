@@ -1,24 +1,82 @@
-from typing import List
+from typing import Any, Dict, List, Literal, Optional
 from pydantic import BaseModel, Field
 
-# from .vector_store.chroma_store import ChromaVectorStore
-from ..vector_store.chroma_store import get_chroma
+from ..vector_store.retrieval import DEFAULT_RRF_K, search
 
 
 # ---------------------------------------------------------
 # INPUT / OUTPUT SCHEMAS
 # ---------------------------------------------------------
 
-class RAGQueryInput(BaseModel):
-    query: str = Field(..., description="User question to query using embeddings.")
-    namespace: str = Field(default="default")
+class RAGQueryOptions(BaseModel):
+    """
+    Search options shared by rag_query and rag_query_batch.
+    """
+
+    namespace: str = Field(
+        default="default",
+        description="Namespace to search; only this namespace's collection is queried."
+    )
     k: int = Field(default=5, description="Number of results to return.")
+    mode: Literal["vector", "bm25", "hybrid"] = Field(
+        default="vector",
+        description="vector (embeddings), bm25 (exact terms / identifiers) or hybrid (both, rank-fused)."
+    )
+    rrf_k: int = Field(
+        default=DEFAULT_RRF_K,
+        ge=1,
+        description="Reciprocal rank fusion constant used in hybrid mode."
+    )
+    where: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Chroma metadata filter applied inside the search, e.g. {\"source\": \"faq.md\"}."
+    )
+    where_document: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="Chroma document filter, e.g. {\"$contains\": \"refund\"}."
+    )
+    score_threshold: Optional[float] = Field(
+        default=None,
+        description="Drop matches scoring below this (cosine similarity for vector, BM25 for bm25, RRF for hybrid)."
+    )
+    mmr: bool = Field(
+        default=False,
+        description="Diversify results with maximal marginal relevance (drops near-duplicate chunks)."
+    )
+    rerank: bool = Field(
+        default=False,
+        description="Reorder results with a local cross-encoder."
+    )
+    fetch_k: Optional[int] = Field(
+        default=None,
+        ge=1,
+        description="Candidates fetched before MMR / rerank narrow them to k (default 4 * k)."
+    )
+    lambda_mult: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="MMR trade-off: 1 = pure relevance, 0 = pure diversity."
+    )
+    budget_ms: Optional[float] = Field(
+        default=None,
+        gt=0,
+        description="Latency budget of the MMR / rerank stage (default RAG_POSTPROCESS_BUDGET_MS)."
+    )
+
+    def search_options(self) -> dict:
+        return self.model_dump(exclude={"namespace", "query", "queries", "dedupe"})
+
+
+class RAGQueryInput(RAGQueryOptions):
+    query: str = Field(..., description="User question to query using embeddings.")
 
 
 class RAGQueryOutput(BaseModel):
     matches: List[dict]
     namespace: str
     query: str
+    mode: str
 
 
 # ---------------------------------------------------------
@@ -27,22 +85,17 @@ class RAGQueryOutput(BaseModel):
 
 async def rag_query_tool(input: RAGQueryInput) -> RAGQueryOutput:
     """
-    Perform vector similarity search in ChromaDB.
+    Search the namespace by vector similarity, BM25, or both fused (RRF),
+    optionally diversified (MMR) and reranked (cross-encoder).
     """
 
-    store = get_chroma()
-
-    docs = store.similarity_search(
-        query=input.query,
-        k=input.k
-    )
-
-    matches = [{"page_content": doc.page_content, "metadata": doc.metadata} for doc in docs]
+    matches = await search(input.namespace, input.query, **input.search_options())
 
     return RAGQueryOutput(
         matches=matches,
         namespace=input.namespace,
-        query=input.query
+        query=input.query,
+        mode=input.mode
     )
 
 
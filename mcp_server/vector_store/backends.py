@@ -0,0 +1,163 @@
+"""
+Namespace → vector backend
+--------------------------
+
+get_vector_store(namespace) is what the RAG tools read and write
+through. Namespaces listed in FLAT_NAMESPACES are served by the
+in-memory flat index (flat_index.py); every other namespace by its
+Chroma collection.
+
+A namespace switched to the flat backend is seeded from its Chroma
+collection on first use (stored embeddings are copied, nothing is
+re-embedded).
+"""
+
+import os
+import threading
+from typing import Dict, List
+
+from .base import VectorBackend
+from .chroma_store import CHROMA_PATH, collection_name, get_chroma
+from .chroma_store import drop_namespace as drop_chroma_namespace
+from .chroma_store import list_namespaces as list_chroma_namespaces
+from .flat_index import FlatIndex
+
+
+# Comma-separated namespaces served by the flat in-memory index
+FLAT_NAMESPACES = {
+    ns.strip() for ns in os.getenv("FLAT_NAMESPACES", "").split(",") if ns.strip()
+}
+
+FLAT_INDEX_PATH = os.path.join(CHROMA_PATH, "flat")
+
+
+class ChromaBackend(VectorBackend):
+    """
+    Thin adapter over a namespace's Chroma collection.
+    """
+
+    def __init__(self, namespace: str):
+        self._collection = get_chroma(namespace)._collection
+
+    @property
+    def metadata(self):
+        return self._collection.metadata or {}
+
+    def upsert(self, ids, embeddings, documents=None, metadatas=None):
+        self._collection.upsert(
+            ids=ids, embeddings=embeddings, documents=documents, metadatas=metadatas
+        )
+
+    def get(self, ids=None, where=None, where_document=None, limit=None, offset=None, include=None):
+        return self._collection.get(
+            ids=ids,
+            where=where,
+            where_document=where_document,
+            limit=limit,
+            offset=offset,
+            include=include if include is not None else ["documents", "metadatas"]
+        )
+
+    def delete(self, ids):
+        self._collection.delete(ids=ids)
+
+    def query(self, query_embeddings, n_results=10, where=None, where_document=None, include=None):
+        return self._collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            where=where,
+            where_document=where_document,
+            include=include if include is not None else ["documents", "metadatas", "distances"]
+        )
+
+    def count(self) -> int:
+        return self._collection.count()
+
+
+_flat: Dict[str, FlatIndex] = {}
+_lock = threading.Lock()
+
+
+def _flat_index(namespace: str) -> FlatIndex:
+    with _lock:
+        index = _flat.get(namespace)
+        if index is not None:
+            return index
+
+        # collection_name() validates the namespace before it becomes a path
+        collection_name(namespace)
+        index = FlatIndex(os.path.join(FLAT_INDEX_PATH, namespace))
+
+        if index.count() == 0 and namespace in list_chroma_namespaces():
+            _seed_from_chroma(namespace, index)
+
+        _flat[namespace] = index
+        return index
+
+
+def _seed_from_chroma(namespace: str, index: FlatIndex, page_size: int = 1000):
+    collection = get_chroma(namespace)._collection
+    seed: Dict[str, list] = {"ids": [], "embeddings": [], "documents": [], "metadatas": []}
+
+    while True:
+        page = collection.get(
+            limit=page_size,
+            offset=len(seed["ids"]),
+            include=["documents", "metadatas", "embeddings"]
+        )
+        if not page["ids"]:
+            break
+        for key in seed:
+            seed[key].extend(page[key])
+
+    # One upsert, so the snapshot is written once
+    if seed["ids"]:
+        index.upsert(**seed)
+
+
+def get_vector_store(namespace: str) -> VectorBackend:
+    """
+    The backend serving a namespace (flat index or Chroma collection).
+    """
+
+    if namespace in FLAT_NAMESPACES:
+        return _flat_index(namespace)
+
+    return ChromaBackend(namespace)
+
+
+def list_namespaces() -> List[str]:
+    """
+    Namespaces with a Chroma collection or a flat index snapshot.
+    """
+
+    names = set(list_chroma_namespaces())
+
+    if os.path.isdir(FLAT_INDEX_PATH):
+        for name in os.listdir(FLAT_INDEX_PATH):
+            if os.path.exists(os.path.join(FLAT_INDEX_PATH, name, "records.pkl")):
+                names.add(name)
+
+    return sorted(names)
+
+
+def drop_namespace(namespace: str) -> bool:
+    """
+    Delete a namespace from every backend.
+
+    Returns:
+        bool: False if the namespace did not exist.
+    """
+
+    existed = namespace in list_namespaces()
+
+    with _lock:
+        index = _flat.pop(namespace, None)
+    if index is None and os.path.isdir(os.path.join(FLAT_INDEX_PATH, namespace)):
+        collection_name(namespace)
+        index = FlatIndex(os.path.join(FLAT_INDEX_PATH, namespace))
+    if index is not None:
+        index.drop()
+
+    drop_chroma_namespace(namespace)
+    return existed
@@ -0,0 +1,79 @@
+"""
+Vector backend interface
+------------------------
+
+The subset of the Chroma collection API the RAG tools use. Every
+namespace is served by one backend (see backends.get_vector_store):
+Chroma by default, or the in-memory flat index for small, hot
+namespaces.
+
+Results follow Chroma's shapes: get() returns {"ids", "documents",
+"metadatas", "embeddings"}, query() the same keys plus "distances",
+each as one list per query embedding. Fields not requested through
+include are None.
+"""
+
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional
+
+
+class VectorBackend(ABC):
+    """
+    Interface for a namespace's vector storage.
+    """
+
+    # Chroma collection metadata; "hnsw:space" tells callers how to read distances
+    metadata: Dict[str, Any] = {}
+
+    @abstractmethod
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: Optional[List[str]] = None,
+        metadatas: Optional[List[dict]] = None
+    ):
+        ...
+
+    @abstractmethod
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def delete(self, ids: List[str]):
+        ...
+
+    @abstractmethod
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        ...
+
+    @abstractmethod
+    def count(self) -> int:
+        ...
+
+    def begin_bulk_write(self):
+        """
+        Start a run of writes that may be persisted once at the end.
+        """
+        return None
+
+    def end_bulk_write(self):
+        """
+        Finish a bulk write started with begin_bulk_write().
+        """
+        return None
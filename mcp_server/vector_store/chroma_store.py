@@ -1,10 +1,15 @@
 import os
-from typing import Optional
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
 
 import chromadb
 from langchain_community.vectorstores import Chroma
 from langchain_ollama import OllamaEmbeddings
 
+from .embedding_cache import CachedEmbeddings
+
 
 # ----------------------------
 # Disable Chroma anonymous telemetry
@@ -20,35 +25,220 @@ CHROMA_PATH = os.path.join(BASE_DIR, "..", "chroma_db")
 
 
 # ----------------------------
-# Shared embedding model
+# Namespace → collection mapping
 # ----------------------------
-_embeddings = OllamaEmbeddings(model="nomic-embed-text")
+# Each namespace (tenant) lives in its own collection "ns_<namespace>".
+# The pre-namespace shared collection is kept only for migration.
+COLLECTION_PREFIX = "ns_"
+LEGACY_COLLECTION = "mcp_rag_store"
+DEFAULT_NAMESPACE = "default"
+
+# Chroma collection names: 3-63 chars, alphanumeric start/end, [._-] inside
+_NAMESPACE_RE = re.compile(r"^[A-Za-z0-9]([A-Za-z0-9._-]{0,58}[A-Za-z0-9])?$")
+
+# Max collection handles kept open at once (least recently used is dropped)
+MAX_CACHED_NAMESPACES = int(os.getenv("CHROMA_MAX_CACHED_NAMESPACES", "32"))
+
+
+# ----------------------------
+# Shared embedding model (behind a persistent content-addressed cache)
+# ----------------------------
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "nomic-embed-text")
+
+# The model embeds queries exactly like documents (OllamaEmbeddings does),
+# so batches of queries can go through one embed_documents call
+EMBEDDING_SYMMETRIC = os.getenv("EMBEDDING_SYMMETRIC", "true").lower() == "true"
+
+_embeddings = CachedEmbeddings(
+    OllamaEmbeddings(model=EMBEDDING_MODEL),
+    model_name=EMBEDDING_MODEL,
+    symmetric=EMBEDDING_SYMMETRIC
+)
+
+
+def get_embeddings() -> CachedEmbeddings:
+    """
+    Shared (cached) embedding function used by every namespace.
+    """
+
+    return _embeddings
 
 
 # ----------------------------
-# Cached vector store instance
+# Shared client + cached vector store handles
 # ----------------------------
-_chroma_instance: Optional[Chroma] = None
+_client: Optional[chromadb.ClientAPI] = None
+_handles: "OrderedDict[str, Chroma]" = OrderedDict()
+_lock = threading.Lock()
 
 
-def get_chroma() -> Chroma:
+def get_client() -> chromadb.ClientAPI:
     """
-    Get or initialize a persistent ChromaDB instance.
+    Get or initialize the persistent Chroma client shared by all namespaces.
+    """
+
+    global _client
+
+    if _client is None:
+        os.makedirs(CHROMA_PATH, exist_ok=True)
+        _client = chromadb.PersistentClient(path=CHROMA_PATH)
+
+    return _client
+
+
+def collection_name(namespace: str) -> str:
+    """
+    Map a namespace to its Chroma collection name.
+
+    Raises:
+        ValueError: if the namespace cannot be used as a collection name.
+    """
+
+    if not _NAMESPACE_RE.match(namespace):
+        raise ValueError(
+            f"Invalid namespace '{namespace}': use 1-60 letters, digits, '.', '_' "
+            "or '-', starting and ending with a letter or digit."
+        )
+
+    return f"{COLLECTION_PREFIX}{namespace}"
+
+
+def get_chroma(namespace: str = DEFAULT_NAMESPACE) -> Chroma:
+    """
+    Get or initialize the persistent Chroma vector store of a namespace.
+
+    Handles are cached in a bounded LRU so hot namespaces skip
+    collection lookup while idle ones do not pile up.
 
     Returns:
         Chroma: A vector store ready for similarity search and upserts.
     """
 
-    global _chroma_instance
+    with _lock:
+        store = _handles.get(namespace)
 
-    if _chroma_instance is None:
-        os.makedirs(CHROMA_PATH, exist_ok=True)
+        if store is not None:
+            _handles.move_to_end(namespace)
+            return store
 
-        # Initialize persistent Chroma
-        _chroma_instance = Chroma(
-            collection_name="mcp_rag_store",
+        store = Chroma(
+            client=get_client(),
+            collection_name=collection_name(namespace),
             embedding_function=_embeddings,
-            persist_directory=CHROMA_PATH,
         )
 
-    return _chroma_instance
+        _handles[namespace] = store
+        while len(_handles) > MAX_CACHED_NAMESPACES:
+            _handles.popitem(last=False)
+
+        return store
+
+
+def list_namespaces() -> List[str]:
+    """
+    List all namespaces that have a collection.
+    """
+
+    names = []
+    for collection in get_client().list_collections():
+        # chromadb < 0.6 returns Collection objects, newer versions names
+        name = collection if isinstance(collection, str) else collection.name
+        if name.startswith(COLLECTION_PREFIX):
+            names.append(name[len(COLLECTION_PREFIX):])
+
+    return sorted(names)
+
+
+def drop_namespace(namespace: str) -> bool:
+    """
+    Delete a namespace's collection and all its vectors.
+
+    Returns:
+        bool: False if the namespace did not exist.
+    """
+
+    name = collection_name(namespace)
+
+    with _lock:
+        _handles.pop(namespace, None)
+
+        if namespace not in list_namespaces():
+            return False
+
+        get_client().delete_collection(name)
+
+    return True
+
+
+# ----------------------------
+# Migration from the shared collection
+# ----------------------------
+
+def migrate_shared_collection(batch_size: int = 500) -> Dict[str, int]:
+    """
+    Move vectors from the legacy shared "mcp_rag_store" collection into
+    per-namespace collections, then delete the legacy collection.
+
+    Documents are routed by their "namespace" metadata if present,
+    otherwise into the default namespace. Stored embeddings are copied
+    as-is, so nothing is re-embedded.
+
+    Returns:
+        Dict[str, int]: number of vectors moved per namespace.
+    """
+
+    client = get_client()
+
+    try:
+        legacy = client.get_collection(LEGACY_COLLECTION)
+    except Exception:
+        return {}
+
+    moved: Dict[str, int] = {}
+    offset = 0
+
+    while True:
+        page = legacy.get(
+            limit=batch_size,
+            offset=offset,
+            include=["documents", "metadatas", "embeddings"],
+        )
+        ids = page["ids"]
+        if not ids:
+            break
+
+        # Group the page by target namespace
+        groups: Dict[str, Dict[str, list]] = {}
+        for i, doc_id in enumerate(ids):
+            metadata = (page["metadatas"] or [None] * len(ids))[i] or {}
+            namespace = str(metadata.get("namespace") or DEFAULT_NAMESPACE)
+            group = groups.setdefault(
+                namespace, {"ids": [], "documents": [], "metadatas": [], "embeddings": []}
+            )
+            group["ids"].append(doc_id)
+            group["documents"].append(page["documents"][i])
+            group["metadatas"].append({**metadata, "namespace": namespace})
+            group["embeddings"].append(page["embeddings"][i])
+
+        for namespace, group in groups.items():
+            target = client.get_or_create_collection(collection_name(namespace))
+            target.upsert(**group)
+            moved[namespace] = moved.get(namespace, 0) + len(group["ids"])
+
+        offset += len(ids)
+
+    client.delete_collection(LEGACY_COLLECTION)
+    return moved
+
+
+# ----------------------------
+# CLI: python -m mcp_server.vector_store.chroma_store migrate
+# ----------------------------
+if __name__ == "__main__":
+    import sys
+
+    if sys.argv[1:] == ["migrate"]:
+        result = migrate_shared_collection()
+        print(f"[CHROMA] Migrated shared collection: {result or 'nothing to migrate'}")
+    else:
+        print("Usage: python -m mcp_server.vector_store.chroma_store migrate")
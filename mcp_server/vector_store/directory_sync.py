@@ -0,0 +1,263 @@
+"""
+Directory ingestion with incremental re-indexing
+------------------------------------------------
+
+Walks a directory, splits files into chunks and indexes them into a
+namespace. A manifest (SQLite) remembers, per file:
+
+ - sha256 of its content (+ size / mtime as a cheap pre-check)
+ - the chunk ids it produced
+
+On each sync only new or changed files are re-embedded; chunks of
+changed and removed files are deleted from the namespace. Files whose
+size and mtime did not change are not even re-hashed, so a nightly
+re-sync of an unchanged corpus finishes in seconds.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+from langchain_text_splitters import RecursiveCharacterTextSplitter
+
+from ..workers import worker_pool
+from .chroma_store import CHROMA_PATH
+from .ingestion import ProgressCallback, delete_chunks, ingest_texts
+
+
+MANIFEST_PATH = os.path.join(CHROMA_PATH, "ingest_manifest.sqlite3")
+
+DEFAULT_EXTENSIONS = [".txt", ".md", ".markdown", ".rst"]
+DEFAULT_CHUNK_SIZE = int(os.getenv("INGEST_CHUNK_SIZE", "1000"))
+DEFAULT_CHUNK_OVERLAP = int(os.getenv("INGEST_CHUNK_OVERLAP", "150"))
+
+
+class SyncReport(BaseModel):
+    namespace: str
+    directory: str
+    added: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    chunks_indexed: int = 0
+    chunks_deleted: int = 0
+    elapsed_ms: float = 0.0
+
+
+# ---------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------
+
+class IngestManifest:
+    """
+    SQLite record of indexed files and their chunk ids per namespace.
+    """
+
+    def __init__(self, db_path: str = MANIFEST_PATH):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ingest_files (
+                namespace TEXT,
+                path TEXT,
+                sha256 TEXT,
+                size INTEGER,
+                mtime REAL,
+                chunk_ids TEXT,
+                indexed_at TEXT,
+                PRIMARY KEY (namespace, path)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def files(self, namespace: str, root: str) -> Dict[str, Tuple[str, int, float, List[str]]]:
+        """
+        path → (sha256, size, mtime, chunk_ids) for files under root.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT path, sha256, size, mtime, chunk_ids FROM ingest_files
+                WHERE namespace = ? AND substr(path, 1, length(?)) = ?
+                """,
+                (namespace, root, root)
+            ).fetchall()
+
+        return {
+            path: (sha, size, mtime, json.loads(chunk_ids))
+            for path, sha, size, mtime, chunk_ids in rows
+        }
+
+    def upsert(self, namespace: str, entries: List[Tuple[str, str, int, float, List[str]]]):
+        now = datetime.utcnow().isoformat()
+
+        with self._lock, self._conn:
+            self._conn.executemany(
+                """
+                INSERT INTO ingest_files (namespace, path, sha256, size, mtime, chunk_ids, indexed_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(namespace, path) DO UPDATE SET
+                    sha256 = excluded.sha256,
+                    size = excluded.size,
+                    mtime = excluded.mtime,
+                    chunk_ids = excluded.chunk_ids,
+                    indexed_at = excluded.indexed_at
+                """,
+                [
+                    (namespace, path, sha, size, mtime, json.dumps(chunk_ids), now)
+                    for path, sha, size, mtime, chunk_ids in entries
+                ]
+            )
+
+    def remove(self, namespace: str, paths: List[str]):
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM ingest_files WHERE namespace = ? AND path = ?",
+                [(namespace, path) for path in paths]
+            )
+
+
+_manifest: Optional[IngestManifest] = None
+
+
+def get_manifest() -> IngestManifest:
+    global _manifest
+
+    if _manifest is None:
+        _manifest = IngestManifest()
+
+    return _manifest
+
+
+# ---------------------------------------------------------
+# Directory walk + hashing (runs in a worker thread)
+# ---------------------------------------------------------
+
+def _scan(root: str, extensions: List[str]) -> Dict[str, Tuple[int, float]]:
+    found = {}
+    wanted = tuple(e.lower() for e in extensions)
+
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            if not name.lower().endswith(wanted):
+                continue
+            path = os.path.join(dirpath, name)
+            st = os.stat(path)
+            found[path] = (st.st_size, st.st_mtime)
+
+    return found
+
+
+def _read_and_hash(path: str) -> Tuple[str, str]:
+    with open(path, "rb") as f:
+        data = f.read()
+    return hashlib.sha256(data).hexdigest(), data.decode("utf-8", errors="replace")
+
+
+def _chunk_ids(path: str, count: int) -> List[str]:
+    # Stable per (file, chunk position); a changed file reuses its ids
+    prefix = hashlib.sha256(path.encode("utf-8")).hexdigest()[:24]
+    return [f"file-{prefix}-{i}" for i in range(count)]
+
+
+# ---------------------------------------------------------
+# Sync
+# ---------------------------------------------------------
+
+async def sync_directory(
+    directory: str,
+    namespace: str = "default",
+    extensions: Optional[List[str]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    chunk_overlap: int = DEFAULT_CHUNK_OVERLAP,
+    progress: Optional[ProgressCallback] = None
+) -> SyncReport:
+    """
+    Bring a namespace in line with the files under a directory.
+    """
+
+    started = time.perf_counter()
+    root = os.path.join(os.path.abspath(directory), "")
+    manifest = get_manifest()
+    report = SyncReport(namespace=namespace, directory=root)
+
+    on_disk = await worker_pool.run(_scan, root, extensions or DEFAULT_EXTENSIONS)
+    known = await worker_pool.run(manifest.files, namespace, root)
+
+    splitter = RecursiveCharacterTextSplitter(
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap
+    )
+
+    texts: List[str] = []
+    metadatas: List[dict] = []
+    ids: List[str] = []
+    stale_ids: List[str] = []
+    manifest_updates = []
+
+    for path, (size, mtime) in sorted(on_disk.items()):
+        previous = known.get(path)
+
+        # Cheap pre-check: same size + mtime → unchanged, skip hashing
+        if previous and previous[1] == size and previous[2] == mtime:
+            report.unchanged += 1
+            continue
+
+        sha, text = await worker_pool.run(_read_and_hash, path)
+
+        if previous and previous[0] == sha:
+            # Touched but identical content: only refresh size / mtime
+            report.unchanged += 1
+            manifest_updates.append((path, sha, size, mtime, previous[3]))
+            continue
+
+        chunks = await worker_pool.run(splitter.split_text, text)
+        chunk_ids = _chunk_ids(path, len(chunks))
+        relpath = os.path.relpath(path, root)
+
+        texts.extend(chunks)
+        ids.extend(chunk_ids)
+        metadatas.extend(
+            {"source": relpath, "chunk": i, "sha256": sha} for i in range(len(chunks))
+        )
+
+        if previous:
+            report.updated += 1
+            # Chunks beyond the new chunk count would otherwise linger
+            stale_ids.extend(set(previous[3]) - set(chunk_ids))
+        else:
+            report.added += 1
+
+        manifest_updates.append((path, sha, size, mtime, chunk_ids))
+
+    # Files that disappeared since the last sync
+    removed = [path for path in known if path not in on_disk]
+    for path in removed:
+        stale_ids.extend(known[path][3])
+    report.removed = len(removed)
+
+    if texts:
+        await ingest_texts(namespace, texts, metadatas, progress=progress, ids=ids)
+
+    await delete_chunks(namespace, stale_ids)
+
+    # Manifest is only updated once the vectors are written
+    await worker_pool.run(manifest.upsert, namespace, manifest_updates)
+    await worker_pool.run(manifest.remove, namespace, removed)
+
+    report.chunks_indexed = len(texts)
+    report.chunks_deleted = len(stale_ids)
+    report.elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    return report
@@ -0,0 +1,232 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from array import array
+from typing import Dict, List, Optional
+
+from langchain_core.embeddings import Embeddings
+
+
+# ----------------------------
+# Cache storage location
+# ----------------------------
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CACHE_PATH = os.path.join(BASE_DIR, "..", "chroma_db", "embedding_cache.sqlite3")
+
+# Max cached vectors; least recently used entries are evicted beyond this
+EMBEDDING_CACHE_MAX_ENTRIES = int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", "500000"))
+
+# SQLite limits the number of bound parameters per statement
+_LOOKUP_CHUNK = 500
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class CachedEmbeddings(Embeddings):
+    """
+    Content-addressed, disk-backed cache in front of an embedding model.
+
+    Vectors are stored in SQLite keyed by (model name, sha256 of text),
+    so re-indexing unchanged texts or repeating a query costs no model
+    call. Query embeddings are cached under "<model>#query" because
+    some models embed queries differently from documents; symmetric=True
+    declares that the model does not, so several queries can be embedded
+    with one embed_documents call.
+
+    The cache is bounded: beyond max_entries the least recently used
+    vectors are evicted.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_name: str,
+        db_path: str = CACHE_PATH,
+        max_entries: int = EMBEDDING_CACHE_MAX_ENTRIES,
+        symmetric: bool = False
+    ):
+        self.embeddings = embeddings
+        self.model_name = model_name
+        self.symmetric = symmetric
+        self.db_path = db_path
+        self.max_entries = max(1, max_entries)
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._lock = threading.Lock()
+        self._tick = 0
+        self._conn = self._connect()
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM embedding_cache").fetchone()[0]
+        self._tick = self._conn.execute(
+            "SELECT COALESCE(MAX(last_used), 0) FROM embedding_cache"
+        ).fetchone()[0]
+
+    # --------------------------------------------------------
+    # Initialize DB
+    # --------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embedding_cache (
+                model TEXT,
+                key TEXT,
+                vector BLOB,
+                last_used INTEGER,
+                PRIMARY KEY (model, key)
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embedding_cache_lru ON embedding_cache (last_used)"
+        )
+        conn.commit()
+        return conn
+
+    # --------------------------------------------------------
+    # Embeddings interface
+    # --------------------------------------------------------
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        return self._embed(texts, self.model_name, self.embeddings.embed_documents)
+
+    def embed_query(self, text: str) -> List[float]:
+        return self._embed(
+            [text],
+            f"{self.model_name}#query",
+            lambda batch: [self.embeddings.embed_query(t) for t in batch]
+        )[0]
+
+    def embed_queries(self, texts: List[str]) -> List[List[float]]:
+        """
+        Query-space vectors for several texts; the uncached ones are
+        embedded in one model call when the model allows it.
+        """
+        return self._embed(texts, f"{self.model_name}#query", self._embed_query_batch)
+
+    def _embed_query_batch(self, texts: List[str]) -> List[List[float]]:
+        batched = getattr(self.embeddings, "embed_queries", None)
+        if callable(batched):
+            return batched(texts)
+        if self.symmetric:
+            return self.embeddings.embed_documents(texts)
+        return [self.embeddings.embed_query(t) for t in texts]
+
+    def _embed(self, texts: List[str], model: str, embed_fn) -> List[List[float]]:
+        keys = [text_key(t) for t in texts]
+
+        with self._lock:
+            cached = self._lookup(model, keys)
+
+        # Embed each distinct missing text once
+        missing: Dict[str, str] = {}
+        for key, text in zip(keys, texts, strict=True):
+            if key not in cached and key not in missing:
+                missing[key] = text
+
+        self.hits += len(texts) - sum(1 for k in keys if k in missing)
+        self.misses += sum(1 for k in keys if k in missing)
+
+        if missing:
+            vectors = embed_fn(list(missing.values()))
+            fresh = dict(zip(missing.keys(), vectors, strict=True))
+
+            with self._lock:
+                self._store(model, fresh)
+
+            cached.update(fresh)
+
+        return [list(cached[k]) for k in keys]
+
+    # --------------------------------------------------------
+    # Storage (caller holds the lock)
+    # --------------------------------------------------------
+
+    def _lookup(self, model: str, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        unique = list(dict.fromkeys(keys))
+
+        for i in range(0, len(unique), _LOOKUP_CHUNK):
+            chunk = unique[i:i + _LOOKUP_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = self._conn.execute(
+                f"""
+                SELECT key, vector FROM embedding_cache
+                WHERE model = ? AND key IN ({placeholders})
+                """,
+                (model, *chunk)
+            ).fetchall()
+
+            for key, blob in rows:
+                found[key] = array("f", blob).tolist()
+
+        if found:
+            self._tick += 1
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE embedding_cache SET last_used = ? WHERE model = ? AND key = ?",
+                    [(self._tick, model, key) for key in found]
+                )
+
+        return found
+
+    def _store(self, model: str, vectors: Dict[str, List[float]]):
+        self._tick += 1
+
+        with self._conn:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                """
+                INSERT OR IGNORE INTO embedding_cache (model, key, vector, last_used)
+                VALUES (?, ?, ?, ?)
+                """,
+                [
+                    (model, key, array("f", vector).tobytes(), self._tick)
+                    for key, vector in vectors.items()
+                ]
+            )
+            self._entries += self._conn.total_changes - before
+
+            if self._entries > self.max_entries:
+                self._evict()
+
+    def _evict(self):
+        # Evict down to 90% so eviction does not run on every insert
+        excess = self._entries - int(self.max_entries * 0.9)
+        self._conn.execute(
+            """
+            DELETE FROM embedding_cache WHERE rowid IN (
+                SELECT rowid FROM embedding_cache ORDER BY last_used ASC LIMIT ?
+            )
+            """,
+            (excess,)
+        )
+        self._entries -= excess
+        self.evictions += excess
+
+    # --------------------------------------------------------
+    # Metrics
+    # --------------------------------------------------------
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        lookups = self.hits + self.misses
+        return {
+            "model": self.model_name,
+            "entries": self._entries,
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            "evictions": self.evictions,
+        }
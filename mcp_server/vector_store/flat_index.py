@@ -0,0 +1,526 @@
+"""
+Flat in-memory vector index
+---------------------------
+
+Exact nearest-neighbour search for small, hot namespaces, without
+Chroma's persistence and HNSW overhead:
+
+ - vectors are L2-normalised float32 rows of one contiguous NumPy array
+ - top-k is one matrix-vector product plus argpartition
+ - where / where_document filters are evaluated in Python on the
+   (small) candidate set, with Chroma's operator syntax
+
+Each namespace is a snapshot directory:
+
+    vectors.npy   the vector matrix (np.load, optionally memory-mapped)
+    records.pkl   ids, documents and metadatas
+
+Snapshots are rewritten atomically after every write under an exclusive
+file lock. Bulk writers (ingest_texts) wrap their batches in
+begin_bulk_write() / end_bulk_write(): the exclusive lock is held for
+the whole run and the snapshot is written once at the end, instead of
+once per batch. Vectors live in a row buffer with spare capacity, so
+appending a batch does not copy the whole matrix.
+
+Readers compare the snapshot's inode / mtime before each call and
+reload when another MCP server process has written. They never wait
+for a writer: while the lock is held they keep serving the snapshot
+they have.
+"""
+
+import fcntl
+import os
+import pickle
+import threading
+from contextlib import contextmanager, nullcontext, suppress
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .base import VectorBackend
+
+
+# Memory-map vectors.npy instead of reading it into RAM
+FLAT_INDEX_MMAP = os.getenv("FLAT_INDEX_MMAP", "false").lower() == "true"
+
+_DEFAULT_INCLUDE = ["documents", "metadatas"]
+
+
+# ---------------------------------------------------------
+# Chroma-style filters
+# ---------------------------------------------------------
+
+_COMPARE = {
+    "$eq": lambda a, b: a == b,
+    "$ne": lambda a, b: a != b,
+    "$gt": lambda a, b: a is not None and a > b,
+    "$gte": lambda a, b: a is not None and a >= b,
+    "$lt": lambda a, b: a is not None and a < b,
+    "$lte": lambda a, b: a is not None and a <= b,
+    "$in": lambda a, b: a in b,
+    "$nin": lambda a, b: a not in b,
+}
+
+
+def match_where(metadata: dict, where: Dict[str, Any]) -> bool:
+    """
+    Evaluate a Chroma metadata filter against one metadata dict.
+    """
+
+    for key, condition in where.items():
+        if key == "$and":
+            if not all(match_where(metadata, c) for c in condition):
+                return False
+        elif key == "$or":
+            if not any(match_where(metadata, c) for c in condition):
+                return False
+        elif isinstance(condition, dict):
+            value = metadata.get(key)
+            for op, operand in condition.items():
+                if op not in _COMPARE:
+                    raise ValueError(f"Unsupported where operator '{op}'.")
+                if not _COMPARE[op](value, operand):
+                    return False
+        elif metadata.get(key) != condition:
+            return False
+
+    return True
+
+
+def match_document(document: str, where_document: Dict[str, Any]) -> bool:
+    """
+    Evaluate a Chroma document filter ($contains / $not_contains / $and / $or).
+    """
+
+    for op, operand in where_document.items():
+        if op == "$contains":
+            ok = operand in (document or "")
+        elif op == "$not_contains":
+            ok = operand not in (document or "")
+        elif op == "$and":
+            ok = all(match_document(document, c) for c in operand)
+        elif op == "$or":
+            ok = any(match_document(document, c) for c in operand)
+        else:
+            raise ValueError(f"Unsupported where_document operator '{op}'.")
+        if not ok:
+            return False
+
+    return True
+
+
+def _pairs(assign: Dict[int, int]) -> Tuple[List[int], List[int]]:
+    targets = list(assign)
+    return targets, [assign[row] for row in targets]
+
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+# ---------------------------------------------------------
+# Index
+# ---------------------------------------------------------
+
+class FlatIndex(VectorBackend):
+    """
+    Exact cosine top-k over a contiguous float32 matrix, snapshotted to disk.
+    """
+
+    # Distances are reported as 1 - cosine similarity
+    metadata = {"hnsw:space": "cosine"}
+
+    def __init__(self, path: str, mmap: bool = FLAT_INDEX_MMAP):
+        self.path = path
+        self.mmap = mmap
+
+        # Lock order: _write_lock → file lock → _lock
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._bulk_depth = 0
+        self._bulk_file = None
+        self._dirty = False
+
+        self._version = None
+        self._reset()
+
+        with self._file_lock(exclusive=False):
+            self._load()
+
+    def _reset(self):
+        self._ids: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._documents: List[Optional[str]] = []
+        self._metadatas: List[Optional[dict]] = []
+        self._vectors = np.zeros((0, 0), dtype=np.float32)
+        # Rows [0, len(_ids)) of _buffer are _vectors; the rest is spare capacity
+        self._buffer = self._vectors
+
+    # --------------------------------------------------------
+    # Snapshots
+    # --------------------------------------------------------
+
+    @property
+    def _vectors_path(self) -> str:
+        return os.path.join(self.path, "vectors.npy")
+
+    @property
+    def _records_path(self) -> str:
+        return os.path.join(self.path, "records.pkl")
+
+    @contextmanager
+    def _file_lock(self, exclusive: bool, blocking: bool = True):
+        """
+        Serialises writers (and snapshot reads) across MCP server
+        processes. Non-blocking: yields False if the lock is taken.
+        """
+        os.makedirs(self.path, exist_ok=True)
+        with open(os.path.join(self.path, ".lock"), "a") as f:
+            flags = fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH
+            try:
+                fcntl.flock(f, flags if blocking else flags | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _disk_version(self):
+        try:
+            st = os.stat(self._records_path)
+        except FileNotFoundError:
+            return None
+        return st.st_ino, st.st_mtime_ns
+
+    def _load(self):
+        version = self._disk_version()
+        if version is None:
+            self._reset()
+        else:
+            with open(self._records_path, "rb") as f:
+                ids, documents, metadatas = pickle.load(f)
+            self._ids, self._documents, self._metadatas = ids, documents, metadatas
+            self._rows = {chunk_id: i for i, chunk_id in enumerate(ids)}
+            self._vectors = np.load(self._vectors_path, mmap_mode="r" if self.mmap else None)
+            self._buffer = self._vectors
+        self._version = version
+
+    def _refresh(self, locked: bool = False):
+        """
+        Reload if another process wrote a newer snapshot. Caller holds
+        _lock; locked means it also holds the exclusive file lock.
+        """
+        if self._dirty or self._disk_version() == self._version:
+            return
+        if locked:
+            self._load()
+            return
+
+        # Never wait for a writer while holding _lock: keep the current
+        # snapshot and retry on the next call
+        with self._file_lock(exclusive=False, blocking=False) as acquired:
+            if acquired:
+                self._load()
+
+    def _save(self, ids, documents, metadatas, vectors):
+        """
+        Write a snapshot atomically. Caller holds the exclusive file lock.
+        """
+        tmp_vectors = self._vectors_path + ".tmp.npy"
+        tmp_records = self._records_path + ".tmp"
+
+        np.save(tmp_vectors, vectors)
+        with open(tmp_records, "wb") as f:
+            pickle.dump((ids, documents, metadatas), f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # Records last: their inode / mtime is the snapshot version
+        os.replace(tmp_vectors, self._vectors_path)
+        os.replace(tmp_records, self._records_path)
+        self._version = self._disk_version()
+
+    # --------------------------------------------------------
+    # Writes
+    # --------------------------------------------------------
+
+    def begin_bulk_write(self):
+        """
+        Hold the exclusive file lock and defer snapshot writes until
+        the matching end_bulk_write(). Calls nest.
+        """
+        with self._write_lock:
+            if self._bulk_depth == 0:
+                os.makedirs(self.path, exist_ok=True)
+                handle = open(os.path.join(self.path, ".lock"), "a")
+                fcntl.flock(handle, fcntl.LOCK_EX)
+                self._bulk_file = handle
+                with self._lock:
+                    self._refresh(locked=True)
+            self._bulk_depth += 1
+
+    def end_bulk_write(self):
+        """
+        Write the deferred snapshot (once) and release the file lock.
+        """
+        with self._write_lock:
+            self._bulk_depth -= 1
+            if self._bulk_depth > 0:
+                return
+
+            handle, self._bulk_file = self._bulk_file, None
+            try:
+                with self._lock:
+                    if self._dirty:
+                        self._save(self._ids, self._documents, self._metadatas, self._vectors)
+                        self._dirty = False
+            finally:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+                handle.close()
+
+    @contextmanager
+    def _writing(self):
+        """
+        Exclusive write section: the bulk session's file lock, or our own.
+        """
+        with self._write_lock:
+            bulk = self._bulk_depth > 0
+            with nullcontext() if bulk else self._file_lock(exclusive=True), self._lock:
+                if not bulk:
+                    self._refresh(locked=True)
+                yield
+
+    def _commit(self, ids, rows, documents, metadatas, buffer: np.ndarray):
+        """
+        Persist (unless deferred by a bulk write) and only then swap the
+        new state in, so a failed write leaves the index unchanged.
+        """
+        vectors = buffer[:len(ids)]
+
+        if self._bulk_depth:
+            self._dirty = True
+        else:
+            self._save(ids, documents, metadatas, vectors)
+            self._dirty = False
+
+        self._ids, self._rows = ids, rows
+        self._documents, self._metadatas = documents, metadatas
+        self._buffer, self._vectors = buffer, vectors
+
+    def _buffer_for(self, size: int, dim: int, copy: bool) -> np.ndarray:
+        """
+        A writable buffer of at least `size` rows whose first len(_ids)
+        rows are the current vectors. Grows geometrically; copies when
+        the current rows themselves are about to change.
+        """
+        current = len(self._ids)
+        buffer = self._buffer
+        if (
+            not copy
+            and current
+            and buffer.flags.writeable
+            and buffer.shape[0] >= size
+        ):
+            return buffer
+
+        grown = np.empty((max(size, 2 * current, 16), dim), dtype=np.float32)
+        if current:
+            grown[:current] = self._vectors
+        return grown
+
+    def upsert(
+        self,
+        ids: List[str],
+        embeddings: List[List[float]],
+        documents: Optional[List[str]] = None,
+        metadatas: Optional[List[dict]] = None
+    ):
+        vectors = _normalise(np.asarray(embeddings, dtype=np.float32))
+
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise ValueError("embeddings must have one vector per id.")
+        if documents is not None and len(documents) != len(ids):
+            raise ValueError("documents must have the same length as ids.")
+        if metadatas is not None and len(metadatas) != len(ids):
+            raise ValueError("metadatas must have the same length as ids.")
+        if not ids:
+            return
+
+        with self._writing():
+            if len(self._ids) and vectors.shape[1] != self._vectors.shape[1]:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match "
+                    f"the index dimension {self._vectors.shape[1]}."
+                )
+
+            current = len(self._ids)
+            new_ids = list(self._ids)
+            new_rows = dict(self._rows)
+            new_documents = list(self._documents)
+            new_metadatas = list(self._metadatas)
+            assign: Dict[int, int] = {}  # row → index into vectors
+
+            for i, chunk_id in enumerate(ids):
+                document = documents[i] if documents else None
+                metadata = metadatas[i] if metadatas else None
+                row = new_rows.get(chunk_id)
+
+                if row is None:
+                    new_rows[chunk_id] = row = len(new_ids)
+                    new_ids.append(chunk_id)
+                    new_documents.append(document)
+                    new_metadatas.append(metadata)
+                else:
+                    new_documents[row] = document
+                    new_metadatas[row] = metadata
+                assign[row] = i
+
+            # Appends only touch spare rows past the current view;
+            # replacing existing rows needs a private copy
+            replaces = any(row < current for row in assign)
+            buffer = self._buffer_for(len(new_ids), vectors.shape[1], copy=replaces)
+            targets, sources = _pairs(assign)
+            buffer[targets] = vectors[sources]
+
+            self._commit(new_ids, new_rows, new_documents, new_metadatas, buffer)
+
+    def delete(self, ids: List[str]):
+        with self._writing():
+            drop = {self._rows[chunk_id] for chunk_id in ids if chunk_id in self._rows}
+            if not drop:
+                return
+
+            keep = [i for i in range(len(self._ids)) if i not in drop]
+            new_ids = [self._ids[i] for i in keep]
+
+            self._commit(
+                new_ids,
+                {chunk_id: i for i, chunk_id in enumerate(new_ids)},
+                [self._documents[i] for i in keep],
+                [self._metadatas[i] for i in keep],
+                np.ascontiguousarray(self._vectors[keep])
+            )
+
+    def drop(self):
+        """
+        Delete the snapshot under the same locks as any other write, so
+        it cannot interleave with a (bulk) write of another process. The
+        directory and its lock file stay: a writer blocked on the lock
+        must not end up holding it on an unlinked file.
+        """
+        with self._writing():
+            # Records first: their absence marks the index as empty
+            for path in (
+                self._records_path,
+                self._records_path + ".tmp",
+                self._vectors_path,
+                self._vectors_path + ".tmp.npy",
+            ):
+                with suppress(FileNotFoundError):
+                    os.remove(path)
+            self._reset()
+            self._version = None
+            self._dirty = False
+
+    # --------------------------------------------------------
+    # Reads
+    # --------------------------------------------------------
+
+    def count(self) -> int:
+        with self._lock:
+            self._refresh()
+            return len(self._ids)
+
+    def _filter_rows(self, where, where_document) -> Optional[np.ndarray]:
+        if not where and not where_document:
+            return None
+
+        return np.fromiter(
+            (
+                (not where or match_where(self._metadatas[i] or {}, where))
+                and (not where_document or match_document(self._documents[i], where_document))
+                for i in range(len(self._ids))
+            ),
+            dtype=bool,
+            count=len(self._ids)
+        )
+
+    def _records(self, rows: List[int], include: List[str]) -> Dict[str, Any]:
+        return {
+            "ids": [self._ids[i] for i in rows],
+            "documents": [self._documents[i] for i in rows] if "documents" in include else None,
+            "metadatas": [self._metadatas[i] for i in rows] if "metadatas" in include else None,
+            "embeddings": [self._vectors[i].tolist() for i in rows] if "embeddings" in include else None,
+        }
+
+    def get(
+        self,
+        ids: Optional[List[str]] = None,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        include = _DEFAULT_INCLUDE if include is None else include
+
+        with self._lock:
+            self._refresh()
+
+            if ids is not None:
+                rows = [self._rows[chunk_id] for chunk_id in ids if chunk_id in self._rows]
+            else:
+                rows = list(range(len(self._ids)))
+
+            mask = self._filter_rows(where, where_document)
+            if mask is not None:
+                rows = [i for i in rows if mask[i]]
+
+            start = offset or 0
+            rows = rows[start:start + limit] if limit is not None else rows[start:]
+
+            return self._records(rows, include)
+
+    def query(
+        self,
+        query_embeddings: List[List[float]],
+        n_results: int = 10,
+        where: Optional[Dict[str, Any]] = None,
+        where_document: Optional[Dict[str, Any]] = None,
+        include: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        include = _DEFAULT_INCLUDE + ["distances"] if include is None else include
+        result: Dict[str, List] = {"ids": [], "documents": [], "metadatas": [], "embeddings": []}
+        distances: List[List[float]] = []
+
+        with self._lock:
+            self._refresh()
+
+            queries = _normalise(np.asarray(query_embeddings, dtype=np.float32))
+            mask = self._filter_rows(where, where_document)
+            available = len(self._ids) if mask is None else int(mask.sum())
+            n = min(n_results, available)
+
+            for query in queries:
+                rows: List[int] = []
+                scores = None
+
+                if n > 0:
+                    scores = self._vectors @ query
+                    if mask is not None:
+                        scores = np.where(mask, scores, -np.inf)
+                    top = np.argpartition(-scores, n - 1)[:n]
+                    rows = top[np.argsort(-scores[top])].tolist()
+
+                for key, value in self._records(rows, include).items():
+                    result[key].append(value)
+                distances.append([float(1.0 - scores[i]) for i in rows])
+
+        return {
+            "ids": result["ids"],
+            "documents": result["documents"] if "documents" in include else None,
+            "metadatas": result["metadatas"] if "metadatas" in include else None,
+            "embeddings": result["embeddings"] if "embeddings" in include else None,
+            "distances": distances if "distances" in include else None,
+        }
@@ -0,0 +1,278 @@
+"""
+Batched RAG ingestion
+---------------------
+
+Streams texts into a namespace in fixed-size batches:
+
+ - batches are embedded concurrently (bounded by a semaphore)
+ - embedding + Chroma writes run in worker threads, never on the
+   MCP server event loop (see mcp_server/workers.py)
+ - progress is reported per finished batch (MCP progress
+   notifications, or polled through a background job id)
+ - throughput (chunks/sec) is measured for every run
+ - chunk ids are content-derived (or caller-supplied) and written
+   with upsert, so re-sending the same texts never duplicates them
+ - the namespace's lexical (BM25) index is updated with every batch
+ - the whole run is one bulk write, so backends that snapshot (the
+   flat index) persist once instead of once per batch
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+from ..workers import worker_pool
+from .backends import get_vector_store
+from .chroma_store import get_embeddings
+from .lexical_index import LEXICAL_INDEX_ENABLED, get_lexical_index
+
+
+# Texts embedded + written per batch
+INGEST_BATCH_SIZE = int(os.getenv("INGEST_BATCH_SIZE", "128"))
+
+# Batches embedded at the same time
+INGEST_CONCURRENCY = int(os.getenv("INGEST_CONCURRENCY", "4"))
+
+# Finished background jobs remembered for polling
+MAX_TRACKED_JOBS = int(os.getenv("INGEST_MAX_TRACKED_JOBS", "100"))
+
+
+ProgressCallback = Callable[[int, int], Awaitable[None]]
+
+
+class IngestStats(BaseModel):
+    stored_count: int
+    duplicates: int = 0
+    batches: int
+    elapsed_ms: float
+    chunks_per_sec: float
+
+
+class IngestJob(BaseModel):
+    job_id: str
+    namespace: str
+    status: str  # "running" | "done" | "failed"
+    total: int
+    done: int = 0
+    stats: Optional[IngestStats] = None
+    error: Optional[str] = None
+
+
+# ---------------------------------------------------------
+# Chunk ids
+# ---------------------------------------------------------
+
+def content_id(text: str) -> str:
+    """
+    Stable chunk id derived from the chunk's text.
+    """
+
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:32]
+
+
+def _dedupe(texts: List[str], metadatas: Optional[List[dict]], ids: List[str]):
+    """
+    Keep the last occurrence of each id (Chroma rejects duplicate ids
+    within one upsert, and later entries should win).
+    """
+
+    last = {chunk_id: i for i, chunk_id in enumerate(ids)}
+    if len(last) == len(ids):
+        return texts, metadatas, ids
+
+    keep = sorted(last.values())
+    return (
+        [texts[i] for i in keep],
+        [metadatas[i] for i in keep] if metadatas else None,
+        [ids[i] for i in keep],
+    )
+
+
+# ---------------------------------------------------------
+# Streaming ingestion
+# ---------------------------------------------------------
+
+async def ingest_texts(
+    namespace: str,
+    texts: List[str],
+    metadatas: Optional[List[dict]] = None,
+    batch_size: int = INGEST_BATCH_SIZE,
+    concurrency: int = INGEST_CONCURRENCY,
+    progress: Optional[ProgressCallback] = None,
+    ids: Optional[List[str]] = None
+) -> IngestStats:
+    """
+    Embed and store texts into a namespace batch by batch.
+
+    Without ids, each chunk's id is derived from its content. Chunks are
+    upserted, so existing chunks with the same ids are replaced in place.
+    """
+
+    if ids is not None and len(ids) != len(texts):
+        raise ValueError("ids must have the same length as texts.")
+    if metadatas is not None and len(metadatas) != len(texts):
+        raise ValueError("metadatas must have the same length as texts.")
+
+    received = len(texts)
+    ids = ids if ids is not None else [content_id(t) for t in texts]
+    texts, metadatas, ids = _dedupe(texts, metadatas, ids)
+
+    store = await worker_pool.run(get_vector_store, namespace)
+    embeddings = get_embeddings()
+
+    total = len(texts)
+    batch_size = max(1, batch_size)
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    started = time.perf_counter()
+    done = 0
+
+    async def run_batch(start: int):
+        nonlocal done
+        end = min(start + batch_size, total)
+
+        batch_texts = texts[start:end]
+        batch_metadatas = [
+            {**((metadatas[i] if metadatas else None) or {}), "namespace": namespace}
+            for i in range(start, end)
+        ]
+        batch_ids = ids[start:end]
+
+        async with semaphore:
+            vectors = await worker_pool.run(embeddings.embed_documents, batch_texts)
+            await worker_pool.run(
+                store.upsert,
+                ids=batch_ids,
+                embeddings=vectors,
+                documents=batch_texts,
+                metadatas=batch_metadatas
+            )
+            if LEXICAL_INDEX_ENABLED:
+                await worker_pool.run(
+                    get_lexical_index().upsert, namespace, batch_ids, batch_texts
+                )
+
+        done += len(batch_texts)
+        if progress is not None:
+            await progress(done, total)
+
+    starts = range(0, total, batch_size)
+    await worker_pool.run(store.begin_bulk_write)
+    tasks = [asyncio.create_task(run_batch(start)) for start in starts]
+    try:
+        await asyncio.gather(*tasks)
+    except BaseException:
+        # Stop the other batches before the bulk write ends; callers
+        # still see the original error rather than an ExceptionGroup
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        await worker_pool.run(store.end_bulk_write)
+
+    elapsed = time.perf_counter() - started
+
+    return IngestStats(
+        stored_count=total,
+        duplicates=received - total,
+        batches=len(starts),
+        elapsed_ms=round(elapsed * 1000, 2),
+        chunks_per_sec=round(total / elapsed, 2) if elapsed > 0 else 0.0
+    )
+
+
+async def delete_chunks(
+    namespace: str,
+    ids: Optional[List[str]] = None,
+    where: Optional[Dict[str, Any]] = None
+) -> int:
+    """
+    Delete chunks by id and/or metadata filter from a namespace
+    (off the event loop). Returns the number of chunks deleted.
+    """
+
+    if not ids and not where:
+        return 0
+
+    collection = await worker_pool.run(get_vector_store, namespace)
+
+    matched = await worker_pool.run(
+        collection.get, ids=ids or None, where=where or None, include=[]
+    )
+    matched_ids = matched["ids"]
+
+    if matched_ids:
+        await worker_pool.run(collection.delete, ids=matched_ids)
+        if LEXICAL_INDEX_ENABLED:
+            await worker_pool.run(get_lexical_index().delete, namespace, matched_ids)
+
+    return len(matched_ids)
+
+
+# ---------------------------------------------------------
+# Background jobs (poll by job id)
+# ---------------------------------------------------------
+
+_jobs: "OrderedDict[str, IngestJob]" = OrderedDict()
+_tasks: Dict[str, asyncio.Task] = {}
+
+
+def start_ingest_job(
+    namespace: str,
+    texts: List[str],
+    metadatas: Optional[List[dict]] = None,
+    batch_size: int = INGEST_BATCH_SIZE,
+    concurrency: int = INGEST_CONCURRENCY,
+    ids: Optional[List[str]] = None
+) -> IngestJob:
+    """
+    Start ingestion in the background and return its job record.
+    """
+
+    job = IngestJob(
+        job_id=str(uuid.uuid4()),
+        namespace=namespace,
+        status="running",
+        total=len(texts)
+    )
+
+    async def on_progress(done: int, total: int):
+        job.done = done
+
+    async def run():
+        try:
+            job.stats = await ingest_texts(
+                namespace, texts, metadatas,
+                batch_size=batch_size,
+                concurrency=concurrency,
+                progress=on_progress,
+                ids=ids
+            )
+            job.status = "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            _tasks.pop(job.job_id, None)
+
+    _jobs[job.job_id] = job
+    _tasks[job.job_id] = asyncio.create_task(run())
+
+    # Forget the oldest finished jobs beyond the limit
+    for job_id in list(_jobs):
+        if len(_jobs) <= MAX_TRACKED_JOBS:
+            break
+        if job_id not in _tasks:
+            del _jobs[job_id]
+
+    return job
+
+
+def get_ingest_job(job_id: str) -> Optional[IngestJob]:
+    return _jobs.get(job_id)
@@ -0,0 +1,256 @@
+"""
+Lexical (BM25) index per namespace
+----------------------------------
+
+Vector search is weak on exact identifiers (error codes, SKUs), so
+each namespace can also keep an inverted index of its chunks.
+
+The index is SQLite FTS5 (bm25 ranking) rather than an in-process
+structure: every MCP server process in the agent's session pool sees
+the same index, and it survives restarts.
+
+Per namespace:
+ - lex_<namespace>       chunk_id → content (upserted with the vectors)
+ - lex_<namespace>_fts   FTS5 table kept in sync by triggers
+
+A namespace's index is built from its vector store the first
+time it is used, then kept in sync by rag_index / rag_delete. After
+running with LEXICAL_INDEX_ENABLED=false, rebuild it with:
+
+    python -m mcp_server.vector_store.lexical_index rebuild <namespace>
+"""
+
+import os
+import sqlite3
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from .backends import get_vector_store
+from .chroma_store import CHROMA_PATH, collection_name
+
+
+LEXICAL_INDEX_PATH = os.path.join(CHROMA_PATH, "lexical_index.sqlite3")
+
+# Set to "false" to skip maintaining the lexical index on writes
+LEXICAL_INDEX_ENABLED = os.getenv("LEXICAL_INDEX_ENABLED", "true").lower() == "true"
+
+# Keep "-" and "_" inside tokens so identifiers like ERR-404 stay whole
+_TOKENIZER = "unicode61 tokenchars '-_'"
+
+
+class LexicalIndex:
+    """
+    BM25 search over chunk text, one FTS5 table per namespace.
+    """
+
+    def __init__(self, db_path: str = LEXICAL_INDEX_PATH):
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._ready: set = set()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+
+    # --------------------------------------------------------
+    # Tables
+    # --------------------------------------------------------
+
+    @staticmethod
+    def _tables(namespace: str) -> Tuple[str, str]:
+        # collection_name() validates the namespace, so quoting is safe
+        name = collection_name(namespace).replace("ns_", "lex_", 1)
+        return f'"{name}"', f'"{name}_fts"'
+
+    def _ensure(self, namespace: str):
+        """
+        Create the namespace's tables; backfill them from the vector store on creation.
+        Caller holds the lock.
+        """
+        if namespace in self._ready:
+            return
+
+        docs, fts = self._tables(namespace)
+        prefix = docs.strip('"')
+
+        exists = self._conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (prefix,)
+        ).fetchone()
+
+        if not exists:
+            with self._conn:
+                self._conn.execute(
+                    f"""
+                    CREATE TABLE IF NOT EXISTS {docs} (
+                        id INTEGER PRIMARY KEY,
+                        chunk_id TEXT UNIQUE,
+                        content TEXT
+                    )
+                    """
+                )
+                self._conn.execute(
+                    f"""
+                    CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+                        content, content={docs}, content_rowid='id',
+                        tokenize="{_TOKENIZER}"
+                    )
+                    """
+                )
+                self._conn.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS "{prefix}_ai" AFTER INSERT ON {docs} BEGIN
+                        INSERT INTO {fts} (rowid, content) VALUES (new.id, new.content);
+                    END
+                    """
+                )
+                self._conn.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS "{prefix}_ad" AFTER DELETE ON {docs} BEGIN
+                        INSERT INTO {fts} ({fts}, rowid, content)
+                        VALUES ('delete', old.id, old.content);
+                    END
+                    """
+                )
+                self._conn.execute(
+                    f"""
+                    CREATE TRIGGER IF NOT EXISTS "{prefix}_au" AFTER UPDATE ON {docs} BEGIN
+                        INSERT INTO {fts} ({fts}, rowid, content)
+                        VALUES ('delete', old.id, old.content);
+                        INSERT INTO {fts} (rowid, content) VALUES (new.id, new.content);
+                    END
+                    """
+                )
+            self._backfill(namespace)
+
+        self._ready.add(namespace)
+
+    def _backfill(self, namespace: str, page_size: int = 1000):
+        collection = get_vector_store(namespace)
+        offset = 0
+
+        while True:
+            page = collection.get(limit=page_size, offset=offset, include=["documents"])
+            if not page["ids"]:
+                break
+            self._upsert(namespace, page["ids"], page["documents"])
+            offset += len(page["ids"])
+
+    # --------------------------------------------------------
+    # Writes (kept in sync with the vector store)
+    # --------------------------------------------------------
+
+    def upsert(self, namespace: str, ids: List[str], texts: List[str]):
+        with self._lock:
+            self._ensure(namespace)
+            self._upsert(namespace, ids, texts)
+
+    def _upsert(self, namespace: str, ids: List[str], texts: List[str]):
+        docs, _ = self._tables(namespace)
+
+        with self._conn:
+            self._conn.executemany(
+                f"""
+                INSERT INTO {docs} (chunk_id, content) VALUES (?, ?)
+                ON CONFLICT(chunk_id) DO UPDATE SET content = excluded.content
+                WHERE content != excluded.content
+                """,
+                list(zip(ids, texts, strict=True))
+            )
+
+    def delete(self, namespace: str, ids: List[str]):
+        docs, _ = self._tables(namespace)
+
+        with self._lock:
+            self._ensure(namespace)
+            with self._conn:
+                self._conn.executemany(
+                    f"DELETE FROM {docs} WHERE chunk_id = ?",
+                    [(chunk_id,) for chunk_id in ids]
+                )
+
+    def drop(self, namespace: str):
+        docs, fts = self._tables(namespace)
+
+        with self._lock:
+            with self._conn:
+                self._conn.execute(f"DROP TABLE IF EXISTS {fts}")
+                self._conn.execute(f"DROP TABLE IF EXISTS {docs}")
+            self._ready.discard(namespace)
+
+    def rebuild(self, namespace: str):
+        """
+        Drop and rebuild a namespace's index from its vector store.
+        """
+        self.drop(namespace)
+        with self._lock:
+            self._ensure(namespace)
+
+    # --------------------------------------------------------
+    # Search
+    # --------------------------------------------------------
+
+    def search(
+        self,
+        namespace: str,
+        query: str,
+        k: int,
+        offset: int = 0
+    ) -> List[Dict]:
+        """
+        Top-k chunks by BM25 (any query term may match; more and rarer
+        matching terms rank higher), skipping the first `offset`.
+
+        Returns:
+            [{"id", "page_content", "score"}] with higher scores better.
+        """
+        terms = query.split()
+        if not terms:
+            return []
+
+        match = " OR ".join('"' + t.replace('"', '""') + '"' for t in terms)
+        docs, fts = self._tables(namespace)
+
+        with self._lock:
+            self._ensure(namespace)
+            rows = self._conn.execute(
+                f"""
+                SELECT d.chunk_id, d.content, bm25({fts}) AS rank
+                FROM {fts}
+                JOIN {docs} d ON d.id = {fts}.rowid
+                WHERE {fts} MATCH ?
+                ORDER BY rank
+                LIMIT ? OFFSET ?
+                """,
+                (match, k, offset)
+            ).fetchall()
+
+        return [
+            {"id": chunk_id, "page_content": content, "score": -rank}
+            for chunk_id, content, rank in rows
+        ]
+
+
+_index: Optional[LexicalIndex] = None
+
+
+def get_lexical_index() -> LexicalIndex:
+    global _index
+
+    if _index is None:
+        _index = LexicalIndex()
+
+    return _index
+
+
+# ----------------------------
+# CLI: python -m mcp_server.vector_store.lexical_index rebuild <namespace>
+# ----------------------------
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) == 3 and sys.argv[1] == "rebuild":
+        get_lexical_index().rebuild(sys.argv[2])
+        print(f"[LEXICAL] Rebuilt BM25 index for namespace '{sys.argv[2]}'")
+    else:
+        print("Usage: python -m mcp_server.vector_store.lexical_index rebuild <namespace>")
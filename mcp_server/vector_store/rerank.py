@@ -0,0 +1,199 @@
+"""
+Post-retrieval stage: MMR diversification and cross-encoder rerank
+------------------------------------------------------------------
+
+Runs over the fetch_k candidates of a search:
+
+ - MMR (maximal marginal relevance) picks k candidates that are
+   relevant to the query but not near-duplicates of each other,
+   vectorised with NumPy over the candidates' stored embeddings
+ - an optional local cross-encoder (sentence-transformers) rescores
+   (query, chunk) pairs and reorders the result
+
+Both respect a latency budget: once it is spent, MMR fills the
+remaining slots by plain relevance and the reranker leaves unscored
+candidates in retrieval order after the scored ones. The cross-encoder
+is never loaded inside a budgeted call: RERANK_WARMUP=true loads it at
+server start, otherwise the first rerank starts loading it in the
+background and returns the candidates unscored.
+RAG_POSTPROCESS_ENABLED=false turns the whole stage off.
+"""
+
+import importlib.util
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+RAG_POSTPROCESS_ENABLED = os.getenv("RAG_POSTPROCESS_ENABLED", "true").lower() == "true"
+
+# Default latency budget of the whole stage (MMR + rerank)
+RAG_POSTPROCESS_BUDGET_MS = float(os.getenv("RAG_POSTPROCESS_BUDGET_MS", "250"))
+
+RERANK_MODEL = os.getenv("RERANK_MODEL", "cross-encoder/ms-marco-MiniLM-L-6-v2")
+RERANK_BATCH_SIZE = int(os.getenv("RERANK_BATCH_SIZE", "16"))
+
+# Load the cross-encoder at server start instead of on the first rerank
+RERANK_WARMUP = os.getenv("RERANK_WARMUP", "false").lower() == "true"
+
+logger = logging.getLogger(__name__)
+
+
+# ---------------------------------------------------------
+# MMR
+# ---------------------------------------------------------
+
+def _normalise(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1.0, norms)
+
+
+def mmr_select(
+    query_vector: List[float],
+    candidate_vectors: List[List[float]],
+    k: int,
+    lambda_mult: float = 0.5,
+    deadline: Optional[float] = None
+) -> List[int]:
+    """
+    Indices of k candidates chosen by maximal marginal relevance.
+
+    lambda_mult=1 is pure relevance, 0 pure diversity. Similarities are
+    computed once as matrix products; each step updates the running
+    "most similar already-selected" vector instead of rescanning.
+    """
+
+    if not candidate_vectors:
+        return []
+
+    candidates = _normalise(np.asarray(candidate_vectors, dtype=np.float32))
+    query = _normalise(np.asarray(query_vector, dtype=np.float32))
+
+    relevance = candidates @ query
+    pairwise = candidates @ candidates.T
+
+    k = min(k, len(candidates))
+    selected = [int(np.argmax(relevance))]
+    redundancy = pairwise[selected[0]].copy()
+    available = np.ones(len(candidates), dtype=bool)
+    available[selected[0]] = False
+
+    while len(selected) < k:
+        if deadline is not None and time.perf_counter() >= deadline:
+            # Out of budget: fill by relevance
+            rest = np.where(available)[0]
+            rest = rest[np.argsort(-relevance[rest])]
+            selected.extend(int(i) for i in rest[:k - len(selected)])
+            break
+
+        scores = lambda_mult * relevance - (1 - lambda_mult) * redundancy
+        scores[~available] = -np.inf
+        best = int(np.argmax(scores))
+
+        selected.append(best)
+        available[best] = False
+        np.maximum(redundancy, pairwise[best], out=redundancy)
+
+    return selected
+
+
+# ---------------------------------------------------------
+# Cross-encoder rerank (optional dependency)
+# ---------------------------------------------------------
+
+_cross_encoder = None
+_cross_encoder_lock = threading.Lock()
+_cross_encoder_loading = False
+
+
+def _get_cross_encoder():
+    global _cross_encoder
+
+    with _cross_encoder_lock:
+        if _cross_encoder is None:
+            try:
+                from sentence_transformers import CrossEncoder
+            except ImportError as e:
+                raise RuntimeError(
+                    "Reranking needs sentence-transformers (pip install sentence-transformers)."
+                ) from e
+            _cross_encoder = CrossEncoder(RERANK_MODEL)
+
+    return _cross_encoder
+
+
+def warm_cross_encoder() -> bool:
+    """
+    Load the cross-encoder ahead of the first rerank (server start).
+    """
+    try:
+        _get_cross_encoder()
+    except Exception:
+        logger.warning("Cross-encoder warm-up failed", exc_info=True)
+        return False
+    return True
+
+
+def _load_in_background():
+    global _cross_encoder_loading
+
+    if importlib.util.find_spec("sentence_transformers") is None:
+        raise RuntimeError(
+            "Reranking needs sentence-transformers (pip install sentence-transformers)."
+        )
+
+    with _cross_encoder_lock:
+        if _cross_encoder is not None or _cross_encoder_loading:
+            return
+        _cross_encoder_loading = True
+
+    def load():
+        global _cross_encoder_loading
+        try:
+            warm_cross_encoder()
+        finally:
+            _cross_encoder_loading = False
+
+    threading.Thread(target=load, name="rerank-warmup", daemon=True).start()
+
+
+def cross_encoder_rerank(
+    query: str,
+    matches: List[Dict],
+    deadline: Optional[float] = None
+) -> List[Dict]:
+    """
+    Reorder matches by cross-encoder score, adding "rerank_score".
+
+    Candidates are scored in batches in retrieval order; those not
+    reached before the deadline follow the scored ones unchanged. With
+    a deadline, a model that is not loaded yet is loaded in the
+    background and the matches are returned unscored.
+    """
+
+    if deadline is None:
+        model = _get_cross_encoder()
+    else:
+        model = _cross_encoder
+        if model is None:
+            _load_in_background()
+            return matches
+
+    scored: List[Dict] = []
+
+    for start in range(0, len(matches), RERANK_BATCH_SIZE):
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+
+        batch = matches[start:start + RERANK_BATCH_SIZE]
+        scores = model.predict([(query, m["page_content"]) for m in batch])
+        scored.extend(
+            {**m, "rerank_score": round(float(s), 6)} for m, s in zip(batch, scores, strict=True)
+        )
+
+    scored.sort(key=lambda m: m["rerank_score"], reverse=True)
+    return scored + matches[len(scored):]
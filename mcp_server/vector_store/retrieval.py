@@ -0,0 +1,329 @@
+"""
+Retrieval over a namespace
+--------------------------
+
+Three retrieval modes, all returning matches as
+{"id", "page_content", "metadata", "score"} ordered best first:
+
+ - vector   embedding similarity (Chroma or the flat index)
+ - bm25     lexical BM25 over the namespace's inverted index
+ - hybrid   both, merged with reciprocal rank fusion (RRF)
+
+RRF scores each chunk by sum(1 / (rrf_k + rank)) over the ranked
+lists it appears in, so it needs no score normalisation between the
+two retrievers. Exact identifiers (error codes, SKUs) that vector
+search misses are recovered by the BM25 side.
+
+Scores are on the mode's own scale: cosine similarity for vector,
+BM25 for bm25 and the fused RRF score for hybrid.
+
+Metadata (where) and document (where_document) filters are pushed
+down to the vector backend, so filtered vector searches never fetch
+chunks only to drop them afterwards. The lexical side checks the filter
+on its top BM25 hits instead, widening the window only while too few
+survive, so its cost does not grow with the size of the filtered set.
+
+Optionally, fetch_k candidates go through MMR and/or a cross-encoder
+rerank (see rerank.py) before the top k are returned.
+"""
+
+import asyncio
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .backends import get_vector_store
+from .chroma_store import get_embeddings
+from .lexical_index import LEXICAL_INDEX_ENABLED, get_lexical_index
+from ..workers import worker_pool
+from .rerank import (
+    RAG_POSTPROCESS_BUDGET_MS,
+    RAG_POSTPROCESS_ENABLED,
+    cross_encoder_rerank,
+    mmr_select,
+)
+
+
+RETRIEVAL_MODES = ("vector", "bm25", "hybrid")
+
+# Standard RRF constant; larger values flatten the rank contribution
+DEFAULT_RRF_K = 60
+
+# Filtered BM25: hits checked against the filter per requested match
+# (the window doubles while fewer than k survive)
+LEXICAL_FILTER_OVERFETCH = int(os.getenv("LEXICAL_FILTER_OVERFETCH", "4"))
+
+
+Filter = Optional[Dict[str, Any]]
+
+
+def _similarity(distance: float, space: str) -> float:
+    """
+    Convert a Chroma distance to cosine similarity (embeddings are
+    unit-normalised, so squared L2 = 2 - 2 * cosine).
+    """
+
+    if space == "l2":
+        return 1.0 - distance / 2.0
+    return 1.0 - distance  # "cosine" and "ip"
+
+
+def _vector_search(
+    namespace: str,
+    query: str,
+    k: int,
+    where: Filter = None,
+    where_document: Filter = None,
+    query_vector: Optional[List[float]] = None
+) -> List[Dict]:
+    collection = get_vector_store(namespace)
+    vector = query_vector or get_embeddings().embed_query(query)
+    space = (collection.metadata or {}).get("hnsw:space", "l2")
+
+    result = collection.query(
+        query_embeddings=[vector],
+        n_results=k,
+        where=where or None,
+        where_document=where_document or None,
+        include=["documents", "metadatas", "distances"]
+    )
+
+    return [
+        {
+            "id": chunk_id,
+            "page_content": doc,
+            "metadata": metadata or {},
+            "score": round(_similarity(distance, space), 6),
+        }
+        for chunk_id, doc, metadata, distance in zip(
+            result["ids"][0], result["documents"][0],
+            result["metadatas"][0], result["distances"][0],
+            strict=True
+        )
+    ]
+
+
+def _lexical_search(
+    namespace: str,
+    query: str,
+    k: int,
+    where: Filter = None,
+    where_document: Filter = None
+) -> List[Dict]:
+    collection = get_vector_store(namespace)
+    index = get_lexical_index()
+    filtered = bool(where or where_document)
+
+    matches: List[Dict] = []
+    window = max(k, 1) * LEXICAL_FILTER_OVERFETCH if filtered else k
+    offset = 0
+
+    while len(matches) < k:
+        hits = index.search(namespace, query, window, offset=offset)
+        if not hits:
+            break
+
+        # Metadata lives in the vector store; the lexical index only stores
+        # text. The same lookup applies the filter to this window of hits.
+        found = collection.get(
+            ids=[hit["id"] for hit in hits],
+            where=where or None,
+            where_document=where_document or None,
+            include=["metadatas"]
+        )
+        metadatas = dict(zip(found["ids"], found["metadatas"], strict=True))
+
+        matches.extend(
+            {
+                "id": hit["id"],
+                "page_content": hit["page_content"],
+                "metadata": metadatas.get(hit["id"]) or {},
+                "score": round(hit["score"], 6),
+            }
+            for hit in hits
+            if not filtered or hit["id"] in metadatas
+        )
+
+        if not filtered or len(hits) < window:
+            break
+        offset += window
+        window *= 2
+
+    return matches[:k]
+
+
+def reciprocal_rank_fusion(
+    rankings: List[List[Dict]],
+    k: int,
+    rrf_k: int = DEFAULT_RRF_K
+) -> List[Dict]:
+    """
+    Merge ranked match lists by reciprocal rank fusion; top k returned.
+    """
+
+    scores: Dict[str, float] = {}
+    matches: Dict[str, Dict] = {}
+
+    for ranking in rankings:
+        for rank, match in enumerate(ranking, start=1):
+            scores[match["id"]] = scores.get(match["id"], 0.0) + 1.0 / (rrf_k + rank)
+            matches.setdefault(match["id"], match)
+
+    best = sorted(scores, key=scores.get, reverse=True)[:k]
+    return [{**matches[chunk_id], "score": round(scores[chunk_id], 6)} for chunk_id in best]
+
+
+def _mmr(
+    namespace: str,
+    query: str,
+    matches: List[Dict],
+    k: int,
+    lambda_mult: float,
+    deadline: float,
+    query_vector: Optional[List[float]] = None
+) -> List[Dict]:
+    # Stored vectors are reused; only the (cached) query is embedded
+    found = get_vector_store(namespace).get(
+        ids=[m["id"] for m in matches], include=["embeddings"]
+    )
+    vectors = dict(zip(found["ids"], found["embeddings"], strict=True))
+    matches = [m for m in matches if m["id"] in vectors]
+
+    chosen = mmr_select(
+        query_vector or get_embeddings().embed_query(query),
+        [vectors[m["id"]] for m in matches],
+        k,
+        lambda_mult=lambda_mult,
+        deadline=deadline
+    )
+    return [matches[i] for i in chosen]
+
+
+async def search(
+    namespace: str,
+    query: str,
+    k: int = 5,
+    mode: str = "vector",
+    rrf_k: int = DEFAULT_RRF_K,
+    where: Filter = None,
+    where_document: Filter = None,
+    score_threshold: Optional[float] = None,
+    mmr: bool = False,
+    rerank: bool = False,
+    fetch_k: Optional[int] = None,
+    lambda_mult: float = 0.5,
+    budget_ms: Optional[float] = None,
+    query_vector: Optional[List[float]] = None
+) -> List[Dict]:
+    """
+    Retrieve the top-k chunks of a namespace (blocking calls run on
+    the worker pool, never on the event loop).
+
+    Matches scoring below score_threshold (on the mode's scale) are
+    dropped, so fewer than k may be returned. With mmr and/or rerank,
+    fetch_k candidates (default 4 * k) are retrieved and narrowed to k
+    within budget_ms; both are ignored when RAG_POSTPROCESS_ENABLED is off.
+
+    query_vector skips embedding the query (see search_batch).
+
+    Raises:
+        ValueError: on an unknown mode, or a lexical mode while the
+            lexical index is disabled.
+    """
+
+    if mode not in RETRIEVAL_MODES:
+        raise ValueError(f"Unknown retrieval mode '{mode}'; use one of {RETRIEVAL_MODES}.")
+    if mode != "vector" and not LEXICAL_INDEX_ENABLED:
+        raise ValueError(f"Retrieval mode '{mode}' needs the lexical index (LEXICAL_INDEX_ENABLED=true).")
+
+    filters = {"where": where, "where_document": where_document}
+    postprocess = RAG_POSTPROCESS_ENABLED and (mmr or rerank)
+    limit = max(fetch_k or k * 4, k) if postprocess else k
+
+    if mode == "vector":
+        matches = await worker_pool.run(
+            _vector_search, namespace, query, limit, **filters, query_vector=query_vector
+        )
+
+    elif mode == "bm25":
+        matches = await worker_pool.run(_lexical_search, namespace, query, limit, **filters)
+
+    else:
+        # Hybrid: over-fetch from both sides so fusion has candidates to reorder
+        candidates = max(limit * 4, 20)
+        vector, lexical = await asyncio.gather(
+            worker_pool.run(
+                _vector_search, namespace, query, candidates, **filters, query_vector=query_vector
+            ),
+            worker_pool.run(_lexical_search, namespace, query, candidates, **filters),
+        )
+        matches = reciprocal_rank_fusion([vector, lexical], limit, rrf_k)
+
+    if score_threshold is not None:
+        matches = [m for m in matches if m["score"] >= score_threshold]
+
+    if postprocess:
+        budget = RAG_POSTPROCESS_BUDGET_MS if budget_ms is None else budget_ms
+        deadline = time.perf_counter() + budget / 1000
+
+        if mmr and len(matches) > k:
+            matches = await worker_pool.run(
+                _mmr, namespace, query, matches, k, lambda_mult, deadline, query_vector
+            )
+        if rerank:
+            # CPU-bound: goes to the process pool when one is configured
+            matches = await worker_pool.run_cpu(cross_encoder_rerank, query, matches, deadline)
+
+        matches = matches[:k]
+
+    return matches
+
+
+async def search_batch(
+    namespace: str,
+    queries: List[str],
+    dedupe: bool = False,
+    **options
+) -> Tuple[List[List[Dict]], int]:
+    """
+    Run several searches over one namespace at once.
+
+    The distinct queries are embedded together in one batched call
+    (embed_queries: query-space vectors and cache keys); then the
+    searches run concurrently. With dedupe, a chunk returned for several
+    queries is kept only for the query where it ranks best (earlier
+    query on ties).
+
+    Returns:
+        (matches per query in input order, number of duplicates removed)
+    """
+
+    vectors: List[Optional[List[float]]] = [None] * len(queries)
+    if options.get("mode", "vector") != "bm25" or options.get("mmr"):
+        distinct = list(dict.fromkeys(queries))
+        embedded = await worker_pool.run(get_embeddings().embed_queries, distinct)
+        by_query = dict(zip(distinct, embedded, strict=True))
+        vectors = [by_query[query] for query in queries]
+
+    results = await asyncio.gather(*(
+        search(namespace, query, query_vector=vector, **options)
+        for query, vector in zip(queries, vectors, strict=True)
+    ))
+
+    if not dedupe:
+        return list(results), 0
+
+    owner: Dict[str, Tuple[int, int]] = {}
+    for qi, matches in enumerate(results):
+        for rank, match in enumerate(matches):
+            best = owner.get(match["id"])
+            if best is None or (rank, qi) < best:
+                owner[match["id"]] = (rank, qi)
+
+    deduped = [
+        [m for m in matches if owner[m["id"]][1] == qi]
+        for qi, matches in enumerate(results)
+    ]
+    removed = sum(len(r) for r in results) - sum(len(r) for r in deduped)
+
+    return deduped, removed
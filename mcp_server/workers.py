@@ -0,0 +1,266 @@
+"""
+Worker pools and per-tool concurrency limits
+--------------------------------------------
+
+Chroma, SQLite and embedding calls are blocking. Tools never run them
+on the FastMCP event loop (which must keep answering health_check and
+other requests); they dispatch them to:
+
+ - worker_pool.run()      a dedicated, bounded thread pool
+ - worker_pool.run_cpu()  a process pool for CPU-bound local models
+                          (cross-encoder rerank) when MCP_CPU_PROCESSES > 0,
+                          otherwise the thread pool
+
+tool_limiter caps how many calls of each tool run at once, so a burst
+of rag_index calls cannot take every worker from rag_query.
+
+Both report queue depth, in-flight work and wait times for the health
+tool.
+"""
+
+import asyncio
+import atexit
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, Callable, Dict, Optional
+
+
+# Threads running blocking Chroma / SQLite / embedding calls
+MCP_WORKER_THREADS = int(os.getenv("MCP_WORKER_THREADS", "8"))
+
+# Processes for CPU-bound local models; 0 keeps that work on the threads
+MCP_CPU_PROCESSES = int(os.getenv("MCP_CPU_PROCESSES", "0"))
+
+# Concurrent calls per tool: "tool=limit,..." plus a default for the rest
+MCP_TOOL_CONCURRENCY = os.getenv(
+    "MCP_TOOL_CONCURRENCY", "rag_index=2,rag_ingest_directory=1,rag_drop_namespace=1"
+)
+MCP_TOOL_CONCURRENCY_DEFAULT = int(os.getenv("MCP_TOOL_CONCURRENCY_DEFAULT", "8"))
+
+
+def _parse_limits(spec: str) -> Dict[str, int]:
+    limits = {}
+    for item in spec.split(","):
+        if "=" in item:
+            name, value = item.split("=", 1)
+            limits[name.strip()] = max(1, int(value))
+    return limits
+
+
+# ---------------------------------------------------------
+# Worker pool
+# ---------------------------------------------------------
+
+class WorkerPool:
+    """
+    Bounded thread pool (plus optional process pool) with queue metrics.
+    """
+
+    def __init__(self, threads: int = MCP_WORKER_THREADS, processes: int = MCP_CPU_PROCESSES):
+        self.threads = max(1, threads)
+        self.processes = max(0, processes)
+
+        self._lock = threading.Lock()
+        self._thread_pool: Optional[ThreadPoolExecutor] = None
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+
+        # Counters
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.cancelled = 0
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.cpu_submitted = 0
+        self.cpu_pending = 0
+
+    def _threads(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._thread_pool is None:
+                self._thread_pool = ThreadPoolExecutor(
+                    max_workers=self.threads, thread_name_prefix="mcp-worker"
+                )
+            return self._thread_pool
+
+    def _processes(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._process_pool is None:
+                # spawn: forking a process that holds SQLite / Chroma handles is unsafe
+                self._process_pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._process_pool
+
+    async def run(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a blocking call on the worker threads.
+        """
+
+        with self._lock:
+            self.submitted += 1
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+
+        # Cleared by whichever side takes the call off the queue first:
+        # job() when it starts, or the caller if it is cancelled before then
+        pending = True
+
+        def job():
+            nonlocal pending
+            with self._lock:
+                if not pending:
+                    return None  # caller was cancelled before the job started
+                pending = False
+                self.queued -= 1
+                self.running += 1
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._threads(), job)
+        except asyncio.CancelledError:
+            with self._lock:
+                self.cancelled += 1
+            raise
+        except BaseException:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                if pending:
+                    pending = False
+                    self.queued -= 1
+
+        with self._lock:
+            self.completed += 1
+        return result
+
+    async def run_cpu(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run a CPU-bound call in the process pool (fn and its arguments
+        must be picklable), or on the threads if no processes are configured.
+        """
+
+        if not self.processes:
+            return await self.run(fn, *args, **kwargs)
+
+        with self._lock:
+            self.cpu_submitted += 1
+            self.cpu_pending += 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            return await loop.run_in_executor(self._processes(), partial(fn, *args, **kwargs))
+        finally:
+            with self._lock:
+                self.cpu_pending -= 1
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "threads": self.threads,
+                "processes": self.processes,
+                "queue_depth": self.queued,
+                "peak_queue_depth": self.peak_queued,
+                "running": self.running,
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "cancelled": self.cancelled,
+                "cpu_submitted": self.cpu_submitted,
+                "cpu_pending": self.cpu_pending,
+            }
+
+    def shutdown(self):
+        with self._lock:
+            pools = [self._thread_pool, self._process_pool]
+            self._thread_pool = self._process_pool = None
+
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=False, cancel_futures=True)
+
+
+# ---------------------------------------------------------
+# Per-tool concurrency limits
+# ---------------------------------------------------------
+
+class ToolLimiter:
+    """
+    One semaphore per tool name; callers beyond the limit wait in line.
+    """
+
+    def __init__(
+        self,
+        limits: Optional[Dict[str, int]] = None,
+        default: int = MCP_TOOL_CONCURRENCY_DEFAULT
+    ):
+        self.limits = limits if limits is not None else _parse_limits(MCP_TOOL_CONCURRENCY)
+        self.default = max(1, default)
+
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def limit(self, tool: str) -> int:
+        return self.limits.get(tool, self.default)
+
+    @asynccontextmanager
+    async def slot(self, tool: str):
+        semaphore = self._semaphores.get(tool)
+        if semaphore is None:
+            semaphore = self._semaphores[tool] = asyncio.Semaphore(self.limit(tool))
+            self._stats[tool] = {
+                "waiting": 0, "in_flight": 0, "calls": 0,
+                "total_wait_ms": 0.0, "max_wait_ms": 0.0,
+            }
+        stats = self._stats[tool]
+
+        started = time.perf_counter()
+        stats["waiting"] += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            stats["waiting"] -= 1
+
+        waited = (time.perf_counter() - started) * 1000
+        stats["calls"] += 1
+        stats["total_wait_ms"] += waited
+        stats["max_wait_ms"] = max(stats["max_wait_ms"], waited)
+        stats["in_flight"] += 1
+
+        try:
+            yield
+        finally:
+            stats["in_flight"] -= 1
+            semaphore.release()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            tool: {
+                "limit": self.limit(tool),
+                "waiting": int(s["waiting"]),
+                "in_flight": int(s["in_flight"]),
+                "calls": int(s["calls"]),
+                "avg_wait_ms": round(s["total_wait_ms"] / s["calls"], 2) if s["calls"] else 0.0,
+                "max_wait_ms": round(s["max_wait_ms"], 2),
+            }
+            for tool, s in self._stats.items()
+        }
+
+
+worker_pool = WorkerPool()
+tool_limiter = ToolLimiter()
+
+atexit.register(worker_pool.shutdown)
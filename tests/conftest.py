@@ -0,0 +1,16 @@
+import os
+
+import pytest
+
+
+@pytest.fixture(scope="session", autouse=True)
+def working_dir(tmp_path_factory):
+    """
+    Run in a scratch directory: module singletons (audit log, history,
+    sessions) create their SQLite files relative to the working directory.
+    Modules holding such singletons are imported inside tests.
+    """
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("cwd"))
+    yield
+    os.chdir(cwd)
@@ -0,0 +1,79 @@
+import threading
+
+import pytest
+
+
+@pytest.fixture
+def make_logger(tmp_path):
+    from agent_app.core.audit_logger import AuditLogger
+
+    loggers = []
+
+    def make(**kwargs):
+        logger = AuditLogger(db_path=str(tmp_path / "audit.sqlite3"), **kwargs)
+        loggers.append(logger)
+        return logger
+
+    yield make
+
+    for logger in loggers:
+        logger.close()
+
+
+def write(logger, i, **kwargs):
+    logger.write_record("s1", "rag_query", {"i": i}, {"ok": True}, duration_ms=1.0, **kwargs)
+
+
+def test_records_are_written_and_counted(make_logger):
+    logger = make_logger()
+
+    for i in range(5):
+        write(logger, i)
+    assert logger.flush(timeout=5)
+
+    logs = logger.list_logs(session_id="s1")
+    assert len(logs) == 5
+    assert logger.stats()["written"] == 5
+    assert [(s["tool_name"], s["count"]) for s in logger.tool_stats()] == [("rag_query", 5)]
+
+
+def test_full_queue_spills_to_overflow_without_losing_records(make_logger):
+    logger = make_logger(max_queue=2, flush_interval_ms=1)
+
+    # Hold the writer inside its first batch so the queue fills up
+    gate = threading.Event()
+    write_batch = logger._write_batch
+
+    def slow_write(conn, batch):
+        gate.wait(5)
+        write_batch(conn, batch)
+
+    logger._write_batch = slow_write
+
+    for i in range(20):
+        write(logger, i)
+
+    stats = logger.stats()
+    assert stats["overflowed"] > 0
+    assert stats["overflow_depth"] > 0
+
+    gate.set()
+    assert logger.flush(timeout=5)
+
+    stats = logger.stats()
+    assert stats["written"] == 20
+    assert stats["overflow_depth"] == 0
+    rows = sorted(logger.list_logs(session_id="s1", limit=50), key=lambda row: row["id"])
+    assert [row["arguments"] for row in rows] == [f'{{"i": {i}}}' for i in range(20)]
+
+
+def test_records_after_close_are_dropped_and_flush_returns(make_logger):
+    logger = make_logger()
+    write(logger, 0)
+    logger.close()
+
+    write(logger, 1)
+
+    assert logger.stats()["dropped_after_close"] == 1
+    assert logger.flush() is True
+    assert len(logger.list_logs(session_id="s1")) == 1
@@ -0,0 +1,63 @@
+from typing import List
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from mcp_server.vector_store.embedding_cache import CachedEmbeddings
+
+
+class CountingEmbeddings(Embeddings):
+    """
+    Documents and queries land in different spaces, like asymmetric models.
+    """
+
+    def __init__(self):
+        self.calls: List[tuple] = []
+
+    def embed_documents(self, texts):
+        self.calls.append(("documents", list(texts)))
+        return [[float(len(t)), 0.0] for t in texts]
+
+    def embed_query(self, text):
+        self.calls.append(("query", text))
+        return [0.0, float(len(text))]
+
+
+@pytest.fixture
+def model():
+    return CountingEmbeddings()
+
+
+def cached(model, tmp_path, **kwargs):
+    return CachedEmbeddings(model, "m", db_path=str(tmp_path / "cache.sqlite3"), **kwargs)
+
+
+def test_symmetric_queries_are_embedded_in_one_call(model, tmp_path):
+    embeddings = cached(model, tmp_path, symmetric=True)
+
+    assert embeddings.embed_queries(["a", "bb", "a"]) == [[1.0, 0.0], [2.0, 0.0], [1.0, 0.0]]
+    assert model.calls == [("documents", ["a", "bb"])]
+
+    # Same cache entries as single queries
+    assert embeddings.embed_query("bb") == [2.0, 0.0]
+    assert len(model.calls) == 1
+
+
+def test_asymmetric_queries_stay_in_query_space(model, tmp_path):
+    embeddings = cached(model, tmp_path)
+
+    assert embeddings.embed_queries(["a", "bb"]) == [[0.0, 1.0], [0.0, 2.0]]
+    assert model.calls == [("query", "a"), ("query", "bb")]
+
+    # Query vectors never leak into the document cache, or back
+    assert embeddings.embed_documents(["a"]) == [[1.0, 0.0]]
+    assert embeddings.embed_query("a") == [0.0, 1.0]
+    assert model.calls[-1] == ("documents", ["a"])
+
+
+def test_batched_query_api_is_preferred(model, tmp_path):
+    model.embed_queries = lambda texts: [[9.0, float(len(t))] for t in texts]
+    embeddings = cached(model, tmp_path)
+
+    assert embeddings.embed_queries(["a", "bb"]) == [[9.0, 1.0], [9.0, 2.0]]
+    assert model.calls == []
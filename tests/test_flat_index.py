@@ -0,0 +1,116 @@
+import os
+import threading
+
+import pytest
+
+from mcp_server.vector_store.flat_index import FlatIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = FlatIndex(str(tmp_path / "ns"))
+    index.upsert(
+        ids=["a", "b", "c"],
+        embeddings=[[1, 0, 0], [0, 1, 0], [0.9, 0.1, 0]],
+        documents=["apple pie", "banana bread", "apple crumble"],
+        metadatas=[{"kind": "pie", "year": 2020}, {"kind": "bread", "year": 2021}, {"kind": "pie", "year": 2022}]
+    )
+    return index
+
+
+def test_query_ranks_by_cosine(index):
+    result = index.query([[1, 0, 0]], n_results=2)
+
+    assert result["ids"] == [["a", "c"]]
+    assert result["documents"] == [["apple pie", "apple crumble"]]
+    assert result["distances"][0][0] == pytest.approx(0.0, abs=1e-6)
+    assert result["embeddings"] is None
+
+
+def test_query_filters(index):
+    assert index.query([[1, 0, 0]], n_results=5, where={"kind": "bread"})["ids"] == [["b"]]
+    assert index.query([[1, 0, 0]], where={"year": {"$gte": 2021}})["ids"] == [["c", "b"]]
+    assert index.query(
+        [[1, 0, 0]], where={"$or": [{"kind": "bread"}, {"year": 2020}]}
+    )["ids"] == [["a", "b"]]
+    assert index.query([[1, 0, 0]], where_document={"$contains": "crumble"})["ids"] == [["c"]]
+    assert index.query([[1, 0, 0]], where={"kind": "cake"})["ids"] == [[]]
+
+    with pytest.raises(ValueError):
+        index.query([[1, 0, 0]], where={"year": {"$regex": "20"}})
+
+
+def test_upsert_replaces_and_get(index):
+    index.upsert(ids=["b"], embeddings=[[1, 0, 0]], documents=["apple bread"])
+
+    assert index.count() == 3
+    assert index.get(ids=["b"])["documents"] == ["apple bread"]
+    assert index.query([[1, 0, 0]], n_results=2)["ids"][0][1] in ("a", "b")
+    assert index.get(where={"kind": "pie"}, limit=1, offset=1)["ids"] == ["c"]
+
+
+def test_failed_upsert_leaves_the_index_unchanged(index):
+    with pytest.raises(ValueError):
+        index.upsert(ids=["d"], embeddings=[[1, 0]])
+
+    assert index.count() == 3
+    assert index.get()["ids"] == ["a", "b", "c"]
+
+
+def test_delete(index):
+    index.delete(["a", "missing"])
+
+    assert index.count() == 2
+    assert index.query([[1, 0, 0]], n_results=5)["ids"] == [["c", "b"]]
+
+    index.delete(["b", "c"])
+    assert index.count() == 0
+    assert index.query([[1, 0, 0]])["ids"] == [[]]
+
+
+def test_reload_from_snapshot(index, tmp_path):
+    index.delete(["b"])
+
+    reloaded = FlatIndex(str(tmp_path / "ns"))
+
+    assert reloaded.count() == 2
+    assert reloaded.get(include=["metadatas"])["metadatas"] == [
+        {"kind": "pie", "year": 2020}, {"kind": "pie", "year": 2022}
+    ]
+    assert reloaded.query([[0.9, 0.1, 0]], n_results=1)["ids"] == [["c"]]
+
+
+def test_bulk_write_saves_once_at_the_end(tmp_path):
+    path = str(tmp_path / "bulk")
+    index = FlatIndex(path)
+
+    index.begin_bulk_write()
+    try:
+        for i in range(5):
+            index.upsert(ids=[f"d{i}"], embeddings=[[float(i), 1.0]])
+        assert not os.path.exists(os.path.join(path, "records.pkl"))
+    finally:
+        index.end_bulk_write()
+
+    assert FlatIndex(path).count() == 5
+
+
+def test_drop_waits_for_a_bulk_write(tmp_path):
+    path = str(tmp_path / "ns")
+    writer, other = FlatIndex(path), FlatIndex(path)
+
+    writer.begin_bulk_write()
+    try:
+        writer.upsert(ids=["a"], embeddings=[[1.0, 0.0]])
+        dropper = threading.Thread(target=other.drop)
+        dropper.start()
+        dropper.join(0.2)
+        # Blocked on the file lock held by the bulk write
+        assert dropper.is_alive()
+    finally:
+        writer.end_bulk_write()
+
+    dropper.join(5)
+    assert not dropper.is_alive()
+    assert FlatIndex(path).count() == 0
+    assert other.count() == 0
@@ -0,0 +1,28 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def client():
+    # Imported here: it creates the history singleton in the working directory
+    from agent_app.api.routes import history
+
+    app = FastAPI()
+    app.include_router(history.router)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("cursor", ["garbage", "1.5:x", "nan:3", "inf:3"])
+def test_invalid_cursor_is_a_bad_request(client, cursor):
+    response = client.get("/history/search", params={"q": "refund", "cursor": cursor})
+
+    assert response.status_code == 400
+    assert "Invalid search cursor" in response.json()["detail"]
+
+
+def test_search_without_cursor(client):
+    response = client.get("/history/search", params={"q": "refund"})
+
+    assert response.status_code == 200
+    assert response.json()["next_cursor"] is None
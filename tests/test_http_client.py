@@ -0,0 +1,98 @@
+import pytest
+from aiohttp import web
+
+from mcp_server import http_client
+from mcp_server.http_client import ResponseCache, http_get
+
+
+@pytest.fixture
+async def upstream(monkeypatch):
+    """
+    Local aiohttp server with one route per caching behaviour.
+    Yields (base_url, hit counts per path).
+    """
+
+    monkeypatch.setattr(http_client, "response_cache", ResponseCache())
+    calls = {}
+
+    def counted(handler):
+        async def wrapper(request):
+            calls[request.path] = calls.get(request.path, 0) + 1
+            return await handler(request)
+        return wrapper
+
+    async def max_age(request):
+        return web.json_response({"n": calls[request.path]}, headers={"Cache-Control": "max-age=60"})
+
+    async def etag(request):
+        if request.headers.get("If-None-Match") == '"v1"':
+            return web.Response(status=304, headers={"ETag": '"v1"'})
+        return web.json_response(
+            {"n": calls[request.path]}, headers={"ETag": '"v1"', "Cache-Control": "no-cache"}
+        )
+
+    async def no_store(request):
+        return web.json_response({"n": calls[request.path]}, headers={"Cache-Control": "no-store"})
+
+    app = web.Application()
+    app.router.add_get("/max-age", counted(max_age))
+    app.router.add_get("/etag", counted(etag))
+    app.router.add_get("/no-store", counted(no_store))
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+
+    yield f"http://127.0.0.1:{port}", calls
+
+    await http_client.close_session()
+    await runner.cleanup()
+
+
+async def test_max_age_is_served_from_cache(upstream):
+    base, calls = upstream
+
+    first = await http_get(f"{base}/max-age")
+    second = await http_get(f"{base}/max-age")
+
+    assert (first.cache, second.cache) == ("miss", "hit")
+    assert second.body == first.body
+    assert calls["/max-age"] == 1
+
+
+async def test_etag_is_revalidated_with_304(upstream):
+    base, calls = upstream
+
+    first = await http_get(f"{base}/etag")
+    second = await http_get(f"{base}/etag")
+
+    assert (first.cache, second.cache) == ("miss", "revalidated")
+    assert second.status == 200
+    assert second.body == first.body
+    assert calls["/etag"] == 2
+    assert http_client.response_cache.revalidations == 1
+
+
+async def test_no_store_is_never_cached(upstream):
+    base, calls = upstream
+
+    first = await http_get(f"{base}/no-store")
+    second = await http_get(f"{base}/no-store")
+
+    assert (first.cache, second.cache) == ("miss", "miss")
+    assert first.body != second.body
+    assert calls["/no-store"] == 2
+    assert http_client.response_cache.stats()["entries"] == 0
+
+
+async def test_bypass_and_max_bytes(upstream):
+    base, calls = upstream
+
+    result = await http_get(f"{base}/max-age", use_cache=False, max_bytes=3)
+
+    assert result.cache == "bypass"
+    assert result.truncated
+    assert len(result.body) == 3
+    assert http_client.response_cache.stats()["entries"] == 0
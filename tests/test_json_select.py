@@ -0,0 +1,42 @@
+import pytest
+
+from mcp_server.json_select import select
+
+DATA = {
+    "data": {
+        "items": [
+            {"id": 1, "name": "a", "tags": ["x"]},
+            {"id": 2, "name": "b"},
+            {"name": "c"},
+        ]
+    },
+    "stats": {"count": 3, "pages": 1},
+}
+
+
+@pytest.mark.parametrize("expression, expected", [
+    ("$.data.items[0].name", "a"),
+    ("data.items[-1].name", "c"),
+    ("$.data.items[*].id", [1, 2]),
+    ("$.stats[*]", [3, 1]),
+    ("$.data.items[*].tags[0]", ["x"]),
+    ("$.missing.key", None),
+    ("$.data.items[9]", None),
+    ("$", DATA),
+])
+def test_single_path(expression, expected):
+    assert select(DATA, expression) == expected
+
+
+def test_several_paths_return_a_dict():
+    assert select(DATA, "stats.count, data.items[1].name, nope") == {
+        "stats.count": 3,
+        "data.items[1].name": "b",
+        "nope": None,
+    }
+
+
+@pytest.mark.parametrize("expression", ["", " , ", "items[abc]", "items[0"])
+def test_malformed_expression_raises(expression):
+    with pytest.raises(ValueError):
+        select(DATA, expression)
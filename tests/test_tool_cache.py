@@ -0,0 +1,83 @@
+import pytest
+
+from agent_app.core.tool_cache import ToolResultCache
+
+
+@pytest.fixture
+def cache():
+    return ToolResultCache(
+        ttls={"rag_query": 300, "rag_list_namespaces": 60, "health_check": 5},
+        max_entries=100,
+        enabled=True
+    )
+
+
+QUERY = {"namespace": "docs", "query": "q", "k": 5}
+
+
+def test_hit_after_put_returns_a_copy(cache):
+    assert cache.get("rag_query", QUERY) == (False, None)
+    assert cache.put("rag_query", QUERY, {"matches": [1]})
+
+    hit, result = cache.get("rag_query", {**QUERY, "mode": None})
+    assert hit and result == {"matches": [1]}
+
+    result["matches"].append(2)
+    assert cache.get("rag_query", QUERY)[1] == {"matches": [1]}
+
+
+def test_uncached_tools_are_ignored(cache):
+    assert not cache.put("rag_index", QUERY, {"ok": True})
+    assert cache.get("rag_index", QUERY) == (False, None)
+
+
+def test_write_invalidates_its_namespace_only(cache):
+    cache.put("rag_query", QUERY, {"matches": []})
+    cache.put("rag_query", {**QUERY, "namespace": "other"}, {"matches": []})
+    cache.put("rag_list_namespaces", {}, {"namespaces": ["docs", "other"]})
+    cache.put("health_check", {}, {"status": "ok"})
+
+    assert cache.record_write("rag_delete", {"namespace": "docs", "ids": ["a"]}, {}) == 2
+
+    assert not cache.get("rag_query", QUERY)[0]
+    assert not cache.get("rag_list_namespaces", {})[0]
+    assert cache.get("rag_query", {**QUERY, "namespace": "other"})[0]
+    assert cache.get("health_check", {})[0]
+
+
+def test_put_after_a_write_with_an_old_generation_is_dropped(cache):
+    generation = cache.generation("rag_query", QUERY)
+    cache.record_write("rag_index", {"namespace": "docs"}, {"indexed": 1})
+
+    assert not cache.put("rag_query", QUERY, {"matches": []}, generation=generation)
+    assert cache.put(
+        "rag_query", QUERY, {"matches": []}, generation=cache.generation("rag_query", QUERY)
+    )
+
+
+def test_background_index_blocks_caching_until_the_job_finishes(cache):
+    cache.record_write(
+        "rag_index", {"namespace": "docs", "background": True}, {"job_id": "j1", "status": "running"}
+    )
+    assert cache.stats()["background_jobs"] == 1
+    assert not cache.put("rag_query", QUERY, {"matches": []})
+    assert not cache.put("rag_list_namespaces", {}, {"namespaces": []})
+    assert cache.put("rag_query", {**QUERY, "namespace": "other"}, {"matches": []})
+
+    cache.record_write("rag_index_status", {"job_id": "j1"}, {"status": "running"})
+    assert not cache.put("rag_query", QUERY, {"matches": []})
+
+    cache.record_write("rag_index_status", {"job_id": "j1"}, {"status": "done"})
+    assert cache.stats()["background_jobs"] == 0
+    assert cache.put("rag_query", QUERY, {"matches": [1]})
+
+
+def test_lru_eviction_by_entry_count():
+    cache = ToolResultCache(ttls={"health_check": 5}, max_entries=2, enabled=True)
+
+    for i in range(3):
+        cache.put("health_check", {"i": i}, {"i": i})
+
+    assert not cache.get("health_check", {"i": 0})[0]
+    assert cache.get("health_check", {"i": 2})[0]
+    assert cache.stats()["evictions"] == 1
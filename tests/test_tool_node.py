@@ -0,0 +1,92 @@
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip("langgraph")
+adapters = pytest.importorskip("langchain_mcp_adapters.client")
+if not hasattr(adapters, "MCPClient"):
+    pytest.skip("installed langchain-mcp-adapters has no MCPClient", allow_module_level=True)
+
+from agent_app.core.state import AgentState  # noqa: E402
+from agent_app.core.tool_cache import ToolResultCache  # noqa: E402
+
+
+class Opaque:
+    """
+    Stands in for an MCP CallToolResult: not a JSON type.
+    """
+
+    def __init__(self, value):
+        self.value = value
+
+    def __str__(self):
+        return f"Opaque({self.value})"
+
+
+class FakeClient:
+    async def call_tool(self, name, arguments):
+        if name == "broken":
+            raise RuntimeError("tool exploded")
+        return Opaque(arguments["x"])
+
+
+class FakePool:
+    @asynccontextmanager
+    async def session(self):
+        yield FakeClient()
+
+
+class FakeCatalog:
+    loaded_at = 0.0
+    last_error = None
+
+    async def ensure_fresh(self):
+        return frozenset({"echo", "broken"})
+
+    def has(self, name):
+        return name in {"echo", "broken"}
+
+
+@pytest.fixture
+def tool_node():
+    # Imported here: it creates the audit log singleton in the working directory
+    from agent_app.core.nodes import tool_node
+    return tool_node
+
+
+@pytest.fixture
+def node(tool_node):
+    return tool_node.MCPToolNode(
+        "unused", pool=FakePool(), catalog=FakeCatalog(), cache=ToolResultCache(enabled=False)
+    )
+
+
+def calls(*names):
+    return [{"id": f"c{i}", "name": name, "args": {"x": i}} for i, name in enumerate(names)]
+
+
+async def test_failing_call_does_not_discard_the_others(node):
+    state = AgentState(session_id="s", pending_tool_calls=calls("echo", "broken", "echo"))
+
+    state = await node.run(state)
+
+    results = [step.result for step in state.intermediate_steps]
+    assert str(results[0]) == "Opaque(0)"
+    assert results[1] == {"error": "tool exploded"}
+    assert str(results[2]) == "Opaque(2)"
+    assert [m.tool_call_id for m in state.messages] == ["c0", "c1", "c2"]
+    assert state.pending_tool_calls == []
+
+
+async def test_audit_failure_keeps_the_result(node, tool_node, monkeypatch):
+    def fail(**kwargs):
+        if kwargs["tool_name"] == "broken":
+            raise OSError("disk full")
+
+    monkeypatch.setattr(tool_node.audit_logger, "write_record", fail)
+    state = AgentState(session_id="s", pending_tool_calls=calls("echo", "broken"))
+
+    state = await node.run(state)
+
+    assert [r["result"] for r in state.tool_response][1] == {"error": "tool exploded"}
+    assert str(state.tool_response[0]["result"]) == "Opaque(0)"
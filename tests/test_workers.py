@@ -0,0 +1,87 @@
+import asyncio
+import threading
+
+import pytest
+
+from mcp_server.workers import ToolLimiter, WorkerPool
+
+
+@pytest.fixture
+def pool():
+    pool = WorkerPool(threads=1, processes=0)
+    yield pool
+    pool.shutdown()
+
+
+async def test_completed_and_failed(pool):
+    assert await pool.run(sum, [1, 2, 3]) == 6
+
+    with pytest.raises(ZeroDivisionError):
+        await pool.run(lambda: 1 / 0)
+
+    stats = pool.stats()
+    assert stats["submitted"] == 2
+    assert stats["completed"] == 1
+    assert stats["failed"] == 1
+    assert stats["queue_depth"] == 0
+    assert stats["running"] == 0
+
+
+async def test_queue_depth_and_running(pool):
+    release = threading.Event()
+
+    first = asyncio.create_task(pool.run(release.wait, 5))
+    second = asyncio.create_task(pool.run(release.wait, 5))
+    await asyncio.sleep(0.05)
+
+    stats = pool.stats()
+    assert stats["running"] == 1
+    assert stats["queue_depth"] == 1
+    assert stats["peak_queue_depth"] >= 1
+
+    release.set()
+    await asyncio.gather(first, second)
+    assert pool.stats()["queue_depth"] == 0
+    assert pool.stats()["completed"] == 2
+
+
+async def test_cancelled_before_start_leaves_the_queue(pool):
+    release = threading.Event()
+    ran = []
+
+    blocker = asyncio.create_task(pool.run(release.wait, 5))
+    queued = asyncio.create_task(pool.run(ran.append, 1))
+    await asyncio.sleep(0.05)
+
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+
+    release.set()
+    await blocker
+    await pool.run(lambda: None)
+
+    stats = pool.stats()
+    assert ran == []
+    assert stats["queue_depth"] == 0
+    assert stats["cancelled"] == 1
+    assert stats["failed"] == 0
+
+
+async def test_tool_limiter_caps_concurrency():
+    limiter = ToolLimiter(limits={"rag_index": 1}, default=4)
+    in_flight = []
+
+    async def call():
+        async with limiter.slot("rag_index"):
+            in_flight.append(limiter.stats()["rag_index"]["in_flight"])
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(call(), call(), call())
+
+    stats = limiter.stats()["rag_index"]
+    assert in_flight == [1, 1, 1]
+    assert stats["limit"] == 1
+    assert stats["calls"] == 3
+    assert stats["waiting"] == 0 and stats["in_flight"] == 0
+    assert limiter.limit("other") == 4